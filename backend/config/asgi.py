@@ -0,0 +1,16 @@
+"""
+ASGI config for BYN-K Platform backend.
+
+Run with an ASGI server, e.g.:
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+and set ASYNC_READ_VIEWS=true so the public listing endpoints use the
+async read path (listings.async_views).
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+application = get_asgi_application()
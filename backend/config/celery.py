@@ -14,3 +14,6 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
+
+# Register task timing signal handlers for the /metrics endpoint.
+from . import metrics  # noqa: E402,F401
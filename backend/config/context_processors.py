@@ -1,32 +1,35 @@
+from functools import lru_cache
+
 from django.conf import settings
+from django.core.cache import cache
 from django.db import connection
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
+from .metrics import observe_cache
 
-def admin_dashboard_context(request):
-    """
-    Provide lightweight admin dashboard stats for branded templates.
-    """
-    if not request.path.startswith("/admin/"):
-        return {}
+DASHBOARD_CACHE_KEY = "admin_dashboard:metrics"
+
+
+def invalidate_admin_dashboard_cache():
+    """Drop the shared dashboard metrics (called when listings data changes)."""
+    cache.delete(DASHBOARD_CACHE_KEY)
 
-    user = getattr(request, "user", None)
-    if not user or not user.is_authenticated or not user.is_superuser:
-        return {}
 
+def _compute_dashboard_metrics():
     # Lazy imports to avoid startup dependency issues.
+    from django.db.models import Count, Q, Sum
     from listings.models import Job, ClickAnalytics, Partner, Subscription, Event
 
     now = timezone.localtime()
-    period = "morning" if now.hour < 12 else "afternoon" if now.hour < 18 else "evening"
-    name = (user.first_name or user.get_username() or "Admin").strip().split(" ")[0]
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-    total_jobs = Job.objects.count()
-    active_jobs = Job.objects.filter(is_active=True).count()
-    verified_jobs = Job.objects.filter(is_verified=True).count()
-    partners = Partner.objects.count()
-    active_subscribers = Subscription.objects.filter(is_active=True).count()
-    total_clicks = sum(ClickAnalytics.objects.values_list("click_count", flat=True))
+    job_counts = Job.objects.aggregate(
+        total_jobs=Count("id"),
+        active_jobs=Count("id", filter=Q(is_active=True)),
+        verified_jobs=Count("id", filter=Q(is_verified=True)),
+        created_today=Count("id", filter=Q(created_at__gte=today_start)),
+    )
     latest_jobs = list(
         Job.objects.order_by("-created_at").values("id", "title", "organization_name", "created_at")[:6]
     )
@@ -35,7 +38,6 @@ def admin_dashboard_context(request):
     upcoming_events = list(
         upcoming_events_qs.values("id", "title", "partner", "start_time", "category")[:6]
     )
-    upcoming_events_count = upcoming_events_qs.count()
 
     # Basic system health indicators
     db_status = "Healthy"
@@ -46,20 +48,13 @@ def admin_dashboard_context(request):
     except Exception:
         db_status = "Degraded"
 
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    created_today = Job.objects.filter(created_at__gte=today_start).count()
-
     return {
-        "admin_greeting": f"Good {period}, {name}. Welcome.",
         "admin_metrics": {
-            "total_jobs": total_jobs,
-            "active_jobs": active_jobs,
-            "verified_jobs": verified_jobs,
-            "partners": partners,
-            "active_subscribers": active_subscribers,
-            "total_clicks": total_clicks,
-            "created_today": created_today,
-            "upcoming_events": upcoming_events_count,
+            **job_counts,
+            "partners": Partner.objects.count(),
+            "active_subscribers": Subscription.objects.filter(is_active=True).count(),
+            "total_clicks": ClickAnalytics.objects.aggregate(total=Sum("click_count"))["total"] or 0,
+            "upcoming_events": upcoming_events_qs.count(),
         },
         "admin_latest_jobs": latest_jobs,
         "admin_latest_events": upcoming_events,
@@ -69,3 +64,47 @@ def admin_dashboard_context(request):
             "debug_mode": "On" if settings.DEBUG else "Off",
         },
     }
+
+
+def _dashboard_metrics():
+    """
+    Shared dashboard metrics, computed at most once per
+    ADMIN_DASHBOARD_CACHE_SECONDS across all admin requests and workers.
+    """
+    metrics = cache.get(DASHBOARD_CACHE_KEY)
+    observe_cache("admin_dashboard", metrics is not None)
+    if metrics is None:
+        metrics = _compute_dashboard_metrics()
+        cache.set(DASHBOARD_CACHE_KEY, metrics, getattr(settings, "ADMIN_DASHBOARD_CACHE_SECONDS", 60))
+    return metrics
+
+
+def admin_dashboard_context(request):
+    """
+    Provide lightweight admin dashboard stats for branded templates.
+
+    Values are lazy: nothing is fetched unless a template reads one of
+    them, so change lists and forms that never display the dashboard
+    cost no queries or cache lookups.
+    """
+    if not request.path.startswith("/admin/"):
+        return {}
+
+    user = getattr(request, "user", None)
+    if not user or not user.is_authenticated or not user.is_superuser:
+        return {}
+
+    now = timezone.localtime()
+    period = "morning" if now.hour < 12 else "afternoon" if now.hour < 18 else "evening"
+    name = (user.first_name or user.get_username() or "Admin").strip().split(" ")[0]
+
+    # One cache read per request, however many of the values a template uses.
+    metrics = lru_cache(maxsize=None)(_dashboard_metrics)
+
+    return {
+        "admin_greeting": f"Good {period}, {name}. Welcome.",
+        "admin_metrics": SimpleLazyObject(lambda: metrics()["admin_metrics"]),
+        "admin_latest_jobs": SimpleLazyObject(lambda: metrics()["admin_latest_jobs"]),
+        "admin_latest_events": SimpleLazyObject(lambda: metrics()["admin_latest_events"]),
+        "admin_system_health": SimpleLazyObject(lambda: metrics()["admin_system_health"]),
+    }
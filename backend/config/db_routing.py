@@ -0,0 +1,99 @@
+"""
+Read-replica routing.
+
+With `DATABASE_READ_REPLICA` set (from `DATABASE_REPLICA_URL`), views
+wrapped in `replica_reads` (the public listing endpoints and analytics
+reads) send their queries to the replica. Everything else (writes, the
+admin, Celery tasks) stays on the primary.
+
+Replicas lag behind. After a successful write request,
+`PrimaryPinMiddleware` sets a short-lived cookie, and while it is
+present the client reads from the primary too, so an admin sees their
+own edits straight away.
+"""
+
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_alias():
+    """The configured replica alias, or None when reads cannot be offloaded."""
+    alias = getattr(settings, "DATABASE_READ_REPLICA", None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+def is_pinned(request):
+    return getattr(settings, "REPLICA_PIN_COOKIE", "primary_pin") in request.COOKIES
+
+
+@contextmanager
+def reads_from_replica(enabled=True):
+    """Route ORM reads in this block (and its sync_to_async calls) to the replica."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def _use_replica(request):
+    return request.method in SAFE_METHODS and not is_pinned(request)
+
+
+def _replica_stream(chunks, enabled):
+    """Keep a streaming response's lazy queries on the same database as its view."""
+    chunks = iter(chunks)
+    while True:
+        with reads_from_replica(enabled):
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+        yield chunk
+
+
+def replica_reads(view_func):
+    """Serve a read-only view from the replica unless the client is pinned to the primary."""
+    if iscoroutinefunction(view_func):
+        @functools.wraps(view_func)
+        async def view(request, *args, **kwargs):
+            with reads_from_replica(_use_replica(request)):
+                return await view_func(request, *args, **kwargs)
+        return view
+
+    @functools.wraps(view_func)
+    def view(request, *args, **kwargs):
+        enabled = _use_replica(request)
+        with reads_from_replica(enabled):
+            response = view_func(request, *args, **kwargs)
+        if enabled and getattr(response, "streaming", False):
+            response.streaming_content = _replica_stream(response.streaming_content, enabled)
+        return response
+    return view
+
+
+class PrimaryReplicaRouter:
+    """Reads go to the replica inside `reads_from_replica`; writes always go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so saving an instance loaded from the replica does not
+        # follow its `_state.db` back there.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
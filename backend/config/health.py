@@ -0,0 +1,164 @@
+"""
+Readiness checks for BYN-K Platform.
+
+`/livez` only proves the process can answer. `/readyz` checks the
+dependencies a request needs (database, cache, Celery broker, media
+storage) in parallel. Each check opens its own connection with connect and
+read timeouts of `READINESS_TIMEOUT`, since a running thread cannot be
+cancelled; a check still running from an earlier probe is reported as a
+timeout rather than started again, so a hung dependency holds at most one
+worker. Results are memoised per process for `READINESS_CACHE_SECONDS`, so
+frequent load balancer probes cannot turn into a stream of dependency
+round-trips.
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import connections
+from django.db.utils import load_backend
+from django.utils.module_loading import import_string
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='readyz')
+_lock = threading.Lock()
+_cached = {'expires': 0.0, 'result': None}
+# Checks submitted by earlier probes that have not finished yet.
+_running = {}
+
+
+def readiness_timeout():
+    return getattr(settings, 'READINESS_TIMEOUT', 2.0)
+
+
+def probe_database_settings(settings_dict, timeout):
+    """Copy of a DATABASES entry for a one-off probe connection bounded by `timeout`."""
+    probe = {**settings_dict, 'OPTIONS': dict(settings_dict.get('OPTIONS', {}))}
+    if probe['ENGINE'] == 'django.db.backends.postgresql':
+        options = probe['OPTIONS']
+        # A probe must not borrow from (or wait on) the application's pool.
+        options.pop('pool', None)
+        options['connect_timeout'] = max(math.ceil(timeout), 2)  # libpq's minimum
+        options['options'] = f"{options.get('options', '')} -c statement_timeout={int(timeout * 1000)}".strip()
+    return probe
+
+
+def check_database():
+    timeout = readiness_timeout()
+    for alias in connections:
+        probe = probe_database_settings(connections[alias].settings_dict, timeout)
+        connection = load_backend(probe['ENGINE']).DatabaseWrapper(probe, alias)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        finally:
+            connection.close()
+
+
+def probe_cache(timeout):
+    """A separate client for the default cache, with socket timeouts for Redis."""
+    params = dict(settings.CACHES['default'])
+    backend = params.pop('BACKEND')
+    location = params.pop('LOCATION', '')
+    if backend == 'django.core.cache.backends.redis.RedisCache':
+        params['OPTIONS'] = {
+            **params.get('OPTIONS', {}),
+            'socket_connect_timeout': timeout,
+            'socket_timeout': timeout,
+        }
+        return import_string(backend)(location, params)
+    # In-process caches cannot hang.
+    return caches['default']
+
+
+def check_cache():
+    key = 'readyz:probe'
+    cache = probe_cache(readiness_timeout())
+    try:
+        cache.set(key, 1, timeout=10)
+        if cache.get(key) != 1:
+            raise RuntimeError('cache round-trip failed')
+    finally:
+        cache.close()
+
+
+def check_broker():
+    from config.celery import app
+
+    timeout = readiness_timeout()
+    with app.connection_for_write() as connection:
+        connection.ensure_connection(max_retries=1, timeout=timeout)
+
+
+def check_storage():
+    if isinstance(default_storage, FileSystemStorage):
+        if not os.access(default_storage.location, os.W_OK):
+            raise RuntimeError('media root is not writable')
+    else:
+        default_storage.exists('readyz-probe')
+
+
+CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+    'broker': check_broker,
+    'storage': check_storage,
+}
+
+
+def _timed(check):
+    start = time.perf_counter()
+    check()
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def run_checks():
+    """Run the configured checks concurrently; return (ready, per-check results)."""
+    names = [name for name in getattr(settings, 'READINESS_CHECKS', CHECKS) if name in CHECKS]
+    futures = {}
+    for name in names:
+        previous = _running.get(name)
+        # Don't pile another thread onto a dependency that is still hanging.
+        futures[name] = previous if previous and not previous.done() else _executor.submit(_timed, CHECKS[name])
+        _running[name] = futures[name]
+    wait(futures.values(), timeout=readiness_timeout())
+
+    results = {}
+    for name, future in futures.items():
+        if not future.done():
+            results[name] = {'ok': False, 'error': 'timeout'}
+        elif future.exception() is not None:
+            results[name] = {'ok': False, 'error': type(future.exception()).__name__}
+        else:
+            results[name] = {'ok': True, 'duration_ms': future.result()}
+    return all(result['ok'] for result in results.values()), results
+
+
+def readiness():
+    """
+    Cached `run_checks()`. Returns (ready, results, cached).
+
+    Only one thread per process refreshes an expired result; concurrent
+    probes wait for it instead of starting their own round of checks.
+    """
+    ttl = getattr(settings, 'READINESS_CACHE_SECONDS', 5)
+    with _lock:
+        now = time.monotonic()
+        if _cached['result'] is not None and now < _cached['expires']:
+            return (*_cached['result'], True)
+        result = run_checks()
+        _cached['result'] = result
+        _cached['expires'] = time.monotonic() + ttl
+    return (*result, False)
+
+
+def reset_readiness_cache():
+    with _lock:
+        _cached['result'] = None
+        _cached['expires'] = 0.0
+        _running.clear()
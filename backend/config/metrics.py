@@ -0,0 +1,114 @@
+"""
+Prometheus metrics for BYN-K Platform.
+
+Counters and histograms live in-process (prometheus_client) and are
+scraped from `/metrics`. Under Gunicorn or a prefork Celery worker each
+process writes its samples to `PROMETHEUS_MULTIPROC_DIR`, and the
+endpoint aggregates them, so every scrape sees all workers
+(see gunicorn.conf.py for the worker-exit cleanup).
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from celery.signals import task_postrun, task_prerun
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TASK_BUCKETS = (0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0)
+
+HTTP_REQUESTS = Counter(
+    'bynk_http_requests_total',
+    'HTTP requests by URL name, method and status code.',
+    ['view', 'method', 'status'],
+)
+HTTP_LATENCY = Histogram(
+    'bynk_http_request_duration_seconds',
+    'HTTP request latency by URL name and method.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    'bynk_cache_lookups_total',
+    'Application cache lookups by cache name and result (hit/miss).',
+    ['cache', 'result'],
+)
+CLICKS_INGESTED = Counter(
+    'bynk_clicks_ingested_total',
+    'Opportunity clicks recorded, by click type and write path (sync/queued).',
+    ['click_type', 'path'],
+)
+RATE_LIMITED = Counter(
+    'bynk_rate_limited_total',
+    'Requests rejected with 429 by the rate limiter, by scope.',
+    ['scope'],
+)
+CELERY_TASK_DURATION = Histogram(
+    'bynk_celery_task_duration_seconds',
+    'Celery task run time by task name and final state.',
+    ['task', 'state'],
+    buckets=TASK_BUCKETS,
+)
+EMAILS_SENT = Counter(
+    'bynk_emails_sent_total',
+    'Outgoing emails by kind and outcome (sent/failed/error).',
+    ['kind', 'status'],
+)
+
+
+def observe_cache(cache_name, hit):
+    CACHE_LOOKUPS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+@contextmanager
+def track_email(kind):
+    """
+    Count one email send. The block should set `outcome['sent']` to the
+    `send_mail()` return value (0 when `fail_silently` swallowed an error).
+    """
+    outcome = {'sent': 1}
+    try:
+        yield outcome
+    except Exception:
+        EMAILS_SENT.labels(kind=kind, status='error').inc()
+        raise
+    EMAILS_SENT.labels(kind=kind, status='sent' if outcome['sent'] else 'failed').inc()
+
+
+def render_latest():
+    """Return (payload, content type) for the current metric values."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+# Celery task timing. prerun/postrun fire in the process running the task
+# (worker child or, with CELERY_TASK_ALWAYS_EAGER, the web process).
+_task_started = {}
+
+
+@task_prerun.connect
+def _on_task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is None or task is None:
+        return
+    CELERY_TASK_DURATION.labels(task=task.name, state=state or 'UNKNOWN').observe(
+        time.perf_counter() - started
+    )
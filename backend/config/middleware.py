@@ -1,8 +1,21 @@
+import logging
+import time
 from urllib.parse import quote
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
 from django.contrib.auth import logout
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import JsonResponse
 from django.shortcuts import redirect
 
+from .db_routing import SAFE_METHODS, replica_alias
+from . import ratelimit
+from .metrics import HTTP_LATENCY, HTTP_REQUESTS, RATE_LIMITED
+from .query_budget import QueryBudgetExceeded, QueryRecorder, install_recording_for_thread, view_query_budget
+
+query_logger = logging.getLogger("config.queries")
+
 
 class StrictAdminAccessMiddleware:
     """
@@ -53,3 +66,261 @@ class StrictAdminAccessMiddleware:
                 request.session["admin_console_authenticated"] = True
 
         return response
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Count queries and DB time per request and flag N+1 patterns.
+
+    Results are exposed as a `Server-Timing` header (readable in browser
+    devtools) and a structured log record; requests that repeat one SQL
+    shape `QUERY_REPEAT_THRESHOLD` times or exceed their view's
+    `query_budget` are logged as warnings. With `QUERY_BUDGET_STRICT`
+    (on under `manage.py test`) an exceeded budget raises instead, so
+    regressions fail the test suite. Works under both WSGI and ASGI.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_INSTRUMENTATION_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with recorder.capture():
+            response = self.get_response(request)
+        return self._report(request, response, recorder, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        # The view's ORM calls run in the thread-sensitive executor thread,
+        # whose connections are not the event loop thread's.
+        await sync_to_async(install_recording_for_thread)()
+        with recorder.capture():
+            response = await self.get_response(request)
+        return self._report(request, response, recorder, time.perf_counter() - start)
+
+    def _report(self, request, response, recorder, elapsed):
+        match = getattr(request, "resolver_match", None)
+        budget = view_query_budget(match.func) if match else None
+        repeated = recorder.repeated(getattr(settings, "QUERY_REPEAT_THRESHOLD", 5))
+        over_budget = budget is not None and recorder.count > budget
+
+        if getattr(settings, "QUERY_SERVER_TIMING", False):
+            timings = [
+                f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries"',
+                f"app;dur={elapsed * 1000:.2f}",
+            ]
+            if repeated:
+                timings.append(f'dup;desc="{len(repeated)} repeated SQL shapes"')
+            response["Server-Timing"] = ", ".join(
+                filter(None, [response.get("Server-Timing"), *timings])
+            )
+
+        details = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "query_count": recorder.count,
+            "db_time_ms": round(recorder.duration * 1000, 2),
+            "duration_ms": round(elapsed * 1000, 2),
+            "query_budget": budget,
+            "repeated_queries": [{"sql": shape, "count": count} for shape, count in repeated],
+        }
+        if over_budget or repeated:
+            query_logger.warning(
+                "Query budget exceeded." if over_budget else "Repeated queries detected (possible N+1).",
+                extra=details,
+            )
+        else:
+            query_logger.debug("Request queries.", extra=details)
+
+        if over_budget and getattr(settings, "QUERY_BUDGET_STRICT", False):
+            top = "\n".join(f"  {count}x {shape}" for shape, count in recorder.shapes.most_common(5))
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} ran {recorder.count} queries "
+                f"(budget {budget}). Most frequent:\n{top}"
+            )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record request count and latency per URL name for `/metrics`.
+
+    Labels use the resolved URL name (not the raw path) so cardinality
+    stays bounded; unresolved requests are grouped as "unmatched".
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    def _observe(self, request, response, elapsed):
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name if match else None) or "unmatched"
+        HTTP_LATENCY.labels(view=view, method=request.method).observe(elapsed)
+        HTTP_REQUESTS.labels(view=view, method=request.method, status=response.status_code).inc()
+
+
+class RateLimitMiddleware:
+    """
+    Answer 429 once a client exhausts the token bucket of a view's
+    `rate_limit` scope (see config.ratelimit).
+
+    The check runs in `process_view`: after URL resolution, before the
+    view runs, and before anything loads the session or the user, so a
+    rejected request never reaches the database.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(settings, "RATE_LIMIT_ENABLED", True) or request.method == "OPTIONS":
+            return None
+        scope = ratelimit.view_rate_limit(view_func)
+        if scope is None:
+            return None
+        allowed, retry_after = ratelimit.check(scope, request)
+        if allowed:
+            return None
+        RATE_LIMITED.labels(scope=scope).inc()
+        response = JsonResponse({"error": "Too many requests. Please try again later."}, status=429)
+        response["Retry-After"] = ratelimit.retry_after_header(retry_after)
+        return response
+
+
+class PrimaryPinMiddleware:
+    """
+    Pin a client to the primary database for `REPLICA_PIN_SECONDS` after
+    a successful write request, so replica lag never hides its own edits
+    (see config.db_routing). Does nothing without a read replica.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._pin(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._pin(request, await self.get_response(request))
+
+    def _pin(self, request, response):
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and replica_alias() is not None
+        ):
+            response.set_cookie(
+                getattr(settings, "REPLICA_PIN_COOKIE", "primary_pin"),
+                "1",
+                max_age=getattr(settings, "REPLICA_PIN_SECONDS", 10),
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+        return response
+
+
+class SlidingSessionMiddleware:
+    """
+    Sliding session expiry without a session write on every request.
+
+    A session is marked modified (so SessionMiddleware saves it and resets
+    its expiry to SESSION_COOKIE_AGE) only once SESSION_REFRESH_FRACTION of
+    that age has passed since its last refresh. Requests without a session
+    cookie are not touched. Logins stamp the refresh time (see
+    `users.signals`), so the first request after one does not write again.
+    """
+
+    async_capable = True
+    sync_capable = True
+    refreshed_at_key = "_session_refreshed_at"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self._has_session(request):
+            self._refresh(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self._has_session(request):
+            # Loading the session may hit the database.
+            await sync_to_async(self._refresh)(request)
+        return response
+
+    def _has_session(self, request):
+        session = getattr(request, "session", None)
+        return session is not None and session.session_key is not None
+
+    @classmethod
+    def stamp(cls, session):
+        session[cls.refreshed_at_key] = int(time.time())
+
+    def _refresh(self, request):
+        session = request.session
+        if not session.keys():
+            # Unknown or expired session key: nothing to keep alive.
+            return
+        now = int(time.time())
+        interval = settings.SESSION_COOKIE_AGE * getattr(settings, "SESSION_REFRESH_FRACTION", 0.1)
+        refreshed_at = session.get(self.refreshed_at_key)
+        if session.modified or refreshed_at is None or now - refreshed_at >= interval:
+            self.stamp(session)
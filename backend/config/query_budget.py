@@ -0,0 +1,130 @@
+"""
+Per-request query accounting.
+
+`QueryRecorder` counts queries, DB time and repeated SQL shapes (the
+signature of an N+1 loop) for `QueryInstrumentationMiddleware`. Views
+declare the most queries a request may run with a `query_budget`
+attribute or the decorator below.
+
+Connections are per thread, and under ASGI the ORM runs in executor
+threads rather than on the event loop. So instead of wrapping the
+middleware thread's connections, one `record_queries` execute wrapper is
+installed on the connections of every thread that queries (see
+`install_recording_for_thread()`), and reports to the recorders active in
+the caller's context (`sync_to_async` carries context variables into its
+thread).
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+WHITESPACE_RE = re.compile(r"\s+")
+# `IN (%s, %s, %s)` -> `IN (%s...)` so batched lookups of any size share a shape.
+IN_LIST_RE = re.compile(r"\bIN \((?:%s(?:, )?)+\)", re.IGNORECASE)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request runs more queries than its budget."""
+
+
+def normalize_sql(sql):
+    """SQL "shape": parameters are already placeholders, so only lists and spacing vary."""
+    return IN_LIST_RE.sub("IN (%s...)", WHITESPACE_RE.sub(" ", sql).strip())
+
+
+# Recorders collecting the queries run on behalf of the current context.
+_active_recorders = ContextVar('query_recorders', default=())
+
+
+def record_queries(execute, sql, params, many, context):
+    """Execute wrapper reporting each query to the active recorders."""
+    recorders = _active_recorders.get()
+    if not recorders:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        for recorder in recorders:
+            recorder.add(sql, elapsed)
+
+
+def install_recording(connection):
+    # First in the list, so `execute_wrapper()` blocks that pop the last
+    # wrapper on exit never remove it.
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_queries)
+
+
+def install_recording_for_thread():
+    """Install `record_queries` on the calling thread's connections."""
+    for alias in connections:
+        install_recording(connections[alias])
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    # Covers executor threads that open their own connections.
+    install_recording(connection)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid='query_budget_install')
+
+
+class QueryRecorder:
+    """Tallies queries, time and repeated SQL shapes."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        # Non thread-sensitive sync_to_async calls may report concurrently.
+        self._lock = threading.Lock()
+
+    def add(self, sql, elapsed):
+        with self._lock:
+            self.duration += elapsed
+            self.count += 1
+            self.shapes[normalize_sql(sql)] += 1
+
+    @contextmanager
+    def capture(self):
+        """
+        Record the queries run for the current context while the block runs.
+        Async callers also run `install_recording_for_thread` in the thread
+        their sync_to_async ORM calls use.
+        """
+        install_recording_for_thread()
+        token = _active_recorders.set((*_active_recorders.get(), self))
+        try:
+            yield self
+        finally:
+            _active_recorders.reset(token)
+
+    def repeated(self, threshold):
+        """[(shape, count)] for shapes executed at least `threshold` times."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+def query_budget(limit):
+    """Declare the query budget of a function-based view."""
+    def decorator(view_func):
+        view_func.query_budget = limit
+        return view_func
+    return decorator
+
+
+def view_query_budget(view_func):
+    """Budget declared on a view function, or on the class behind `as_view()`."""
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None:
+        view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+        budget = getattr(view_class, 'query_budget', None)
+    return budget
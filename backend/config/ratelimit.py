@@ -0,0 +1,189 @@
+"""
+Token-bucket rate limiting for the public write endpoints.
+
+Views opt in with a `rate_limit` scope attribute (or the decorator below),
+and `RATE_LIMITS` maps each scope to a rate such as "10/min". Every
+client address (or IPv6 /64, see `RATE_LIMIT_IPV6_PREFIX`) gets a bucket
+that holds that many requests and refills continuously, so the limit
+behaves like a sliding window without per-request bookkeeping.
+
+Buckets live in Redis when `RATE_LIMIT_REDIS_URL` is set: one atomic
+script call per request, shared by every worker. Without Redis, or while
+it is unreachable, each process falls back to its own in-memory buckets.
+`RateLimitMiddleware` checks the bucket in `process_view`, before the
+view (and its session/user lookups) touches the database.
+"""
+
+import ipaddress
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger("config.ratelimit")
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# KEYS[1] = bucket; ARGV = capacity, refill rate (tokens/s), now (s).
+# Returns {allowed (0/1), seconds until the next token}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry)}
+"""
+
+
+def rate_limit(scope):
+    """Declare the rate-limit scope of a function-based view."""
+    def decorator(view_func):
+        view_func.rate_limit = scope
+        return view_func
+    return decorator
+
+
+def view_rate_limit(view_func):
+    """Scope declared on a view function, or on the class behind `as_view()`."""
+    scope = getattr(view_func, "rate_limit", None)
+    if scope is None:
+        view_class = getattr(view_func, "view_class", None) or getattr(view_func, "cls", None)
+        scope = getattr(view_class, "rate_limit", None)
+    return scope
+
+
+def parse_rate(rate):
+    """Parse "10/min" into (capacity 10, refill rate in tokens per second)."""
+    count, _, period = rate.partition("/")
+    seconds = PERIODS.get(period.strip()[:1].lower())
+    if not count.strip().isdigit() or int(count) < 1 or seconds is None:
+        raise ValueError(f"Invalid rate '{rate}'; expected e.g. '10/min'.")
+    return int(count), int(count) / seconds
+
+
+def client_ip(request):
+    """
+    The client address. Behind `RATE_LIMIT_TRUSTED_PROXIES` reverse proxies
+    it is the entry those proxies appended to X-Forwarded-For.
+    """
+    proxies = getattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", 0)
+    if proxies:
+        forwarded = [part.strip() for part in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if part.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def client_key(request):
+    """Bucket identity: the IPv4 address, or the IPv6 network one subscriber controls."""
+    address = client_ip(request)
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return address or "unknown"
+    if ip.version == 4:
+        prefix = getattr(settings, "RATE_LIMIT_IPV4_PREFIX", 32)
+    else:
+        prefix = getattr(settings, "RATE_LIMIT_IPV6_PREFIX", 64)
+    return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+
+class LocalBuckets:
+    """Per-process token buckets, bounded to the most recently seen clients."""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now):
+        with self.lock:
+            tokens, ts = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = (tokens, now)
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class RedisBuckets:
+    """Shared token buckets; one EVALSHA round-trip per check."""
+
+    def __init__(self, url):
+        import redis
+
+        self.errors = (redis.RedisError, OSError)
+        self.client = redis.Redis.from_url(url, socket_connect_timeout=0.25, socket_timeout=0.25)
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.down_until = 0.0
+
+    def take(self, key, capacity, rate, now):
+        """(allowed, retry_after), or None when Redis cannot be reached."""
+        if now < self.down_until:
+            return None
+        try:
+            allowed, retry = self.script(keys=[key], args=[capacity, rate, now])
+        except self.errors:
+            # Don't pay a connection timeout on every request while Redis is down.
+            self.down_until = now + getattr(settings, "RATE_LIMIT_REDIS_RETRY_SECONDS", 30)
+            logger.warning("Rate limit store unavailable; using per-process buckets.", exc_info=True)
+            return None
+        return bool(allowed), float(retry)
+
+
+local_buckets = LocalBuckets()
+_redis_buckets = {}
+
+
+def redis_buckets():
+    url = getattr(settings, "RATE_LIMIT_REDIS_URL", "")
+    if not url:
+        return None
+    if url not in _redis_buckets:
+        _redis_buckets[url] = RedisBuckets(url)
+    return _redis_buckets[url]
+
+
+def check(scope, request):
+    """
+    Take one token from the client's bucket for `scope`.
+    Returns (allowed, retry_after_seconds); unknown scopes are not limited.
+    """
+    rate = getattr(settings, "RATE_LIMITS", {}).get(scope)
+    if not rate:
+        return True, 0.0
+    capacity, refill = parse_rate(rate)
+    key = f"ratelimit:{scope}:{client_key(request)}"
+    now = time.time()
+    shared = redis_buckets()
+    result = shared.take(key, capacity, refill, now) if shared else None
+    if result is None:
+        result = local_buckets.take(key, capacity, refill, now)
+    return result
+
+
+def retry_after_header(seconds):
+    return str(max(1, math.ceil(seconds)))
@@ -72,14 +72,19 @@ INSTALLED_APPS = [
     'allauth.socialaccount.providers.linkedin_oauth2',
     # Local apps
     'users.apps.UsersConfig',
-    'listings',
+    'listings.apps.ListingsConfig',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # Must be at the top
+    'config.middleware.MetricsMiddleware',
+    'config.middleware.QueryInstrumentationMiddleware',
+    'config.middleware.PrimaryPinMiddleware',
+    'config.middleware.RateLimitMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'config.middleware.SlidingSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -110,6 +115,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 # Database Configuration for Render/Local
 default_db_config = dj_database_url.config(
@@ -242,6 +248,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# Rows fetched per database round-trip by the streaming CSV/NDJSON exports.
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', '2000'))
+
 # Platform Disclaimer
 PLATFORM_DISCLAIMER = (
     "DISCLAIMER: BYN-K Platform is a gateway service that curates and shares "
@@ -256,8 +265,14 @@ PLATFORM_DISCLAIMER = (
 # Session & Security Settings
 # ============================================
 SESSION_COOKIE_AGE = 86400  # 24 hours
-SESSION_SAVE_EVERY_REQUEST = True
+# Sliding expiry without a write per request: SlidingSessionMiddleware
+# re-saves a session (pushing its expiry out to SESSION_COOKIE_AGE) once
+# SESSION_REFRESH_FRACTION of that age has passed since the last save.
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_FRACTION = float(os.environ.get('SESSION_REFRESH_FRACTION', '0.1'))
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
+# db (default), cached_db (reads served from CACHES) or signed_cookies (no server-side storage).
+SESSION_ENGINE = f"django.contrib.sessions.backends.{os.environ.get('SESSION_BACKEND', 'db')}"
 
 LOGIN_URL = '/admin/login/'
 LOGIN_REDIRECT_URL = '/admin/'
@@ -389,6 +404,203 @@ DEFAULT_FROM_EMAIL = os.environ.get(
 SEND_EMAILS_ASYNC = env_bool('SEND_EMAILS_ASYNC', False)
 
 
+# ============================================
+# Brochure Delivery & Click Tracking
+# ============================================
+# How ProtectedBrochureView hands off the file once authorized:
+# 'direct' | 'x-accel-redirect' | 'x-sendfile' | 'signed-url' | dotted class path.
+BROCHURE_SERVING_BACKEND = os.environ.get('BROCHURE_SERVING_BACKEND', 'direct')
+# nginx `internal` location aliased to MEDIA_ROOT (x-accel-redirect backend).
+BROCHURE_X_ACCEL_PREFIX = os.environ.get('BROCHURE_X_ACCEL_PREFIX', '/protected-media/')
+# Lifetime in seconds of object storage links (signed-url backend).
+BROCHURE_SIGNED_URL_TTL = int(os.environ.get('BROCHURE_SIGNED_URL_TTL', '300'))
+# Queue click counter writes on Celery instead of writing during the request
+# (the default outside DEBUG; falls back to a direct write when the broker is
+# unreachable).
+TRACK_CLICKS_ASYNC = env_bool('TRACK_CLICKS_ASYNC', not DEBUG)
+# Per-visitor de-duplication of clicks (listings.clicks): one Bloom filter of
+# CLICK_DEDUP_BITS bits per job, click type and day, shared through Redis
+# (CLICK_DEDUP_REDIS_URL, set with the cache below).
+CLICK_DEDUP_ENABLED = env_bool('CLICK_DEDUP_ENABLED', True)
+CLICK_DEDUP_BITS = int(os.environ.get('CLICK_DEDUP_BITS', '8192'))
+CLICK_DEDUP_HASHES = int(os.environ.get('CLICK_DEDUP_HASHES', '4'))
+# Trending ranking (listings.trending): a click's weight halves every
+# TRENDING_HALF_LIFE_HOURS; scores are recomputed every TRENDING_RECOMPUTE_SECONDS.
+TRENDING_HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', '24'))
+TRENDING_RECOMPUTE_SECONDS = float(os.environ.get('TRENDING_RECOMPUTE_SECONDS', '900'))
+# Similar opportunities (listings.similarity): neighbours stored per job,
+# refreshed after each save (on Celery with SIMILAR_JOBS_ASYNC) and rebuilt nightly.
+SIMILAR_JOBS_COUNT = int(os.environ.get('SIMILAR_JOBS_COUNT', '6'))
+SIMILAR_JOBS_MIN_SCORE = float(os.environ.get('SIMILAR_JOBS_MIN_SCORE', '0.25'))
+SIMILAR_JOBS_CHOICE_WEIGHT = float(os.environ.get('SIMILAR_JOBS_CHOICE_WEIGHT', '0.2'))
+SIMILAR_JOBS_ASYNC = env_bool('SIMILAR_JOBS_ASYNC', not DEBUG)
+# Seconds a worker reuses its vocabulary and IDF weights before rebuilding them.
+SIMILAR_JOBS_INDEX_MAX_AGE = int(os.environ.get('SIMILAR_JOBS_INDEX_MAX_AGE', '86400'))
+
+
+# ============================================
+# Logo Image Derivatives
+# ============================================
+# Bounding-box widths (px) rendered for org/partner logos, in WebP and AVIF
+# (AVIF only when the installed Pillow can encode it).
+IMAGE_DERIVATIVE_SIZES = (64, 128, 256)
+IMAGE_DERIVATIVE_FORMATS = ('webp', 'avif')
+# Render derivatives on a Celery worker instead of in the upload request
+# (the default outside DEBUG; falls back to rendering in-process when the
+# broker is unreachable).
+IMAGE_DERIVATIVES_ASYNC = env_bool('IMAGE_DERIVATIVES_ASYNC', not DEBUG)
+# Job/Partner logos are stored once per unique content under
+# logos/sha256/ (see listings.storage); swap in another backend here.
+LOGO_STORAGE_BACKEND = os.environ.get('LOGO_STORAGE_BACKEND', 'listings.storage.ContentAddressedStorage')
+# Let Django serve logos/sha256/ itself (development); in production the web
+# server or object storage should serve MEDIA_URL + logos/sha256/ with
+# `Cache-Control: public, max-age=31536000, immutable`.
+SERVE_CONTENT_ADDRESSED_MEDIA = env_bool('SERVE_CONTENT_ADDRESSED_MEDIA', DEBUG)
+
+
+# ============================================
+# Query Instrumentation
+# ============================================
+# Per-request query counting, N+1 detection and query budgets
+# (config.middleware.QueryInstrumentationMiddleware).
+QUERY_INSTRUMENTATION_ENABLED = env_bool('QUERY_INSTRUMENTATION_ENABLED', True)
+# Expose query counts and DB time in a `Server-Timing` response header.
+QUERY_SERVER_TIMING = env_bool('QUERY_SERVER_TIMING', DEBUG)
+# Log a warning when one SQL shape runs this many times in a request.
+QUERY_REPEAT_THRESHOLD = int(os.environ.get('QUERY_REPEAT_THRESHOLD', '5'))
+# Raise instead of logging when a view exceeds its `query_budget`.
+QUERY_BUDGET_STRICT = env_bool('QUERY_BUDGET_STRICT', IS_TESTING)
+
+
+# ============================================
+# Metrics
+# ============================================
+# Prometheus scrape endpoint at /metrics (config.metrics). Scrapes must send
+# `Authorization: Bearer <token>`; without a token the endpoint answers 404.
+# Multi-worker deployments also need PROMETHEUS_MULTIPROC_DIR pointing at an
+# empty, writable directory.
+METRICS_AUTH_TOKEN = os.environ.get('METRICS_AUTH_TOKEN', '')
+
+
+# ============================================
+# Health Checks
+# ============================================
+# /readyz dependencies (config.health): any of database, cache, broker, storage.
+READINESS_CHECKS = [
+    name.strip()
+    for name in os.environ.get('READINESS_CHECKS', 'database,cache,broker,storage').split(',')
+    if name.strip()
+]
+# Per-check time limit and how long a readiness result is reused (seconds).
+READINESS_TIMEOUT = float(os.environ.get('READINESS_TIMEOUT', '2'))
+READINESS_CACHE_SECONDS = float(os.environ.get('READINESS_CACHE_SECONDS', '5'))
+
+
+# ============================================
+# Cache
+# ============================================
+# Shared Redis cache across Gunicorn workers when configured; otherwise a
+# per-process in-memory cache.
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', '')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+# Click de-duplication filters share the cache's Redis unless pointed elsewhere.
+CLICK_DEDUP_REDIS_URL = os.environ.get('CLICK_DEDUP_REDIS_URL', CACHE_REDIS_URL)
+
+# ============================================
+# Rate Limiting
+# ============================================
+# Token buckets per client address for the public write endpoints
+# (config.ratelimit). Off under `manage.py test`; tests enable it explicitly.
+RATE_LIMIT_ENABLED = env_bool('RATE_LIMIT_ENABLED', not IS_TESTING)
+RATE_LIMITS = {
+    'track-click': '60/min',
+    'subscribe': '10/min',
+    'login': '10/min',
+    'register': '5/min',
+}
+# Overrides as "scope=rate" pairs, e.g. "login=20/min,track-click=120/min".
+for _override in os.environ.get('RATE_LIMITS', '').split(','):
+    _scope, _, _rate = _override.partition('=')
+    if _scope.strip() and _rate.strip():
+        RATE_LIMITS[_scope.strip()] = _rate.strip()
+# Shared buckets; without Redis each worker process keeps its own.
+RATE_LIMIT_REDIS_URL = os.environ.get('RATE_LIMIT_REDIS_URL', CACHE_REDIS_URL)
+# IPv6 clients usually control a whole /64; IPv4 is limited per address.
+RATE_LIMIT_IPV4_PREFIX = int(os.environ.get('RATE_LIMIT_IPV4_PREFIX', '32'))
+RATE_LIMIT_IPV6_PREFIX = int(os.environ.get('RATE_LIMIT_IPV6_PREFIX', '64'))
+# Reverse proxies in front of the app that append to X-Forwarded-For. Production
+# runs behind Render's proxy (see SECURE_PROXY_SSL_HEADER); without this every
+# client would share the proxy's REMOTE_ADDR and one site-wide bucket.
+RATE_LIMIT_TRUSTED_PROXIES = int(os.environ.get('RATE_LIMIT_TRUSTED_PROXIES', '0' if DEBUG else '1'))
+
+# ============================================
+# Admin Dashboard
+# ============================================
+# How long the admin dashboard metrics are shared between requests.
+# Job/Partner/Subscription/Event saves invalidate them immediately.
+ADMIN_DASHBOARD_CACHE_SECONDS = int(os.environ.get('ADMIN_DASHBOARD_CACHE_SECONDS', '60'))
+
+
+# ============================================
+# Async Read Path (ASGI)
+# ============================================
+# Serve GETs on the hot public listing endpoints with async views
+# (listings.async_views). Enable when running under config.asgi.
+ASYNC_READ_VIEWS = env_bool('ASYNC_READ_VIEWS', False)
+# Cache lifetime (seconds) for async category counts, events and partners; 0 disables.
+PUBLIC_READ_CACHE_SECONDS = int(os.environ.get('PUBLIC_READ_CACHE_SECONDS', '30'))
+
+
+# ============================================
+# Database Pooling & Read Replica
+# ============================================
+# Optional read replica. Views wrapped in config.db_routing.replica_reads
+# (public listing endpoints, analytics) read from it; writes stay on the
+# primary. Under `manage.py test` a second, empty SQLite database is
+# configured instead so routing can be tested; tests opt in with
+# override_settings(DATABASE_READ_REPLICA='replica').
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL', '')
+if IS_TESTING:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db-replica.sqlite3',
+    }
+elif DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(DATABASE_REPLICA_URL, conn_max_age=600)
+DATABASE_READ_REPLICA = 'replica' if DATABASE_REPLICA_URL and not IS_TESTING else None
+DATABASE_ROUTERS = ['config.db_routing.PrimaryReplicaRouter']
+# After a successful write, the client reads from the primary for this long
+# (seconds) so replication lag never hides its own edits.
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', '10'))
+REPLICA_PIN_COOKIE = 'primary_pin'
+
+# Django's native connection pool (psycopg 3, PostgreSQL only). Replaces
+# persistent connections: each worker process keeps a pool of up to
+# DATABASE_POOL_MAX_SIZE connections instead of one per thread.
+DATABASE_POOL = env_bool('DATABASE_POOL', False)
+if DATABASE_POOL:
+    for database in DATABASES.values():
+        if database['ENGINE'] == 'django.db.backends.postgresql':
+            database['CONN_MAX_AGE'] = 0
+            database.setdefault('OPTIONS', {})['pool'] = {
+                'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', '2')),
+                'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', '10')),
+                'timeout': float(os.environ.get('DATABASE_POOL_TIMEOUT', '10')),
+            }
+
+
 # ============================================
 # Celery Configuration
 # ============================================
@@ -405,6 +617,14 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'listings.tasks.send_new_opportunity_notifications',
         'schedule': 86400.0,  # every 24 hours
     },
+    'update-trending-scores': {
+        'task': 'listings.tasks.update_trending_scores',
+        'schedule': TRENDING_RECOMPUTE_SECONDS,
+    },
+    'rebuild-similar-jobs-every-day': {
+        'task': 'listings.tasks.rebuild_similar_jobs',
+        'schedule': 86400.0,  # every 24 hours
+    },
 }
 
 REST_AUTH = {
@@ -445,4 +665,13 @@ SOCIALACCOUNT_PROVIDERS = {
 GOOGLE_REDIRECT_URI = os.environ.get('GOOGLE_REDIRECT_URI', 'http://localhost:3000/api/auth/callback/google')
 LINKEDIN_REDIRECT_URI = os.environ.get('LINKEDIN_REDIRECT_URI', 'http://localhost:3000/api/auth/callback/linkedin')
 
+# Provider calls share one pooled, cookie-less HTTP session per process,
+# with timeouts, and provider signing keys are cached for their Cache-Control
+# max-age, or SOCIAL_METADATA_CACHE_SECONDS without one (see users/adapters.py).
+SOCIALACCOUNT_ADAPTER = 'users.adapters.SocialAccountAdapter'
+SOCIAL_HTTP_POOL_SIZE = int(os.environ.get('SOCIAL_HTTP_POOL_SIZE', '10'))
+SOCIAL_HTTP_CONNECT_TIMEOUT = float(os.environ.get('SOCIAL_HTTP_CONNECT_TIMEOUT', '3'))
+SOCIAL_HTTP_READ_TIMEOUT = float(os.environ.get('SOCIAL_HTTP_READ_TIMEOUT', '5'))
+SOCIAL_METADATA_CACHE_SECONDS = int(os.environ.get('SOCIAL_METADATA_CACHE_SECONDS', '3600'))
+
 
@@ -3,15 +3,19 @@ URL configuration for BYN-K Platform backend.
 """
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from .views import admin_portal_landing, health_check
+from listings.storage import CONTENT_ADDRESSED_PREFIX, serve_content_addressed
+from .views import admin_portal_landing, health_check, livez, metrics_view, readyz
 
 urlpatterns = [
     path('', admin_portal_landing, name='admin-portal-landing'),
     path('health/', health_check, name='health-check'),
     path('api/health/', health_check, name='api-health-check'),
+    path('livez', livez, name='livez'),
+    path('readyz', readyz, name='readyz'),
+    path('metrics', metrics_view, name='metrics'),
     path('admin/', admin.site.urls),
     path('api/', include('listings.urls')),
     path('api/auth/', include('users.urls')),
@@ -19,6 +23,17 @@ urlpatterns = [
     path('api/auth/registration/', include('dj_rest_auth.registration.urls')),
 ]
 
+# Content-addressed logos: public, immutable, cached for a year. In production
+# the web server or object storage serves them with the same Cache-Control.
+if settings.SERVE_CONTENT_ADDRESSED_MEDIA:
+    urlpatterns.append(
+        re_path(
+            rf"^{settings.MEDIA_URL.strip('/')}/{CONTENT_ADDRESSED_PREFIX}/(?P<path>.+)$",
+            serve_content_addressed,
+            name='content-addressed-media',
+        )
+    )
+
 # Serve media files in development (protected media in production)
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,5 +1,6 @@
 import os
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
 from django.shortcuts import render
 from django.conf import settings
 
@@ -16,10 +17,37 @@ def admin_portal_landing(request):
     return render(request, "admin_portal_landing.html", context)
 
 
+def livez(request):
+    """
+    Liveness probe: no database, cache or file I/O.
+    Point load balancer health checks here.
+    """
+    response = HttpResponse("ok", content_type="text/plain")
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def readyz(request):
+    """
+    Readiness probe: database, cache, Celery broker and media storage,
+    checked in parallel with timeouts and cached for a few seconds.
+    """
+    from .health import readiness
+
+    ready, checks, cached = readiness()
+    response = JsonResponse(
+        {"status": "ok" if ready else "unavailable", "checks": checks, "cached": cached},
+        status=200 if ready else 503,
+    )
+    response["Cache-Control"] = "no-store"
+    return response
+
+
 def health_check(request):
     """
     Health check endpoint for monitoring and connectivity verification.
     Returns basic system status and configuration info for debugging.
+    Load balancers should probe `/livez` / `/readyz` instead.
     """
     # Get request origin for CORS debugging
     origin = request.META.get('HTTP_ORIGIN', 'No origin header')
@@ -60,3 +88,24 @@ def health_check(request):
     response["Access-Control-Allow-Methods"] = "GET, OPTIONS"
     response["Access-Control-Allow-Headers"] = "Content-Type"
     return response
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint (text exposition format).
+    Aggregates all Gunicorn/Celery worker processes in multiprocess mode.
+    """
+    from .metrics import render_latest
+
+    token = getattr(settings, 'METRICS_AUTH_TOKEN', '')
+    if not token:
+        # Per-view traffic and error rates are not public: no token, no endpoint.
+        return HttpResponse(status=404)
+    supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ').strip()
+    if not constant_time_compare(supplied, token):
+        return HttpResponse(status=401)
+
+    payload, content_type = render_latest()
+    response = HttpResponse(payload, content_type=content_type)
+    response['Cache-Control'] = 'no-store'
+    return response
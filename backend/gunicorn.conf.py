@@ -0,0 +1,25 @@
+"""
+Gunicorn settings loaded automatically from the working directory.
+
+Command-line flags in the Procfile still take precedence; this file only
+adds the hooks prometheus_client needs in multiprocess mode.
+"""
+
+import glob
+import os
+
+
+def on_starting(server):
+    # Samples from a previous master would otherwise be aggregated forever.
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
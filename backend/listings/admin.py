@@ -6,13 +6,21 @@ Custom admin forms for quick content entry from WhatsApp messages.
 Uses Django Unfold for modern, Tailwind-based SaaS look.
 """
 
-from django.utils.html import mark_safe
-from django.contrib import admin
+from django.utils.html import format_html_join, mark_safe
+from django.contrib import admin, messages
 from django.conf import settings
 from django import forms
-from django.utils.text import slugify
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Exists, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+from django.urls import reverse
 from unfold.admin import ModelAdmin
-from .models import Job, ClickAnalytics, Partner, Event
+from .models import Job, ClickAnalytics, Partner, Event, JobSimilarityBucket
+from .images import smallest_variant_url
+from .raw_data import autofill_job, save_autofilled
+from .slugs import unique_slug
 from .tasks import send_immediate_opportunity_notification
 
 # ============================================
@@ -64,6 +72,61 @@ class JobAdminForm(forms.ModelForm):
             }),
         }
 
+    def clean_slug(self):
+        """
+        Suffix a taken slug (e.g. a re-used title) instead of failing the
+        unique check, so admins never have to invent one by hand.
+        """
+        slug = self.cleaned_data.get('slug')
+        if not slug:
+            return slug
+        return unique_slug(Job, slug, instance=self.instance)
+
+
+class PossibleDuplicateFilter(admin.SimpleListFilter):
+    """Filter listings that share an LSH bucket with another listing."""
+
+    title = 'possible duplicate'
+    parameter_name = 'possible_duplicate'
+
+    def lookups(self, request, model_admin):
+        return [('yes', 'Yes'), ('no', 'No')]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(has_duplicate_candidates=True)
+        if self.value() == 'no':
+            return queryset.filter(has_duplicate_candidates=False)
+        return queryset
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the planner's row estimate for big, unfiltered tables.
+
+    On PostgreSQL an unfiltered changelist takes its total from
+    `pg_class.reltuples` once the table holds more than `threshold` rows,
+    instead of running `COUNT(*)` over the whole table. Filtered or small
+    querysets (and other databases) are counted exactly.
+    """
+
+    threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[getattr(queryset, 'db', 'default')]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > self.threshold:
+                return int(row[0])
+        return super().count
+
 
 @admin.register(Job)
 class JobAdmin(ModelAdmin):
@@ -85,6 +148,7 @@ class JobAdmin(ModelAdmin):
         'is_active',
         'deadline',
         'total_clicks_display',
+        'duplicate_flag',
         'created_at'
     ]
     
@@ -104,12 +168,20 @@ class JobAdmin(ModelAdmin):
         'is_verified',
         'is_active',
         'is_featured',
+        PossibleDuplicateFilter,
     ]
     
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
+
+    # Skip the second, unfiltered COUNT(*) on every filtered page load and
+    # estimate the total for very large tables.
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     
-    readonly_fields = ['created_at', 'updated_at', 'total_clicks_display']
+    readonly_fields = ['created_at', 'updated_at', 'total_clicks_display', 'possible_duplicates_display']
+
+    actions = ['autofill_from_raw_data', 'autofill_from_raw_data_overwrite']
     
     # UPDATED FIELDSETS: Added 'slug' to 'Opportunity Details'
     fieldsets = (
@@ -165,6 +237,7 @@ class JobAdmin(ModelAdmin):
         ('Analytics & Metadata', {
             'fields': (
                 'total_clicks_display',
+                'possible_duplicates_display',
                 'created_by', 
                 'created_at', 
                 'updated_at',
@@ -177,26 +250,117 @@ class JobAdmin(ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """
+        Flag duplicate candidates with one correlated EXISTS over the
+        indexed LSH buckets instead of a lookup per changelist row.
+        """
+        shared_bucket = JobSimilarityBucket.objects.filter(
+            bucket=OuterRef('bucket')
+        ).exclude(job_id=OuterRef('job_id'))
+        own_shared_buckets = JobSimilarityBucket.objects.filter(
+            job_id=OuterRef('pk')
+        ).filter(Exists(shared_bucket))
+        # Summed in a correlated subquery rather than a JOIN + GROUP BY, so
+        # the changelist COUNT(*) and date hierarchy stay plain table scans.
+        click_totals = (
+            ClickAnalytics.objects.filter(job=OuterRef('pk'))
+            .order_by()
+            .values('job')
+            .annotate(total=Sum('click_count'))
+            .values('total')
+        )
+        return super().get_queryset(request).annotate(
+            has_duplicate_candidates=Exists(own_shared_buckets),
+            total_clicks=Coalesce(Subquery(click_totals, output_field=IntegerField()), 0),
+        )
+
     def org_logo_thumbnail(self, obj):
         if obj.org_logo:
-            return mark_safe(f'<img src="{obj.org_logo.url}" width="50" height="50" style="object-fit: contain;" />')
+            # Prefer the small derivative over scaling the full upload down to 50px.
+            src = smallest_variant_url(obj.org_logo_variants, obj.org_logo.storage, min_size=50) or obj.org_logo.url
+            return mark_safe(f'<img src="{src}" width="50" height="50" style="object-fit: contain;" />')
         return "No Image"
     org_logo_thumbnail.short_description = 'Logo'
     
+    @admin.display(description='Total Clicks', ordering='total_clicks')
     def total_clicks_display(self, obj):
+        # Annotated in get_queryset(); the fallback only runs for unsaved
+        # or externally loaded objects.
+        total = getattr(obj, 'total_clicks', None)
+        if total is not None:
+            return total
         if obj.pk:
-            return sum(a.click_count for a in obj.click_analytics.all())
+            return obj.click_analytics.aggregate(total=Sum('click_count'))['total'] or 0
         return 0
-    total_clicks_display.short_description = 'Total Clicks'
+
+    @admin.display(description='Possible Duplicate', boolean=True)
+    def duplicate_flag(self, obj):
+        return getattr(obj, 'has_duplicate_candidates', False)
+
+    @admin.display(description='Possible Duplicates')
+    def possible_duplicates_display(self, obj):
+        if not obj.pk:
+            return "-"
+        matches = obj.find_duplicates()
+        if not matches:
+            return "No likely duplicates found."
+        return format_html_join(
+            mark_safe('<br>'),
+            '<a href="{}">{}</a> ({}% similar)',
+            (
+                (
+                    reverse('admin:listings_job_change', args=[match.pk]),
+                    str(match),
+                    round(similarity * 100),
+                )
+                for match, similarity in matches
+            ),
+        )
+
+    @admin.action(description='Auto-fill blank fields from WhatsApp raw data')
+    def autofill_from_raw_data(self, request, queryset):
+        """
+        Parse raw_data for the selected listings and fill any blank fields.
+        Existing values entered by admins are never overwritten here.
+        """
+        self._autofill(request, queryset, overwrite=False)
+
+    @admin.action(description='Auto-fill from WhatsApp raw data, replacing current values')
+    def autofill_from_raw_data_overwrite(self, request, queryset):
+        """
+        Like `autofill_from_raw_data`, but every field found in raw_data
+        replaces the current value, including category and application type
+        still at their defaults.
+        """
+        self._autofill(request, queryset, overwrite=True)
+
+    def _autofill(self, request, queryset, overwrite):
+        updated = 0
+        with transaction.atomic():
+            for job in queryset.exclude(raw_data=''):
+                changed = autofill_job(job, overwrite=overwrite)
+                if changed:
+                    save_autofilled(job, changed)
+                    updated += 1
+
+        if updated:
+            self.message_user(
+                request,
+                f"Auto-filled {updated} listing(s) from raw data.",
+                messages.SUCCESS,
+            )
+        else:
+            self.message_user(
+                request,
+                "No fields could be filled from the selected raw data.",
+                messages.WARNING,
+            )
     
     def save_model(self, request, obj, form, change):
         """
-        Final safety check: If slug is somehow still empty, generate it.
-        Also sets the creator.
+        Set the creator. Blank slugs are allocated uniquely by Job.save.
         """
-        if not obj.slug:
-            obj.slug = slugify(obj.title)
-            
         if not change:
             obj.created_by = request.user
             
@@ -213,8 +377,8 @@ class JobAdmin(ModelAdmin):
 
 @admin.register(ClickAnalytics)
 class ClickAnalyticsAdmin(ModelAdmin):
-    list_display = ['job', 'click_type', 'click_count', 'last_clicked_at']
-    readonly_fields = ['click_count', 'last_clicked_at']
+    list_display = ['job', 'click_type', 'click_count', 'unique_count', 'last_clicked_at']
+    readonly_fields = ['click_count', 'unique_count', 'last_clicked_at']
 
 
 @admin.register(Partner)
@@ -228,13 +392,15 @@ class PartnerAdmin(ModelAdmin):
 
     def logo_thumbnail(self, obj):
         if obj.logo:
-            return mark_safe(f'<img src="{obj.logo.url}" width="36" height="36" style="object-fit:contain;border-radius:8px;" />')
+            src = smallest_variant_url(obj.logo_variants, obj.logo.storage, min_size=36) or obj.logo.url
+            return mark_safe(f'<img src="{src}" width="36" height="36" style="object-fit:contain;border-radius:8px;" />')
         return "-"
     logo_thumbnail.short_description = 'Logo'
 
     def logo_preview(self, obj):
         if obj.logo:
-            return mark_safe(f'<img src="{obj.logo.url}" width="120" height="120" style="object-fit:contain;border-radius:10px;border:1px solid #e2e8f0;padding:8px;background:#fff;" />')
+            src = smallest_variant_url(obj.logo_variants, obj.logo.storage, min_size=120) or obj.logo.url
+            return mark_safe(f'<img src="{src}" width="120" height="120" style="object-fit:contain;border-radius:10px;border:1px solid #e2e8f0;padding:8px;background:#fff;" />')
         return "No uploaded logo yet."
     logo_preview.short_description = 'Logo Preview'
 
@@ -0,0 +1,245 @@
+"""
+Async read path for the public listing endpoints.
+
+Under ASGI (config/asgi.py) a slow client or slow query in a sync view
+pins a worker thread. With ASYNC_READ_VIEWS on, GET requests to the hot
+read-only endpoints are served by the coroutines below instead, which
+await the ORM (`acount()`, `aget()`, `async for`) and the cache
+(`aget()`/`aset()`). Writes (POST to events/partners) still go to the
+DRF views, so permissions and validation live in one place.
+
+Responses match the DRF views field for field: filtering and ordering
+reuse the views' own filter backends, and pagination follows
+PageNumberPagination's `count/next/previous/results` shape.
+"""
+
+import math
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from config.metrics import observe_cache
+from .models import Event, Job, Partner
+from .serializers import EventSerializer, JobListSerializer, JobSerializer, PartnerSerializer
+from .views import (
+    CategoryCountsView,
+    EventListView,
+    JobDetailBySlugView,
+    JobListView,
+    PartnerListView,
+    partners_with_opportunity_count,
+)
+
+CATEGORY_KEYS = {
+    'job': 'jobs',
+    'scholarship': 'scholarships',
+    'internship': 'internships',
+    'fellowship': 'fellowships',
+    'training': 'training',
+}
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False)
+
+
+def _not_found(detail):
+    return _json({'detail': detail}, status=404)
+
+
+async def _cached(key, compute):
+    """
+    Return the cached value for `key`, computing and storing it on a miss.
+
+    A `compute` result of None (e.g. a page past the end) is not stored.
+    """
+    ttl = getattr(settings, 'PUBLIC_READ_CACHE_SECONDS', 30)
+    if not ttl:
+        return await compute()
+    value = await cache.aget(key)
+    observe_cache('public_read', value is not None)
+    if value is None:
+        value = await compute()
+        if value is not None:
+            await cache.aset(key, value, ttl)
+    return value
+
+
+async def _paginate(request, queryset, url=None):
+    """
+    Async equivalent of DRF's PageNumberPagination.
+
+    Returns (page dict without results, rows) or (None, None) when the
+    requested page does not exist. Next/previous links are built from `url`,
+    defaulting to the request's absolute URI.
+    """
+    page_size = api_settings.PAGE_SIZE
+    count = await queryset.acount()
+    num_pages = max(1, math.ceil(count / page_size))
+
+    page_param = request.GET.get('page', 1)
+    if page_param == 'last':
+        page_param = num_pages
+    try:
+        number = int(page_param)
+    except (TypeError, ValueError):
+        return None, None
+    if number < 1 or number > num_pages:
+        return None, None
+
+    offset = (number - 1) * page_size
+    rows = [row async for row in queryset[offset:offset + page_size]]
+
+    url = url or request.build_absolute_uri()
+    next_url = replace_query_param(url, 'page', number + 1) if number < num_pages else None
+    if number == 1:
+        previous_url = None
+    elif number == 2:
+        previous_url = remove_query_param(url, 'page')
+    else:
+        previous_url = replace_query_param(url, 'page', number - 1)
+    return {'count': count, 'next': next_url, 'previous': previous_url}, rows
+
+
+async def job_list(request):
+    """GET /api/opportunities/ (async counterpart of JobListView)."""
+    drf_request = Request(request)
+    view = JobListView(request=drf_request, args=(), kwargs={}, format_kwarg=None)
+    queryset = view.get_queryset()
+    try:
+        for backend in view.filter_backends:
+            queryset = backend().filter_queryset(drf_request, queryset, view)
+    except ValidationError as exc:
+        return _json(exc.detail, status=400)
+
+    page, rows = await _paginate(request, queryset)
+    if page is None:
+        return _not_found('Invalid page.')
+    page['results'] = JobListSerializer(rows, many=True, context={'request': request}).data
+    page['disclaimer'] = settings.PLATFORM_DISCLAIMER
+    return _json(page)
+
+
+async def job_detail_by_slug(request, slug):
+    """GET /api/opportunities/by-slug/<slug>/ (async counterpart of JobDetailBySlugView)."""
+    try:
+        job = await JobDetailBySlugView.queryset.aget(slug=slug)
+    except Job.DoesNotExist:
+        return _not_found('No Job matches the given query.')
+    return _json(JobSerializer(job, context={'request': request}).data)
+
+
+async def event_list(request):
+    """GET /api/events/ (async counterpart of EventListView)."""
+    limit = request.GET.get('page_size')
+    try:
+        limit_value = int(limit) if limit else 6
+    except (TypeError, ValueError):
+        limit_value = 6
+    limit_value = max(1, min(limit_value, 50))
+
+    async def compute():
+        events = Event.objects.filter(is_active=True, start_time__gte=timezone.now()).order_by('start_time')
+        rows = [event async for event in events[:limit_value]]
+        return {'results': EventSerializer(rows, many=True, context={'request': request}).data}
+
+    return _json(await _cached(f'public_read:events:{request.get_host()}:{limit_value}', compute))
+
+
+async def category_counts(request):
+    """GET /api/category-counts/ (async counterpart of CategoryCountsView)."""
+
+    async def compute():
+        counts = dict.fromkeys(CATEGORY_KEYS.values(), 0)
+        totals = Job.objects.filter(is_active=True).values('category').annotate(total=Count('id'))
+        async for row in totals:
+            key = CATEGORY_KEYS.get(row['category'])
+            if key:
+                counts[key] = row['total']
+        counts['partners'] = await Partner.objects.acount()
+        return counts
+
+    return _json(await _cached('public_read:category_counts', compute))
+
+
+def _partner_params(request):
+    """
+    Return the normalized query params partner_list reads, in sorted order,
+    or None when they are invalid. Anything else in the query string is
+    ignored, so it cannot mint new cache keys.
+    """
+    page = request.GET.get('page', '1')
+    if page != 'last':
+        try:
+            page = int(page)
+        except (TypeError, ValueError):
+            return None
+        if page < 1:
+            return None
+    return sorted({'page': page}.items())
+
+
+async def partner_list(request):
+    """GET /api/partners/ (async counterpart of PartnerListView)."""
+    params = _partner_params(request)
+    if params is None:
+        return _not_found('Invalid page.')
+    url = request.build_absolute_uri(request.path)
+    if params != [('page', 1)]:
+        url = f'{url}?{urlencode(params)}'
+
+    async def compute():
+        page, rows = await _paginate(request, partners_with_opportunity_count(), url=url)
+        if page is None:
+            return None
+        page['results'] = PartnerSerializer(rows, many=True, context={'request': request}).data
+        return page
+
+    data = await _cached(f'public_read:partners:{url}', compute)
+    if data is None:
+        return _not_found('Invalid page.')
+    return _json(data)
+
+
+def read_path(sync_view_class, async_get):
+    """
+    URL view for a read-heavy endpoint.
+
+    Returns the DRF view unless ASYNC_READ_VIEWS is on, in which case GET
+    and HEAD are served by `async_get` and other methods are handed to
+    the DRF view in a worker thread.
+    """
+    sync_view = sync_view_class.as_view()
+    if not getattr(settings, 'ASYNC_READ_VIEWS', False):
+        return sync_view
+    sync_view_async = sync_to_async(sync_view)
+
+    @csrf_exempt
+    async def view(request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return await async_get(request, *args, **kwargs)
+        return await sync_view_async(request, *args, **kwargs)
+
+    view.query_budget = getattr(sync_view_class, 'query_budget', None)
+    view.view_class = sync_view_class
+    return view
+
+
+ASYNC_READ_VIEWS = {
+    JobListView: job_list,
+    JobDetailBySlugView: job_detail_by_slug,
+    EventListView: event_list,
+    CategoryCountsView: category_counts,
+    PartnerListView: partner_list,
+}
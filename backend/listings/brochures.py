@@ -0,0 +1,204 @@
+"""
+Brochure Serving Backends.
+
+Phase 3: Security NFRs
+Brochures stay behind `ProtectedBrochureView`, but the bytes do not have
+to flow through a Gunicorn worker. `BROCHURE_SERVING_BACKEND` selects how
+the file is delivered once the view has authorized the request:
+
+- "direct": served by Django with Range / If-Modified-Since support
+- "x-accel-redirect": handed to nginx via an internal location
+- "x-sendfile": handed to Apache/lighttpd via mod_xsendfile
+- "signed-url": redirect to a short-lived URL on object storage
+- or a dotted path to any class implementing `serve()`
+"""
+
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.utils.http import http_date
+from django.utils.module_loading import import_string
+from django.views.static import was_modified_since
+
+PDF_CONTENT_TYPE = 'application/pdf'
+STREAM_BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _inline_disposition(filename):
+    return f'inline; filename="{filename}"'
+
+
+class BaseBrochureBackend:
+    """Deliver an authorized brochure file. Subclasses implement `serve()`."""
+
+    def serve(self, request, field_file, filename):
+        raise NotImplementedError
+
+
+class DirectBrochureBackend(BaseBrochureBackend):
+    """
+    Serve the file from local storage through Django.
+
+    Supports conditional requests (304) and single byte ranges (206) so
+    PDF viewers and resumed mobile downloads do not refetch the whole file.
+    """
+
+    def serve(self, request, field_file, filename):
+        path = field_file.path
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise Http404("Brochure file is missing.")
+
+        last_modified = http_date(stat.st_mtime)
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+            response = HttpResponseNotModified()
+            response['Last-Modified'] = last_modified
+            return response
+
+        size = stat.st_size
+        byte_range = None
+        range_header = request.META.get('HTTP_RANGE')
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if range_header and (not if_range or if_range == last_modified):
+            byte_range = parse_range(range_header, size)
+            if byte_range is False:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _read_range(path, start, length),
+                status=206,
+                content_type=PDF_CONTENT_TYPE,
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(length)
+        else:
+            # FileResponse handles closing the file automatically
+            response = FileResponse(open(path, 'rb'), content_type=PDF_CONTENT_TYPE)
+
+        response['Accept-Ranges'] = 'bytes'
+        response['Last-Modified'] = last_modified
+        response['Content-Disposition'] = _inline_disposition(filename)
+        return response
+
+
+class XAccelRedirectBrochureBackend(BaseBrochureBackend):
+    """
+    Let nginx stream the file from an `internal` location.
+
+    Example nginx config (BROCHURE_X_ACCEL_PREFIX = '/protected-media/'):
+        location /protected-media/ { internal; alias /app/backend/media/; }
+    """
+
+    def serve(self, request, field_file, filename):
+        prefix = getattr(settings, 'BROCHURE_X_ACCEL_PREFIX', '/protected-media/')
+        response = HttpResponse(content_type=PDF_CONTENT_TYPE)
+        response['X-Accel-Redirect'] = f"{prefix.rstrip('/')}/{quote(field_file.name)}"
+        response['Content-Disposition'] = _inline_disposition(filename)
+        return response
+
+
+class XSendfileBrochureBackend(BaseBrochureBackend):
+    """Let Apache (mod_xsendfile) or lighttpd stream the file from disk."""
+
+    def serve(self, request, field_file, filename):
+        response = HttpResponse(content_type=PDF_CONTENT_TYPE)
+        response['X-Sendfile'] = field_file.path
+        response['Content-Disposition'] = _inline_disposition(filename)
+        return response
+
+
+class SignedURLBrochureBackend(BaseBrochureBackend):
+    """
+    Redirect to a short-lived URL generated by the storage backend.
+
+    Intended for object storage (e.g. S3 via django-storages), whose
+    `url()` signs the link; the redirect itself must not be cached longer
+    than the signature is valid.
+    """
+
+    def serve(self, request, field_file, filename):
+        ttl = getattr(settings, 'BROCHURE_SIGNED_URL_TTL', 300)
+        storage = field_file.storage
+        try:
+            url = storage.url(field_file.name, expire=ttl)
+        except TypeError:
+            # Storages without expiring URLs (e.g. FileSystemStorage).
+            url = storage.url(field_file.name)
+        response = HttpResponseRedirect(url)
+        response['Cache-Control'] = f'private, max-age={max(ttl - 30, 0)}'
+        return response
+
+
+BROCHURE_BACKENDS = {
+    'direct': DirectBrochureBackend,
+    'x-accel-redirect': XAccelRedirectBrochureBackend,
+    'x-sendfile': XSendfileBrochureBackend,
+    'signed-url': SignedURLBrochureBackend,
+}
+
+
+def get_brochure_backend():
+    """Instantiate the backend named by `BROCHURE_SERVING_BACKEND`."""
+    name = getattr(settings, 'BROCHURE_SERVING_BACKEND', 'direct')
+    backend_class = BROCHURE_BACKENDS.get(name)
+    if backend_class is None:
+        backend_class = import_string(name)
+    return backend_class()
+
+
+def parse_range(header, size):
+    """
+    Parse a single `bytes=` range.
+
+    Returns (start, end) inclusive, None when the header should be ignored
+    (malformed, such as a last byte before the first, or multi-range), or
+    False when it is valid but unsatisfiable (RFC 9110 section 14.2).
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        return False
+    return start, min(end, size - 1)
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as brochure:
+        brochure.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = brochure.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
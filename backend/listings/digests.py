@@ -0,0 +1,228 @@
+"""
+Personalized opportunity digests for BYN-K Platform.
+
+Subscribers store `JobFilter`-style preferences (categories, locations,
+ID documents held); an empty list means "no preference". Many subscribers
+share the same preferences, so matching works on distinct preference
+sets rather than on subscribers:
+
+1. `PreferenceIndex` is an inverted index from a job's category, location
+   and accepted documents to the preference sets that accept it, so each
+   new job is matched with a few set intersections.
+2. Subscribers with the same preferences and the same notification window
+   get the same job list; each distinct list is rendered once, and only
+   the unsubscribe token differs between their emails.
+
+A run is one query for subscribers, one for the new jobs and a batched
+update of `last_notified_at`, whatever the number of subscribers.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection, send_mail
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from config.metrics import track_email
+
+from .models import Job, Subscription
+
+# Stands in for the subscriber's token while a shared body is rendered.
+TOKEN_PLACEHOLDER = '__subscriber_token__'
+BATCH_SIZE = 500
+
+
+# Documents a job listing "any valid ID" accepts.
+ID_DOCUMENTS = ('alien_card', 'ctd', 'passport', 'waiting_slip', 'national_id')
+
+
+def job_documents(job):
+    """
+    The documents a job accepts, for matching: 'any_id' stands for every ID
+    document, and 'not_specified' for no requirement at all.
+    """
+    documents = set(job.required_documents) if isinstance(job.required_documents, list) else set()
+    documents.discard('not_specified')
+    if 'any_id' in documents:
+        documents.update(ID_DOCUMENTS)
+    return documents
+
+
+class PreferenceIndex:
+    """
+    Inverted index over distinct preference sets.
+
+    Each set is a (categories, locations, documents) tuple as in
+    `Subscription.preference_key`. A job matches a set when its category and
+    location are listed (or the list is empty) and it accepts at least one
+    held document (or lists none, or the set holds none); see
+    `job_documents()` for 'any_id' and 'not_specified'.
+    """
+
+    def __init__(self, preference_sets):
+        self.sets = list(preference_sets)
+        self.by_category = defaultdict(set)
+        self.by_location = defaultdict(set)
+        self.by_document = defaultdict(set)
+        self.any_category, self.any_location, self.any_document = set(), set(), set()
+        for number, (categories, locations, documents) in enumerate(self.sets):
+            for values, index, unrestricted in (
+                (categories, self.by_category, self.any_category),
+                (locations, self.by_location, self.any_location),
+                (documents, self.by_document, self.any_document),
+            ):
+                if values:
+                    for value in values:
+                        index[value].add(number)
+                else:
+                    unrestricted.add(number)
+
+    def matches(self, job):
+        """Positions in `sets` of the preference sets accepting the job."""
+        matched = (self.by_category.get(job.category, set()) | self.any_category) & (
+            self.by_location.get(job.location, set()) | self.any_location
+        )
+        documents = job_documents(job)
+        if matched and documents:
+            accepted = set(self.any_document)
+            for document in documents:
+                accepted |= self.by_document.get(document, set())
+            matched &= accepted
+        return matched
+
+    def jobs_by_set(self, jobs):
+        """{preference set: [matching jobs in the given order]}"""
+        matched = defaultdict(list)
+        for job in jobs:
+            for number in self.matches(job):
+                matched[self.sets[number]].append(job)
+        return matched
+
+
+def unsubscribe_context():
+    return {
+        'unsubscribe_link': f"{settings.FRONTEND_URL}/unsubscribe?token={TOKEN_PLACEHOLDER}",
+        'frontend_url': settings.FRONTEND_URL,
+    }
+
+
+def render_digest(jobs):
+    """Subject, text and HTML of a digest, with `TOKEN_PLACEHOLDER` in the unsubscribe link."""
+    context = {'jobs': jobs, **unsubscribe_context()}
+    subject = f'New Opportunities on BYN-K Platform ({len(jobs)} new)'
+    text_body = render_to_string('listings/emails/new_opportunities.txt', context)
+    html_body = render_to_string('listings/emails/new_opportunities.html', context)
+    return subject, text_body, html_body
+
+
+def render_job_notification(job):
+    """Subject, text and HTML announcing one job, with `TOKEN_PLACEHOLDER` in the unsubscribe link."""
+    context = {
+        'job': job,
+        'job_url': f"{settings.FRONTEND_URL}/opportunities/{job.slug or job.id}",
+        **unsubscribe_context(),
+    }
+    subject = f'New Opportunity: {job.title} at {job.organization_name}'
+    text_body = render_to_string('listings/emails/single_opportunity.txt', context)
+    html_body = render_to_string('listings/emails/single_opportunity.html', context)
+    return subject, text_body, html_body
+
+
+def send_rendered(kind, rendered, subscriber, connection, fail_silently):
+    """Send a shared rendering to one subscriber, filling in their token. Returns send_mail()'s result."""
+    subject, text_body, html_body = rendered
+    token = str(subscriber.confirmation_token)
+    with track_email(kind) as outcome:
+        outcome['sent'] = send_mail(
+            subject,
+            text_body.replace(TOKEN_PLACEHOLDER, token),
+            settings.DEFAULT_FROM_EMAIL,
+            [subscriber.email],
+            html_message=html_body.replace(TOKEN_PLACEHOLDER, token),
+            fail_silently=fail_silently,
+            connection=connection,
+        )
+    return outcome['sent']
+
+
+def active_subscribers(*fields):
+    return list(
+        Subscription.objects.filter(is_active=True).only(
+            'pk', 'email', 'confirmation_token', *fields, *Subscription.PREFERENCE_FIELDS
+        )
+    )
+
+
+def mark_notified(pks, now):
+    pks = list(pks)
+    for start in range(0, len(pks), BATCH_SIZE):
+        Subscription.objects.filter(pk__in=pks[start:start + BATCH_SIZE]).update(last_notified_at=now)
+
+
+def send_digests(now=None):
+    """
+    Email every active subscriber the new jobs matching their preferences.
+    Returns the number of digests sent.
+    """
+    now = now or timezone.now()
+    first_window = now - timedelta(days=1)
+    subscribers = active_subscribers('last_notified_at')
+    if not subscribers:
+        return 0
+
+    windows = {subscriber.pk: subscriber.last_notified_at or first_window for subscriber in subscribers}
+    jobs = list(Job.objects.filter(is_active=True, created_at__gt=min(windows.values()), created_at__lte=now))
+    index = PreferenceIndex({subscriber.preference_key for subscriber in subscribers})
+    jobs_by_set = index.jobs_by_set(jobs)
+
+    # Subscribers sharing preferences and window receive identical digests.
+    recipients = defaultdict(list)
+    for subscriber in subscribers:
+        since = windows[subscriber.pk]
+        matched = tuple(job for job in jobs_by_set.get(subscriber.preference_key, ()) if job.created_at > since)
+        if matched:
+            recipients[matched].append(subscriber)
+
+    # Subscribers without new matches are notified as of now too; the others once their email is sent.
+    matched_pks = {subscriber.pk for group in recipients.values() for subscriber in group}
+    notified = [subscriber.pk for subscriber in subscribers if subscriber.pk not in matched_pks]
+    sent = 0
+    # One SMTP session for the whole run instead of a connection per email.
+    connection = get_connection()
+    try:
+        if recipients:
+            connection.open()
+        for matched, group in recipients.items():
+            rendered = render_digest(list(matched))
+            for subscriber in group:
+                send_rendered('new_opportunities_digest', rendered, subscriber, connection, fail_silently=False)
+                notified.append(subscriber.pk)
+                sent += 1
+    finally:
+        connection.close()
+        mark_notified(notified, now)
+    return sent
+
+
+def send_job_notification(job):
+    """Email a newly posted job to the active subscribers whose preferences accept it. Returns the number sent."""
+    subscribers = active_subscribers()
+    index = PreferenceIndex({subscriber.preference_key for subscriber in subscribers})
+    accepted = {index.sets[number] for number in index.matches(job)}
+    if not accepted:
+        return 0
+
+    rendered = render_job_notification(job)
+    sent = 0
+    connection = get_connection(fail_silently=True)
+    try:
+        connection.open()
+        for subscriber in subscribers:
+            if subscriber.preference_key in accepted:
+                # Don't fail for individual emails
+                sent += send_rendered('single_opportunity', rendered, subscriber, connection, fail_silently=True)
+    finally:
+        connection.close()
+    return sent
@@ -0,0 +1,181 @@
+"""
+Near-duplicate detection for BYN-K Platform.
+
+The same opportunity is often forwarded on several WhatsApp groups and
+re-entered with a slightly different title. Each Job stores a compact
+MinHash signature of its normalized title, organization and description;
+locality-sensitive hashing (LSH) bands of that signature are indexed in
+`JobSimilarityBucket`, so likely duplicates are found with an indexed
+bucket lookup instead of comparing against every listing.
+"""
+
+import random
+import re
+import struct
+import zlib
+
+# 64 permutations split into 16 bands of 4 rows: pairs with an estimated
+# Jaccard similarity around 0.5 or higher share at least one bucket.
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 5
+# Long descriptions add little signal; cap the text so hashing stays cheap.
+MAX_TEXT_LENGTH = 4000
+DEFAULT_SIMILARITY_THRESHOLD = 0.6
+
+SIGNATURE_SOURCE_FIELDS = frozenset({'title', 'organization_name', 'description'})
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SIGNATURE_FORMAT = f"<{NUM_PERMUTATIONS}I"
+_NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+
+# Fixed seed so signatures are stable across processes and deployments.
+_rng = random.Random(20260316)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def normalize_text(*parts):
+    """Lowercase and collapse punctuation/whitespace so forwards compare equal."""
+    text = " ".join(part for part in parts if part)
+    return _NORMALIZE_RE.sub(" ", text.lower()).strip()[:MAX_TEXT_LENGTH]
+
+
+def shingle_hashes(text):
+    """Return the set of 32-bit hashes of character shingles in `text`."""
+    if not text:
+        return set()
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode('utf-8'))}
+    encoded = text.encode('utf-8')
+    return {
+        zlib.crc32(encoded[index:index + SHINGLE_SIZE])
+        for index in range(len(encoded) - SHINGLE_SIZE + 1)
+    }
+
+
+def compute_signature(text):
+    """Return the packed MinHash signature for `text`, or None when empty."""
+    hashes = shingle_hashes(text)
+    if not hashes:
+        return None
+    values = [
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    ]
+    return struct.pack(_SIGNATURE_FORMAT, *values)
+
+
+def compute_job_signature(job):
+    return compute_signature(normalize_text(job.title, job.organization_name, job.description))
+
+
+def unpack_signature(signature):
+    if not signature:
+        return None
+    return struct.unpack(_SIGNATURE_FORMAT, bytes(signature))
+
+
+def band_buckets(signature):
+    """Return one LSH bucket key per band; keys embed the band index."""
+    if not signature:
+        return []
+    raw = bytes(signature)
+    band_width = ROWS_PER_BAND * 4
+    return [
+        (band << 32) | zlib.crc32(raw[band * band_width:(band + 1) * band_width])
+        for band in range(BANDS)
+    ]
+
+
+def estimate_similarity(signature_a, signature_b):
+    """Estimated Jaccard similarity: share of matching MinHash values."""
+    values_a = unpack_signature(signature_a)
+    values_b = unpack_signature(signature_b)
+    if not values_a or not values_b:
+        return 0.0
+    matches = sum(1 for left, right in zip(values_a, values_b) if left == right)
+    return matches / NUM_PERMUTATIONS
+
+
+def find_duplicate_candidates(job, threshold=DEFAULT_SIMILARITY_THRESHOLD, limit=10):
+    """
+    Return [(other_job, similarity)] for listings that are likely duplicates
+    of `job`, most similar first. Uses the LSH bucket index, then verifies
+    each candidate against its stored signature.
+    """
+    from .models import Job, JobSimilarityBucket
+
+    buckets = band_buckets(job.minhash_signature)
+    if not buckets:
+        return []
+
+    candidate_ids = (
+        JobSimilarityBucket.objects.filter(bucket__in=buckets)
+        .exclude(job_id=job.pk)
+        .values_list('job_id', flat=True)
+        .distinct()
+    )
+    candidates = Job.objects.filter(pk__in=candidate_ids).only(
+        'id', 'title', 'organization_name', 'minhash_signature', 'created_at'
+    )
+
+    matches = []
+    for candidate in candidates:
+        similarity = estimate_similarity(job.minhash_signature, candidate.minhash_signature)
+        if similarity >= threshold:
+            matches.append((candidate, similarity))
+    matches.sort(key=lambda item: item[1], reverse=True)
+    return matches[:limit]
+
+
+def find_duplicate_clusters(signatures, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+    """
+    Group (job_id, signature) pairs into clusters of likely duplicates.
+
+    Candidates are generated by in-memory LSH bucketing and confirmed by
+    signature similarity; connected pairs are merged with union-find.
+    Returns a list of sorted job-id lists, largest cluster first.
+    """
+    signature_by_id = {}
+    buckets = {}
+    for job_id, signature in signatures:
+        if not signature:
+            continue
+        signature = bytes(signature)
+        signature_by_id[job_id] = signature
+        for bucket in band_buckets(signature):
+            buckets.setdefault(bucket, []).append(job_id)
+
+    parent = {job_id: job_id for job_id in signature_by_id}
+
+    def find(job_id):
+        while parent[job_id] != job_id:
+            parent[job_id] = parent[parent[job_id]]
+            job_id = parent[job_id]
+        return job_id
+
+    checked = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for index, left in enumerate(members):
+            for right in members[index + 1:]:
+                pair = (left, right) if left < right else (right, left)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if estimate_similarity(signature_by_id[left], signature_by_id[right]) >= threshold:
+                    parent[find(left)] = find(right)
+
+    clusters = {}
+    for job_id in signature_by_id:
+        clusters.setdefault(find(job_id), []).append(job_id)
+    return sorted(
+        (sorted(members) for members in clusters.values() if len(members) > 1),
+        key=lambda members: (-len(members), members[0]),
+    )
@@ -0,0 +1,150 @@
+"""
+Streaming exports for BYN-K Platform.
+
+Partner reports pull listings and click stats into spreadsheets. Rows are
+read with `.values_list().iterator(chunk_size=...)` and written straight to
+a `StreamingHttpResponse`, so memory stays flat regardless of row count.
+"""
+
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+
+
+JOB_EXPORT_FIELDS = [
+    'id',
+    'slug',
+    'title',
+    'organization_name',
+    'category',
+    'location',
+    'city',
+    'work_mode',
+    'commitment',
+    'target_group',
+    'education_level',
+    'funding_type',
+    'is_paid',
+    'stipend_min',
+    'stipend_max',
+    'application_type',
+    'external_url',
+    'application_email',
+    'required_documents',
+    'is_verified',
+    'is_active',
+    'is_featured',
+    'is_rolling',
+    'deadline',
+    'created_at',
+    'updated_at',
+]
+
+# (column name, ORM lookup) pairs for click analytics rows.
+ANALYTICS_EXPORT_COLUMNS = [
+    ('job_id', 'job_id'),
+    ('job_slug', 'job__slug'),
+    ('job_title', 'job__title'),
+    ('organization_name', 'job__organization_name'),
+    ('category', 'job__category'),
+    ('click_type', 'click_type'),
+    ('click_count', 'click_count'),
+    ('unique_count', 'unique_count'),
+    ('last_clicked_at', 'last_clicked_at'),
+]
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Selected by `?format=csv` or `Accept: text/csv`.
+
+    Export views stream their own response; this renderer only formats
+    error payloads (validation, permission) for the negotiated type.
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        buffer = _Echo()
+        writer = csv.writer(buffer)
+        items = data.items() if isinstance(data, dict) else [('detail', data)]
+        lines = []
+        for key, value in items:
+            if isinstance(value, (list, tuple)):
+                value = '; '.join(str(message) for message in value)
+            lines.append(writer.writerow([key, value]))
+        return ''.join(lines).encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Selected by `?format=ndjson` or `Accept: application/x-ndjson`."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, cls=DjangoJSONEncoder) + '\n').encode(self.charset)
+
+
+class _Echo:
+    """File-like object whose write() returns the value instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def iter_ndjson(columns, rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def streaming_export(queryset, columns, lookups, export_format, filename_prefix):
+    """
+    Stream `queryset` as CSV or NDJSON.
+
+    `lookups` are passed to `values_list()`; `columns` are the header /
+    key names written for each lookup.
+    """
+    chunk_size = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+    rows = queryset.order_by('pk').values_list(*lookups).iterator(chunk_size=chunk_size)
+    stamp = timezone.localtime().strftime('%Y%m%d-%H%M')
+
+    if export_format == NDJSONRenderer.format:
+        content = iter_ndjson(columns, rows)
+        content_type = NDJSONRenderer.media_type
+        extension = 'ndjson'
+    else:
+        content = iter_csv(columns, rows)
+        content_type = f'{CSVRenderer.media_type}; charset=utf-8'
+        extension = 'csv'
+
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename_prefix}-{stamp}.{extension}"'
+    response['Cache-Control'] = 'no-store'
+    return response
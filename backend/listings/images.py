@@ -0,0 +1,199 @@
+"""
+Image Derivatives for BYN-K Platform.
+
+Organization and partner logos are often multi-megabyte phone photos.
+After upload, a Celery task renders fixed-size WebP (and AVIF, when the
+Pillow build supports it) thumbnails next to the original. File names
+carry a content hash, so URLs are immutable and safe to cache forever.
+
+The generated names are stored on the model in a `<field>_variants`
+JSON column shaped like:
+    {"source": "logos/2026/03/rck.png",
+     "webp": {"64": "logos/2026/03/rck.1a2b3c4d5e6f.64w.webp", ...},
+     "avif": {...}}
+"""
+
+import hashlib
+import logging
+import posixpath
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+try:
+    # Optional plugin that adds AVIF encoding to older Pillow builds.
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DERIVATIVE_SIZES = (64, 128, 256)
+DEFAULT_DERIVATIVE_FORMATS = ('webp', 'avif')
+FORMAT_SAVE_OPTIONS = {
+    'webp': {'quality': 80, 'method': 4},
+    'avif': {'quality': 60},
+}
+HASH_LENGTH = 12
+
+
+def derivative_sizes():
+    return tuple(getattr(settings, 'IMAGE_DERIVATIVE_SIZES', DEFAULT_DERIVATIVE_SIZES))
+
+
+def derivative_formats():
+    """Configured formats that this Pillow build can actually encode."""
+    Image.init()
+    return [
+        image_format
+        for image_format in getattr(settings, 'IMAGE_DERIVATIVE_FORMATS', DEFAULT_DERIVATIVE_FORMATS)
+        if image_format.upper() in Image.SAVE
+    ]
+
+
+def variants_field_name(field_name):
+    return f"{field_name}_variants"
+
+
+def variants_are_stale(instance, field_name):
+    """True when the stored variants do not belong to the current upload."""
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, variants_field_name(field_name)) or {}
+    return variants.get('source') != (field_file.name or None)
+
+
+def _encode(image, image_format, size):
+    derivative = image.copy()
+    derivative.thumbnail((size, size), Image.LANCZOS)
+    buffer = BytesIO()
+    derivative.save(buffer, format=image_format.upper(), **FORMAT_SAVE_OPTIONS.get(image_format, {}))
+    return buffer.getvalue()
+
+
+def render_derivatives(field_file):
+    """
+    Render every configured size/format for an uploaded image.
+
+    Returns the variants mapping (see module docstring); files already
+    present under the same content-hashed name are reused, not rewritten.
+    """
+    storage = field_file.storage
+    directory, filename = posixpath.split(field_file.name)
+    stem = posixpath.splitext(filename)[0]
+
+    field_file.open('rb')
+    try:
+        with Image.open(field_file) as original:
+            image = ImageOps.exif_transpose(original)
+            image.load()
+    finally:
+        field_file.close()
+
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = image.mode in ('LA', 'PA', 'P') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    variants = {'source': field_file.name}
+    for image_format in derivative_formats():
+        variants[image_format] = {}
+        for size in derivative_sizes():
+            payload = _encode(image, image_format, size)
+            digest = hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+            name = posixpath.join(directory, f"{stem}.{digest}.{size}w.{image_format}")
+            if not storage.exists(name):
+                name = storage.save(name, ContentFile(payload))
+            variants[image_format][str(size)] = name
+    return variants
+
+
+def generate_derivatives(model_label, pk, field_name):
+    """
+    Build and store derivatives for `<model_label>.<field_name>` of one row.
+
+    Writes only the variants column with `update()` so saving the result
+    does not re-trigger generation. Returns the variants mapping or None.
+    """
+    model_class = apps.get_model(model_label)
+    variants_field = variants_field_name(field_name)
+    instance = model_class._default_manager.filter(pk=pk).only('pk', field_name, variants_field).first()
+    if instance is None:
+        return None
+
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        variants = {}
+    else:
+        try:
+            variants = render_derivatives(field_file)
+        except (FileNotFoundError, UnidentifiedImageError, OSError):
+            logger.exception(
+                "Could not render image derivatives.",
+                extra={"model": model_label, "pk": pk, "field": field_name},
+            )
+            return None
+
+    # Skip the write if another upload replaced the image in the meantime.
+    model_class._default_manager.filter(pk=pk, **{field_name: field_file.name or ''}).update(
+        **{variants_field: variants}
+    )
+    return variants
+
+
+def schedule_derivatives(instance, field_name):
+    """
+    Generate derivatives for a freshly uploaded image once the row is committed.
+
+    With IMAGE_DERIVATIVES_ASYNC the work is queued on Celery; if the broker
+    is unavailable (or async is off) it runs in-process instead.
+    """
+    from .tasks import generate_image_derivatives
+
+    model_label = instance._meta.label
+    pk = instance.pk
+
+    def dispatch():
+        if not getattr(settings, 'IMAGE_DERIVATIVES_ASYNC', False):
+            generate_derivatives(model_label, pk, field_name)
+            return
+        try:
+            generate_image_derivatives.delay(model_label, pk, field_name)
+        except Exception:
+            logger.exception(
+                "Failed to dispatch image derivatives asynchronously. Falling back to sync render.",
+                extra={"model": model_label, "pk": pk, "field": field_name},
+            )
+            generate_derivatives(model_label, pk, field_name)
+
+    transaction.on_commit(dispatch)
+
+
+def build_srcset(variants, storage, request=None):
+    """
+    Return {"webp": "<url> 64w, <url> 128w", ...} ready for `<source srcset>`.
+    """
+    srcset = {}
+    for image_format in derivative_formats():
+        sizes = (variants or {}).get(image_format) or {}
+        entries = []
+        for size in sorted(sizes, key=int):
+            url = storage.url(sizes[size])
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            entries.append(f"{url} {size}w")
+        if entries:
+            srcset[image_format] = ", ".join(entries)
+    return srcset
+
+
+def smallest_variant_url(variants, storage, min_size=0):
+    """URL of the smallest derivative at least `min_size` wide, or None."""
+    for image_format in derivative_formats():
+        sizes = (variants or {}).get(image_format) or {}
+        candidates = sorted((int(size) for size in sizes if int(size) >= min_size))
+        if candidates:
+            return storage.url(sizes[str(candidates[0])])
+    return None
@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from listings.models import Job
+from listings.raw_data import autofill_job, save_autofilled
+
+
+class Command(BaseCommand):
+    help = (
+        "Back-process existing opportunities: parse the pasted WhatsApp raw_data "
+        "and fill in blank Job fields in bulk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--overwrite",
+            action="store_true",
+            help="Replace existing field values with parsed ones instead of only filling blanks.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows read, and saved in one transaction, per batch.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Preview how many opportunities would be updated.",
+        )
+
+    def handle(self, *args, **options):
+        overwrite = options["overwrite"]
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        queryset = Job.objects.exclude(raw_data="").order_by("pk")
+        scanned = 0
+        updated = 0
+        batch = []
+
+        for job in queryset.iterator(chunk_size=batch_size):
+            scanned += 1
+            changed = autofill_job(job, overwrite=overwrite)
+            if not changed:
+                continue
+
+            updated += 1
+            batch.append((job, changed))
+            if len(batch) >= batch_size:
+                self._flush(batch, dry_run)
+                batch = []
+
+        if batch:
+            self._flush(batch, dry_run)
+
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Dry run: {updated} of {scanned} opportunities with raw data would be updated."
+                )
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Auto-filled {updated} of {scanned} opportunities with raw data."
+            )
+        )
+
+    def _flush(self, batch, dry_run):
+        if dry_run:
+            return
+        # Save through Job.save so slugs, duplicate buckets and similar
+        # lists follow the filled fields; bulk_update would bypass them.
+        with transaction.atomic():
+            for job, changed in batch:
+                save_autofilled(job, changed)
@@ -0,0 +1,242 @@
+import json
+import random
+import statistics
+import subprocess
+import time
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+from django.test import Client
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from config.query_budget import QueryRecorder
+from listings import tasks
+from listings.models import Job, Subscription
+from listings.synthetic import seed_catalog
+
+# (name, query string) pairs for /api/opportunities/.
+FILTER_SCENARIOS = [
+    ("list", ""),
+    ("filter:category", "category=scholarship"),
+    ("filter:categories+work_modes", "categories=job,internship&work_modes=remote,hybrid"),
+    ("filter:location+paid+stipend", "location=kenya&is_paid=true&stipend_min=1000"),
+    ("filter:docs", "docs=alien_card"),
+    ("filter:closing_soon", "closing_soon=true"),
+    ("filter:eligibility", "target_group=refugees&education_level=undergraduate"),
+    ("filter:verified+funding", "is_verified=true&funding_type=fully"),
+    ("search:single-term", "search=officer"),
+    ("search:no-match", "search=zzzznotfound"),
+]
+PAGE_DEPTHS = [1, 10, 100, 1000]
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _summary(latencies, query_counts):
+    return {
+        "runs": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p90_ms": round(_percentile(latencies, 0.90) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+        "queries": max(query_counts),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic catalog into a throwaway test database and report latency "
+        "percentiles and query counts for the public API and notification tasks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=10000, help="Synthetic jobs to seed.")
+        parser.add_argument("--partners", type=int, default=200, help="Synthetic partners to seed.")
+        parser.add_argument("--events", type=int, default=500, help="Synthetic events to seed.")
+        parser.add_argument(
+            "--subscribers",
+            type=int,
+            default=200,
+            help="Synthetic subscriptions for the notification task benchmarks.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the catalog.")
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=20,
+            help="Timed requests per endpoint scenario (after one warm-up request).",
+        )
+        parser.add_argument(
+            "--task-runs",
+            type=int,
+            default=3,
+            help="Timed runs per notification task.",
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            default=[],
+            help="Only run scenarios whose name starts with this prefix (repeatable).",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the benchmark database between runs instead of re-seeding it.",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            help="Also write the JSON results to this file.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Emit results as JSON for diffing between commits.",
+        )
+
+    def handle(self, *args, **options):
+        for option in ("jobs", "runs", "task_runs"):
+            if options[option] < 1:
+                raise CommandError(f"--{option.replace('_', '-')} must be a positive integer.")
+
+        # Same isolation as `manage.py test`: a separate database, the
+        # locmem email backend and "testserver" in ALLOWED_HOSTS.
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options["keepdb"], aliases={"default"})
+        try:
+            started = time.perf_counter()
+            if Job.objects.exists():
+                seeded = None
+            else:
+                seeded = seed_catalog(
+                    options["jobs"],
+                    partners=options["partners"],
+                    events=options["events"],
+                    subscriptions=options["subscribers"],
+                    seed=options["seed"],
+                )
+            seed_seconds = time.perf_counter() - started
+            results = self._run_scenarios(options)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        report = {
+            "commit": _git_commit(),
+            "database": connection.vendor,
+            "seed": options["seed"],
+            "catalog": seeded,
+            "seed_seconds": round(seed_seconds, 2),
+            "scenarios": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        if seeded:
+            self.stdout.write(f"Seeded {seeded} in {report['seed_seconds']}s.")
+        for name, summary in results.items():
+            self.stdout.write(
+                f"{name:<34} p50 {summary['p50_ms']:>8} ms  p95 {summary['p95_ms']:>8} ms  "
+                f"p99 {summary['p99_ms']:>8} ms  queries {summary['queries']:>4}"
+            )
+
+    def _scenarios(self, seed):
+        """Yield (name, callable) pairs; HTTP scenarios go through the full middleware stack."""
+        client = Client()
+
+        def get(path):
+            return lambda: client.get(path)
+
+        for name, query in FILTER_SCENARIOS:
+            yield name, get(f"/api/opportunities/?{query}")
+
+        total = Job.objects.filter(is_active=True).count()
+        for depth in PAGE_DEPTHS:
+            if (depth - 1) * 20 < total:
+                yield f"page:{depth}", get(f"/api/opportunities/?page={depth}")
+
+        # A fixed sample of detail pages, so every run requests the same rows.
+        bounds = Job.objects.aggregate(low=Min("pk"), high=Max("pk"))
+        candidates = random.Random(seed).sample(range(bounds["low"], bounds["high"] + 1), min(200, total or 1))
+        slugs = list(Job.objects.filter(pk__in=candidates, is_active=True).values_list("slug", flat=True)[:50])
+        if slugs:
+            cycle = iter(slugs * (1 + 1000 // len(slugs)))
+            yield "detail-by-slug", lambda: client.get(f"/api/opportunities/by-slug/{next(cycle)}/")
+
+        yield "category-counts", get("/api/category-counts/")
+        yield "partners", get("/api/partners/")
+        yield "events", get("/api/events/")
+
+    def _task_scenarios(self):
+        """Yield (name, task, reset) triples; `reset` restores state the task changes."""
+        job_id = Job.objects.filter(is_active=True).order_by("-created_at").values_list("pk", flat=True).first()
+        notified = dict(Subscription.objects.values_list("pk", "last_notified_at"))
+
+        def reset_digest():
+            for pk, last_notified_at in notified.items():
+                Subscription.objects.filter(pk=pk).update(last_notified_at=last_notified_at)
+
+        yield "task:new-opportunity-digest", tasks.send_new_opportunity_notifications, reset_digest
+        if job_id:
+            yield (
+                "task:immediate-notification",
+                lambda: tasks.send_immediate_opportunity_notification(job_id),
+                None,
+            )
+
+    def _selected(self, name, prefixes):
+        return not prefixes or any(name.startswith(prefix) for prefix in prefixes)
+
+    def _measure(self, action, runs, warm_up=True, reset=None):
+        if warm_up:
+            action()
+        latencies, query_counts = [], []
+        for _ in range(runs):
+            if reset:
+                reset()
+            mail.outbox = []
+            recorder = QueryRecorder()
+            started = time.perf_counter()
+            with recorder.capture():
+                response = action()
+            latencies.append(time.perf_counter() - started)
+            query_counts.append(recorder.count)
+            status = getattr(response, "status_code", 200)
+            if status >= 400:
+                raise CommandError(f"Benchmark request failed with HTTP {status}.")
+        return latencies, query_counts
+
+    def _run_scenarios(self, options):
+        results = {}
+        prefixes = options["only"]
+        for name, action in self._scenarios(options["seed"]):
+            if self._selected(name, prefixes):
+                cache.clear()
+                results[name] = _summary(*self._measure(action, options["runs"]))
+        for name, action, reset in self._task_scenarios():
+            if self._selected(name, prefixes):
+                summary = _summary(*self._measure(action, options["task_runs"], warm_up=False, reset=reset))
+                summary["emails"] = len(mail.outbox)
+                results[name] = summary
+        return results
@@ -0,0 +1,113 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from listings.raw_data import parse_raw_data
+
+
+# Representative WhatsApp pastes (anonymized) covering each extractor.
+SAMPLE_MESSAGES = [
+    (
+        "*VACANCY ALERT* 📢\n"
+        "Refugee Consortium of Kenya is hiring a Office Manager based in Nairobi.\n"
+        "Requirements: Alien Card or CTD, KCSE certificate.\n"
+        "Salary: KES 45,000 - 60,000 per month.\n"
+        "Deadline: 15th March 2026.\n"
+        "Apply here: https://forms.office.com/r/abc123XYZ"
+    ),
+    (
+        "🎓 FULLY FUNDED SCHOLARSHIP 🎓\n"
+        "Mastercard Foundation Scholars Program for refugee youth in Uganda and Rwanda.\n"
+        "Documents: Refugee ID, birth certificate, transcripts.\n"
+        "Applications close on March 30, 2026.\n"
+        "More info www.mastercardfdn.org/scholars."
+    ),
+    (
+        "Internship opportunity at UNHCR Kakuma sub-office.\n"
+        "Interns receive a monthly stipend of Ksh 20k.\n"
+        "Send CV and cover letter to recruitment.kakuma@example.org\n"
+        "Closing date 28/02/2026"
+    ),
+    (
+        "Digital skills training (remote bootcamp) for young women.\n"
+        "Any valid ID accepted. Rolling admissions - apply anytime!\n"
+        "Register: https://bit.ly/skills-bootcamp"
+    ),
+    (
+        "Fellowship: Youth Policy Fellowship 2026 — Dar es Salaam, Tanzania.\n"
+        "Open to holders of a passport or convention travel document.\n"
+        "Stipend USD 800 to USD 1,200. Apply by 2026-04-10 via "
+        "https://example.org/fellowship/apply?ref=whatsapp."
+    ),
+    "Good morning family 🙏 please share widely with those who may be interested.",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the WhatsApp raw_data parser over a corpus of sample messages "
+        "and report throughput and per-message latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=2000,
+            help="Number of passes over the sample corpus.",
+        )
+        parser.add_argument(
+            "--corpus",
+            type=str,
+            help="Optional text file with one message per block, separated by blank lines.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Emit results as JSON for diffing between commits.",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        if iterations < 1:
+            raise CommandError("--iterations must be a positive integer.")
+
+        messages = SAMPLE_MESSAGES
+        if options.get("corpus"):
+            with open(options["corpus"], encoding="utf-8") as corpus_file:
+                messages = [block.strip() for block in corpus_file.read().split("\n\n") if block.strip()]
+            if not messages:
+                raise CommandError("Corpus file does not contain any messages.")
+
+        # Warm up once so import-time costs are not measured.
+        for message in messages:
+            parse_raw_data(message)
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for message in messages:
+                parse_raw_data(message)
+        elapsed = time.perf_counter() - started
+
+        parsed_count = iterations * len(messages)
+        results = {
+            "messages": len(messages),
+            "iterations": iterations,
+            "parsed": parsed_count,
+            "elapsed_seconds": round(elapsed, 4),
+            "messages_per_second": round(parsed_count / elapsed, 1) if elapsed else None,
+            "microseconds_per_message": round(elapsed / parsed_count * 1_000_000, 2),
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Parsed {parsed_count} messages in {results['elapsed_seconds']}s "
+                f"({results['messages_per_second']} msg/s, "
+                f"{results['microseconds_per_message']} µs/msg)."
+            )
+        )
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from listings import async_views
+from listings.models import Job
+from listings.views import CategoryCountsView, JobDetailBySlugView, JobListView, PartnerListView
+
+ENDPOINTS = {
+    "list": (JobListView, async_views.job_list, "/api/opportunities/"),
+    "detail": (JobDetailBySlugView, async_views.job_detail_by_slug, "/api/opportunities/by-slug/{slug}/"),
+    "category-counts": (CategoryCountsView, async_views.category_counts, "/api/category-counts/"),
+    "partners": (PartnerListView, async_views.partner_list, "/api/partners/"),
+}
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _summary(latencies, elapsed):
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the DRF (sync) and async read paths of the public listing endpoints "
+        "in-process at several concurrency levels and report throughput and latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Requests per endpoint, path and concurrency level.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=str,
+            default="1,8,32",
+            help="Comma-separated concurrency levels.",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            choices=sorted(ENDPOINTS),
+            help="Endpoint to benchmark (repeatable; default: all).",
+        )
+        parser.add_argument(
+            "--with-cache",
+            action="store_true",
+            help="Keep the async path's response cache on (off by default for a like-for-like comparison).",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Emit results as JSON for diffing between commits.",
+        )
+
+    def handle(self, *args, **options):
+        total = options["requests"]
+        if total < 1:
+            raise CommandError("--requests must be a positive integer.")
+        try:
+            levels = [int(level) for level in options["concurrency"].split(",") if level.strip()]
+        except ValueError:
+            raise CommandError("--concurrency must be a comma-separated list of integers.")
+        if not levels or min(levels) < 1:
+            raise CommandError("--concurrency levels must be positive integers.")
+
+        slug = Job.objects.filter(is_active=True).exclude(slug="").values_list("slug", flat=True).first()
+        names = options["endpoint"] or sorted(ENDPOINTS)
+        if "detail" in names and not slug:
+            raise CommandError("The detail benchmark needs at least one active job with a slug.")
+
+        # The request factories use the "testserver" host.
+        overrides = {"ALLOWED_HOSTS": [*settings.ALLOWED_HOSTS, "testserver"]}
+        if not options["with_cache"]:
+            overrides["PUBLIC_READ_CACHE_SECONDS"] = 0
+        results = []
+        with override_settings(**overrides):
+            for name in names:
+                view_class, async_view, path = ENDPOINTS[name]
+                path = path.format(slug=slug)
+                kwargs = {"slug": slug} if name == "detail" else {}
+                for level in levels:
+                    results.append({
+                        "endpoint": name,
+                        "concurrency": level,
+                        "sync": self._run_sync(view_class.as_view(), path, kwargs, total, level),
+                        "async": asyncio.run(self._run_async(async_view, path, kwargs, total, level)),
+                    })
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for row in results:
+            sync, async_ = row["sync"], row["async"]
+            self.stdout.write(
+                f"{row['endpoint']:<16} c={row['concurrency']:<3} "
+                f"sync {sync['requests_per_second']:>8} req/s p50 {sync['p50_ms']:>7} ms p95 {sync['p95_ms']:>7} ms | "
+                f"async {async_['requests_per_second']:>8} req/s p50 {async_['p50_ms']:>7} ms p95 {async_['p95_ms']:>7} ms"
+            )
+
+    def _run_sync(self, view, path, kwargs, total, concurrency):
+        factory = RequestFactory()
+
+        def one(_):
+            started = time.perf_counter()
+            response = view(factory.get(path), **kwargs)
+            response.render()
+            return time.perf_counter() - started
+
+        def close_connections():
+            connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(one, range(total)))
+            # Each worker thread opened its own connections.
+            for _ in range(concurrency):
+                executor.submit(close_connections)
+        return _summary(latencies, time.perf_counter() - started)
+
+    async def _run_async(self, view, path, kwargs, total, concurrency):
+        factory = AsyncRequestFactory()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                # ASGIHandler gives every request its own thread-sensitive
+                # context; without it all ORM calls would share one thread.
+                async with ThreadSensitiveContext():
+                    await view(factory.get(path), **kwargs)
+                return time.perf_counter() - started
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(one() for _ in range(total)))
+        return _summary(latencies, time.perf_counter() - started)
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from listings.models import Job
+from listings.similarity import rebuild_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored similar-opportunity lists of every active opportunity "
+        "from TF-IDF vectors of their text and choice fields."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = rebuild_all()
+        active = Job.objects.filter(is_active=True).count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {active} active opportunities and updated {written} similar lists "
+                f"in {time.perf_counter() - started:.2f}s."
+            )
+        )
@@ -62,7 +62,7 @@ class Command(BaseCommand):
         if username:
             user = User.objects.filter(username=username).first()
         if not user and email:
-            user = User.objects.filter(email__iexact=email).first()
+            user = User.objects.with_email(email).first()
 
         if dry_run:
             if not user and not create_if_missing:
@@ -0,0 +1,166 @@
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from listings.images import variants_field_name
+from listings.models import Job, Partner
+from listings.storage import ContentAddressedStorage, content_addressed_name, file_digest
+
+# (model, image field) pairs stored in the content-addressed logo storage.
+LOGO_FIELDS = [
+    (Job, "org_logo"),
+    (Partner, "logo"),
+]
+# Legacy upload directories (the fields' `upload_to` roots).
+LEGACY_DIRECTORIES = ["logos", "partners/logos"]
+
+
+def _remap_variants(variants, mapping):
+    """Return `variants` with every stored file name passed through `mapping`."""
+    remapped = {}
+    for key, value in (variants or {}).items():
+        if isinstance(value, dict):
+            remapped[key] = {size: mapping.get(name, name) for size, name in value.items()}
+        else:
+            remapped[key] = mapping.get(value, value)
+    return remapped
+
+
+def _variant_names(variants):
+    for key, value in (variants or {}).items():
+        if isinstance(value, dict):
+            yield from value.values()
+
+
+class Command(BaseCommand):
+    help = (
+        "Move logos uploaded under logos/%Y/%m/ into content-addressed storage, "
+        "keeping one blob per unique file, and rewrite Job.org_logo / "
+        "Partner.logo references in bulk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows per bulk_update batch.",
+        )
+        parser.add_argument(
+            "--keep-originals",
+            action="store_true",
+            help="Leave the legacy files on disk after references are rewritten.",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Also delete content-addressed blobs that no row references.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would change without touching files or rows.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        storage = Job._meta.get_field("org_logo").storage
+        if not isinstance(storage, ContentAddressedStorage):
+            raise CommandError("LOGO_STORAGE_BACKEND is not a ContentAddressedStorage; nothing to deduplicate.")
+
+        mapping, reclaimed = self._ingest(storage, dry_run)
+        unique = len(set(mapping.values()))
+        self.stdout.write(
+            f"{len(mapping)} legacy files map to {unique} unique blobs "
+            f"({reclaimed / 1024:.1f} KiB duplicated)."
+        )
+
+        rewritten = self._rewrite_references(mapping, batch_size, dry_run)
+        self.stdout.write(f"{rewritten} rows {'would be' if dry_run else 'were'} updated.")
+
+        if dry_run:
+            return
+
+        if not options["keep_originals"]:
+            for name in mapping:
+                storage.delete(name)
+            self.stdout.write(f"Removed {len(mapping)} legacy files.")
+
+        if options["prune"]:
+            pruned = self._prune(storage)
+            self.stdout.write(f"Pruned {pruned} unreferenced blobs.")
+
+        self.stdout.write(self.style.SUCCESS("Logo deduplication complete."))
+
+    def _legacy_names(self, storage):
+        for directory in LEGACY_DIRECTORIES:
+            root = storage.path(directory)
+            for current, dirnames, filenames in os.walk(root):
+                relative = os.path.relpath(current, storage.path("")).replace(os.sep, "/")
+                if relative == storage.prefix or relative.startswith(f"{storage.prefix}/"):
+                    dirnames[:] = []
+                    continue
+                for filename in filenames:
+                    yield f"{relative}/{filename}"
+
+    def _ingest(self, storage, dry_run):
+        """Copy each legacy file into its blob; return ({old: new}, duplicated bytes)."""
+        mapping = {}
+        seen = set()
+        duplicated = 0
+        for name in self._legacy_names(storage):
+            with storage.open(name, "rb") as handle:
+                if dry_run:
+                    key = content_addressed_name(file_digest(File(handle)), name, storage.prefix)
+                else:
+                    key = storage.save(name, File(handle))
+            if key in seen:
+                duplicated += storage.size(name)
+            seen.add(key)
+            mapping[name] = key
+        return mapping, duplicated
+
+    @transaction.atomic
+    def _rewrite_references(self, mapping, batch_size, dry_run):
+        total = 0
+        for model_class, field_name in LOGO_FIELDS:
+            variants_field = variants_field_name(field_name)
+            changed = []
+            queryset = model_class.objects.only("pk", field_name, variants_field).order_by("pk")
+            for instance in queryset.iterator(chunk_size=batch_size):
+                current = getattr(instance, field_name).name
+                variants = getattr(instance, variants_field)
+                if current not in mapping and not any(name in mapping for name in _variant_names(variants)):
+                    continue
+                setattr(instance, field_name, mapping.get(current, current))
+                setattr(instance, variants_field, _remap_variants(variants, mapping))
+                changed.append(instance)
+            if changed and not dry_run:
+                model_class.objects.bulk_update(changed, [field_name, variants_field], batch_size=batch_size)
+            total += len(changed)
+        return total
+
+    def _prune(self, storage):
+        referenced = set()
+        for model_class, field_name in LOGO_FIELDS:
+            rows = model_class.objects.values_list(field_name, variants_field_name(field_name))
+            for name, variants in rows.iterator():
+                referenced.add(name)
+                referenced.update(_variant_names(variants))
+
+        pruned = 0
+        for current, _dirnames, filenames in os.walk(storage.path(storage.prefix)):
+            relative = os.path.relpath(current, storage.path("")).replace(os.sep, "/")
+            for filename in filenames:
+                name = f"{relative}/{filename}"
+                # `.tmp` files belong to uploads still being written.
+                if name not in referenced and not filename.endswith(".tmp"):
+                    storage.purge(name)
+                    pruned += 1
+        return pruned
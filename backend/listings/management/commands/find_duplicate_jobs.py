@@ -0,0 +1,109 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from listings.duplicates import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    band_buckets,
+    compute_job_signature,
+    find_duplicate_clusters,
+)
+from listings.models import Job, JobSimilarityBucket
+
+
+class Command(BaseCommand):
+    help = (
+        "Find clusters of near-duplicate opportunities (the same post forwarded "
+        "from several WhatsApp groups) using MinHash signatures and LSH buckets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_SIMILARITY_THRESHOLD,
+            help="Minimum estimated similarity (0-1) for two listings to be grouped.",
+        )
+        parser.add_argument(
+            "--active-only",
+            action="store_true",
+            help="Only consider active opportunities.",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute every signature and the LSH bucket index before searching.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per batch when rebuilding signatures.",
+        )
+
+    def handle(self, *args, **options):
+        threshold = options["threshold"]
+        batch_size = options["batch_size"]
+
+        if not 0 < threshold <= 1:
+            raise CommandError("--threshold must be between 0 and 1.")
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        if options["rebuild"]:
+            rebuilt = self._rebuild(batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt signatures for {rebuilt} opportunities."))
+
+        queryset = Job.objects.exclude(minhash_signature__isnull=True)
+        if options["active_only"]:
+            queryset = queryset.filter(is_active=True)
+
+        signatures = queryset.values_list("id", "minhash_signature").iterator(chunk_size=batch_size)
+        clusters = find_duplicate_clusters(signatures, threshold=threshold)
+
+        if not clusters:
+            self.stdout.write(self.style.SUCCESS("No duplicate clusters found."))
+            return
+
+        titles = dict(
+            Job.objects.filter(pk__in=[job_id for cluster in clusters for job_id in cluster])
+            .values_list("id", "title")
+        )
+        for index, cluster in enumerate(clusters, start=1):
+            self.stdout.write(f"Cluster {index} ({len(cluster)} opportunities):")
+            for job_id in cluster:
+                self.stdout.write(f"  #{job_id} {titles.get(job_id, '')}")
+
+        self.stdout.write(
+            self.style.WARNING(
+                f"Found {len(clusters)} duplicate clusters covering "
+                f"{sum(len(cluster) for cluster in clusters)} opportunities."
+            )
+        )
+
+    @transaction.atomic
+    def _rebuild(self, batch_size):
+        """Recompute signatures in bulk and rewrite the bucket index."""
+        JobSimilarityBucket.objects.all().delete()
+        jobs = []
+        buckets = []
+        total = 0
+        queryset = Job.objects.only("id", "title", "organization_name", "description").order_by("pk")
+        for job in queryset.iterator(chunk_size=batch_size):
+            job.minhash_signature = compute_job_signature(job)
+            jobs.append(job)
+            buckets.extend(
+                JobSimilarityBucket(job_id=job.pk, bucket=bucket)
+                for bucket in band_buckets(job.minhash_signature)
+            )
+            if len(jobs) >= batch_size:
+                total += self._flush(jobs, buckets, batch_size)
+                jobs = []
+                buckets = []
+        if jobs:
+            total += self._flush(jobs, buckets, batch_size)
+        return total
+
+    def _flush(self, jobs, buckets, batch_size):
+        Job.objects.bulk_update(jobs, ["minhash_signature"], batch_size=batch_size)
+        JobSimilarityBucket.objects.bulk_create(buckets, batch_size=batch_size)
+        return len(jobs)
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from listings.images import generate_derivatives, variants_are_stale, variants_field_name
+from listings.models import Job, Partner
+
+# (model, image field) pairs that carry a `<field>_variants` column.
+IMAGE_FIELDS = [
+    (Job, "org_logo"),
+    (Partner, "logo"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Render WebP/AVIF logo derivatives for rows uploaded before the "
+        "derivative pipeline existed, or whose variants are out of date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows fetched per query while scanning.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate derivatives even when they look current.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many rows need derivatives without rendering them.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        for model_class, field_name in IMAGE_FIELDS:
+            queryset = (
+                model_class.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .only("pk", field_name, variants_field_name(field_name))
+                .order_by("pk")
+            )
+            pending = [
+                instance.pk
+                for instance in queryset.iterator(chunk_size=batch_size)
+                if options["force"] or variants_are_stale(instance, field_name)
+            ]
+            label = model_class._meta.verbose_name_plural
+
+            if options["dry_run"]:
+                self.stdout.write(f"{len(pending)} {label} need logo derivatives.")
+                continue
+
+            failed = 0
+            for pk in pending:
+                if generate_derivatives(model_class._meta.label, pk, field_name) is None:
+                    failed += 1
+            self.stdout.write(
+                self.style.SUCCESS(f"Generated logo derivatives for {len(pending) - failed} {label}.")
+            )
+            if failed:
+                self.stdout.write(self.style.WARNING(f"{failed} {label} could not be processed (see logs)."))
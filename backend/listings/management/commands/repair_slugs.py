@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from listings.models import Event, Job
+from listings.slugs import repair_slugs
+
+
+class Command(BaseCommand):
+    help = (
+        "Give every opportunity and event a unique, non-empty slug. "
+        "The oldest row keeps a contested slug; later duplicates get a numeric suffix."
+    )
+
+    MODELS = {
+        "job": Job,
+        "event": Event,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=["job", "event", "all"],
+            default="all",
+            help="Which model's slugs to repair.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows per bulk update.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Preview how many slugs would be reassigned.",
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        names = list(self.MODELS) if options["model"] == "all" else [options["model"]]
+        for name in names:
+            changed = repair_slugs(self.MODELS[name], batch_size=batch_size, dry_run=dry_run)
+            if dry_run:
+                self.stdout.write(
+                    self.style.WARNING(f"Dry run: {changed} {name} slugs would be reassigned.")
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Reassigned {changed} {name} slugs."))
@@ -0,0 +1,90 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from listings.models import Job
+from listings.synthetic import DEFAULT_BATCH_SIZE, SYNTHETIC_PASSWORD, seed_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill an empty database with a deterministic, production-shaped synthetic "
+        "catalog (jobs, partners, events, click analytics, subscriptions and users) "
+        "for scale testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=10000, help="Jobs to create (clicks follow jobs).")
+        parser.add_argument("--partners", type=int, default=200, help="Partners to create.")
+        parser.add_argument("--events", type=int, default=500, help="Events to create.")
+        parser.add_argument("--subscribers", type=int, default=1000, help="Email subscriptions to create.")
+        parser.add_argument("--users", type=int, default=1000, help="User accounts to create.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed produces the same rows.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Rows per bulk_create batch.",
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database alias to write to (e.g. a scratch database configured next to the default one).",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Emit the row counts and timing as JSON.",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if using not in settings.DATABASES:
+            raise CommandError(f"Unknown database alias '{using}'.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        for option in ("jobs", "partners", "events", "subscribers", "users"):
+            if options[option] < 0:
+                raise CommandError(f"--{option} cannot be negative.")
+        if Job.objects.using(using).exists():
+            raise CommandError(
+                f"Database '{using}' already has jobs. Synthetic rows use fixed names and slugs, "
+                f"so seed an empty database (e.g. run `manage.py flush --database {using}` first)."
+            )
+
+        started = time.perf_counter()
+        counts = seed_catalog(
+            options["jobs"],
+            partners=options["partners"],
+            events=options["events"],
+            subscriptions=options["subscribers"],
+            users=options["users"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            using=using,
+        )
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        results = {
+            "database": using,
+            "seed": options["seed"],
+            "rows": counts,
+            "total_rows": total,
+            "elapsed_seconds": round(elapsed, 2),
+            "rows_per_second": round(total / elapsed, 1) if elapsed else None,
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {summary} into '{using}' in {results['elapsed_seconds']}s "
+                f"({results['rows_per_second']} rows/s). "
+                f"Synthetic users log in with password '{SYNTHETIC_PASSWORD}'."
+            )
+        )
@@ -5,6 +5,7 @@ Phase 3: Security - Disclaimer Injection
 Ensures every API response includes the mandatory disclaimer.
 """
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 import json
 
@@ -17,12 +18,23 @@ class DisclaimerMiddleware:
     stating that we are not the hiring entity.
     """
     
+    async_capable = True
+    sync_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
     
     def __call__(self, request):
-        response = self.get_response(request)
-        
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.add_disclaimer(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_disclaimer(request, await self.get_response(request))
+
+    def add_disclaimer(self, request, response):
         # Only modify JSON API responses
         if (
             request.path.startswith('/api/') and 
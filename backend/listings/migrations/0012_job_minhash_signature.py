@@ -0,0 +1,32 @@
+# Generated by Django 5.2.10 on 2026-10-19 08:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0011_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='minhash_signature',
+            field=models.BinaryField(blank=True, help_text='MinHash signature used to flag re-posted duplicates', null=True),
+        ),
+        migrations.CreateModel(
+            name='JobSimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_buckets', to='listings.job')),
+            ],
+            options={
+                'verbose_name': 'Job Similarity Bucket',
+                'verbose_name_plural': 'Job Similarity Buckets',
+                'unique_together': {('job', 'bucket')},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+import uuid
+
+from django.db import migrations
+from django.utils.text import slugify
+
+# Frozen copy of listings.slugs at the time of this migration; migrations
+# must not follow later changes to application code.
+SUFFIX_RESERVE = 10
+
+
+def base_slug(value, max_length):
+    base = slugify(value or '')[:max_length - SUFFIX_RESERVE].strip('-')
+    return base or uuid.uuid4().hex[:12]
+
+
+def repair_job_slugs(apps, schema_editor):
+    # Existing duplicates and blanks must be resolved before the unique index is built.
+    Job = apps.get_model('listings', 'Job')
+    max_length = Job._meta.get_field('slug').max_length
+
+    taken = set()
+    pending = []
+    rows = Job.objects.order_by('pk').values_list('pk', 'slug', 'title')
+    for pk, slug, title in rows.iterator(chunk_size=500):
+        if slug and slug not in taken:
+            taken.add(slug)
+        else:
+            pending.append((pk, slug or title))
+
+    next_suffix = {}
+    updates = []
+    for pk, value in pending:
+        base = base_slug(value, max_length)
+        candidate = base
+        suffix = next_suffix.get(base, 0)
+        while candidate in taken:
+            suffix += 1
+            candidate = f"{base}-{suffix}"
+        next_suffix[base] = suffix
+        taken.add(candidate)
+        updates.append(Job(pk=pk, slug=candidate))
+
+    Job.objects.bulk_update(updates, ['slug'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0012_job_minhash_signature'),
+    ]
+
+    operations = [
+        migrations.RunPython(repair_job_slugs, migrations.RunPython.noop),
+    ]
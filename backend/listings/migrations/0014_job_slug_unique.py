@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 08:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0013_repair_job_slugs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='URL slug - generated from the title when left blank', max_length=250, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-19 08:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0014_job_slug_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='org_logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies of the logo (see listings.images)'),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='logo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies of the logo (see listings.images)'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.10 on 2026-10-19 08:36
+
+import listings.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0015_logo_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='org_logo',
+            field=models.ImageField(blank=True, help_text='Organization logo', null=True, storage=listings.storage.logo_storage, upload_to='logos/%Y/%m/'),
+        ),
+        migrations.AlterField(
+            model_name='partner',
+            name='logo',
+            field=models.ImageField(blank=True, help_text='Upload partner logo image from your computer', null=True, storage=listings.storage.logo_storage, upload_to='partners/logos/%Y/%m/'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:09
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def normalize_emails(apps, schema_editor):
+    Subscription = apps.get_model('listings', 'Subscription')
+    normalized = Lower(Trim('email'))
+    taken = set(Subscription.objects.filter(email=normalized).values_list('email', flat=True))
+    for pk, email in Subscription.objects.exclude(email=normalized).values_list('pk', 'email'):
+        # Case-variant duplicates are merged in 0022.
+        canonical = email.strip().lower()
+        if canonical not in taken:
+            Subscription.objects.filter(pk=pk).update(email=canonical)
+            taken.add(canonical)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0016_content_addressed_logos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='subscription_email_lower_idx'),
+        ),
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+    ]
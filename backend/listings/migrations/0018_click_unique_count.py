@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0017_email_lower_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clickanalytics',
+            name='unique_count',
+            field=models.PositiveIntegerField(default=0, help_text="Clicks that were the visitor's first of this type on the job that day"),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0018_click_unique_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='trending_clicks',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Total clicks already folded into trending_score'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='trending_score',
+            field=models.FloatField(default=0.0, editable=False, help_text='Exponentially decayed click count'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='trending_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True), ('trending_score__gt', 0)), fields=['-trending_score', '-id'], name='job_trending_idx'),
+        ),
+    ]
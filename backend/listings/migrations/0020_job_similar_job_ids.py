@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0019_job_trending_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='similar_job_ids',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='IDs of the most similar active opportunities, best first'),
+        ),
+    ]
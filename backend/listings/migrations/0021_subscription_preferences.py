@@ -0,0 +1,28 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0020_job_similar_job_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscription',
+            name='categories',
+            field=models.JSONField(blank=True, default=list, help_text='Opportunity categories to include in digests'),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='documents',
+            field=models.JSONField(blank=True, default=list, help_text='ID documents the subscriber holds; digests skip opportunities accepting none of them'),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='locations',
+            field=models.JSONField(blank=True, default=list, help_text='Opportunity locations to include in digests'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from collections import defaultdict
+
+from django.db import migrations
+
+
+def merge_case_variants(apps, schema_editor):
+    """
+    Collapse subscriptions whose emails differ only in case or whitespace
+    into one lowercased row, so saving (which normalizes the email) cannot
+    hit the unique constraint and with_email() finds a single row.
+
+    The oldest row is kept. It stays active only if a variant is active and
+    none was unsubscribed (confirmed, then deactivated).
+    """
+    Subscription = apps.get_model('listings', 'Subscription')
+    groups = defaultdict(list)
+    rows = Subscription.objects.order_by('pk').only(
+        'pk', 'email', 'is_active', 'confirmed_at', 'last_notified_at'
+    )
+    for subscription in rows.iterator(chunk_size=500):
+        groups[subscription.email.strip().lower()].append(subscription)
+
+    for email, variants in groups.items():
+        keeper = variants[0]
+        if len(variants) == 1 and keeper.email == email:
+            continue
+        confirmed = [row.confirmed_at for row in variants if row.confirmed_at]
+        notified = [row.last_notified_at for row in variants if row.last_notified_at]
+        unsubscribed = any(row.confirmed_at and not row.is_active for row in variants)
+        Subscription.objects.filter(pk__in=[row.pk for row in variants[1:]]).delete()
+        keeper.email = email
+        keeper.is_active = any(row.is_active for row in variants) and not unsubscribed
+        keeper.confirmed_at = min(confirmed) if confirmed else None
+        keeper.last_notified_at = max(notified) if notified else None
+        keeper.save(update_fields=['email', 'is_active', 'confirmed_at', 'last_notified_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0021_subscription_preferences'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_case_variants, migrations.RunPython.noop),
+    ]
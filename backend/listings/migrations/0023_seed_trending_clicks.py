@@ -0,0 +1,30 @@
+from django.db import migrations
+from django.db.models import Sum
+from django.utils import timezone
+
+
+def seed_trending_clicks(apps, schema_editor):
+    """
+    Start every job's trending window now. Clicks counted before trending
+    existed are marked as already folded in (with no score), so the first
+    recompute does not add lifetime totals and rebuild the all-time ranking.
+    """
+    Job = apps.get_model('listings', 'Job')
+    ClickAnalytics = apps.get_model('listings', 'ClickAnalytics')
+    now = timezone.now()
+    totals = ClickAnalytics.objects.values('job_id').annotate(total=Sum('click_count')).values_list('job_id', 'total')
+
+    Job.objects.update(trending_score=0.0, trending_clicks=0, trending_updated_at=None)
+    jobs = [Job(pk=job_id, trending_clicks=total, trending_updated_at=now) for job_id, total in totals]
+    Job.objects.bulk_update(jobs, ['trending_clicks', 'trending_updated_at'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0022_merge_case_variant_subscriptions'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_trending_clicks, migrations.RunPython.noop),
+    ]
@@ -7,18 +7,88 @@ and redirects users to external NGO portals.
 
 import uuid
 from django.db import models
+from django.db.models.functions import Lower
 from django.conf import settings
 from django.utils import timezone
-from django.utils.text import slugify
 
+from .duplicates import (
+    SIGNATURE_SOURCE_FIELDS,
+    band_buckets,
+    compute_job_signature,
+    find_duplicate_candidates,
+)
+from .storage import logo_storage
+from .images import variants_are_stale
+from .similarity import source_changed, source_snapshot
+from .slugs import unique_slug
 
-class Job(models.Model):
+
+# Columns maintained by background recomputes, never by Job.save().
+COMPUTED_FIELDS = frozenset({
+    'trending_score', 'trending_clicks', 'trending_updated_at', 'similar_job_ids', 'org_logo_variants',
+})
+
+
+def normalize_email(email):
+    """Canonical stored form of an email address: trimmed and lowercased."""
+    return (email or '').strip().lower()
+
+
+def normalize_preferences(values):
+    """Stored form of a preference list: sorted and de-duplicated, so equal preferences compare equal."""
+    return sorted({value for value in values or () if value})
+
+
+class ComputedFieldsMixin:
+    """
+    Model mixin keeping a full `save()` from overwriting `computed_fields`.
+
+    Those columns are maintained elsewhere (recomputes, refresh methods,
+    queryset updates), so an instance loaded before a recompute must not
+    write its stale values back. They are left out of the UPDATE a full
+    save of an existing row runs; everything else is plain Model.save():
+    explicit `update_fields` are honoured, inserts write every column, and
+    a row deleted in the meantime is re-inserted. `write_computed` names
+    computed fields this save should write after all.
+    """
+
+    computed_fields = frozenset()
+
+    def save(self, *args, write_computed=(), **kwargs):
+        self._write_computed = frozenset(write_computed)
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            del self._write_computed
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        if update_fields is None:
+            skipped = self.computed_fields - getattr(self, '_write_computed', frozenset())
+            values = [value for value in values if value[0].name not in skipped]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+
+class EmailQuerySet(models.QuerySet):
+    """Lookups for models with a `Lower('email')` index."""
+
+    def with_email(self, email):
+        """
+        Case-insensitive email match. `email__iexact` compiles to
+        UPPER(email) = UPPER(%s), which no index covers; this filters on
+        the indexed LOWER(email) expression instead.
+        """
+        return self.alias(email_lower=Lower('email')).filter(email_lower=normalize_email(email))
+
+
+class Job(ComputedFieldsMixin, models.Model):
     """
     Job model representing an opportunity listing.
     
     This is a Gateway Platform - we curate opportunities and redirect
     users to external portals (Forms, Emails, Websites).
     """
+
+    computed_fields = COMPUTED_FIELDS
     
     # Required Document Choices (for Advanced Filters)
     DOCUMENT_CHOICES = [
@@ -102,17 +172,30 @@ class Job(models.Model):
         max_length=255,
         help_text="The opportunity title - be clear and descriptive"
     )
-    slug = models.SlugField(max_length=250, null=True, blank=True)
+    slug = models.SlugField(
+        max_length=250,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="URL slug - generated from the title when left blank"
+    )
     organization_name = models.CharField(
         max_length=255,
         help_text="The organization offering this opportunity"
     )
     org_logo = models.ImageField(
         upload_to='logos/%Y/%m/',
+        storage=logo_storage,
         blank=True,
         null=True,
         help_text="Organization logo"
     )
+    org_logo_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of the logo (see listings.images)"
+    )
     location = models.CharField(
         max_length=50,
         choices=LOCATION_CHOICES,
@@ -266,6 +349,35 @@ class Job(models.Model):
         blank=True,
         help_text="Raw text pasted from WhatsApp (for admin convenience)"
     )
+
+    # Near-duplicate detection: packed MinHash of title/organization/description
+    minhash_signature = models.BinaryField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="MinHash signature used to flag re-posted duplicates"
+    )
+
+    # Trending ranking, recomputed by listings.trending (never by save())
+    trending_score = models.FloatField(
+        default=0.0,
+        editable=False,
+        help_text="Exponentially decayed click count"
+    )
+    trending_clicks = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Total clicks already folded into trending_score"
+    )
+    trending_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Nearest neighbours by text and choice fields (listings.similarity)
+    similar_job_ids = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="IDs of the most similar active opportunities, best first"
+    )
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
@@ -282,9 +394,84 @@ class Job(models.Model):
         verbose_name = 'Job Listing'
         verbose_name_plural = 'Job Listings'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-trending_score', '-id'],
+                condition=models.Q(is_active=True, trending_score__gt=0),
+                name='job_trending_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.organization_name}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Loaded values, so save() only refreshes similar lists on a real change.
+        instance._similarity_source = source_snapshot(instance)
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Allocate a unique slug when blank and keep the MinHash signature in
+        sync with the text fields. Full updates leave the computed columns
+        alone (see `ComputedFieldsMixin`).
+
+        What changed is recorded on the instance (`_signature_changed`,
+        `_logo_changed`, `_similarity_changed`) for the post_save receivers in
+        `listings.signals`, which refresh LSH buckets, logo derivatives and
+        similar-opportunity lists.
+        """
+        update_fields = kwargs.get('update_fields')
+        if not self.slug and (update_fields is None or 'slug' in update_fields):
+            self.slug = unique_slug(Job, self.title, instance=self)
+
+        refresh_signature = update_fields is None or bool(
+            SIGNATURE_SOURCE_FIELDS.intersection(update_fields)
+        )
+        signature_changed = False
+        if refresh_signature:
+            previous = self.minhash_signature
+            self.minhash_signature = compute_job_signature(self)
+            if previous is not None:
+                previous = bytes(previous)
+            signature_changed = previous != self.minhash_signature
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'minhash_signature'}
+
+        logo_changed = (
+            (update_fields is None or 'org_logo' in update_fields)
+            and variants_are_stale(self, 'org_logo')
+        )
+        written = set()
+        if logo_changed and not self.org_logo:
+            # Logo removed: drop stale derivatives right away.
+            self.org_logo_variants = {}
+            logo_changed = False
+            written.add('org_logo_variants')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | written
+
+        self._signature_changed = signature_changed
+        self._logo_changed = logo_changed
+        self._similarity_changed = source_changed(self, update_fields)
+
+        super().save(*args, write_computed=written, **kwargs)
+
+        self._similarity_source = source_snapshot(self)
+
+    def sync_similarity_buckets(self):
+        """Replace this job's LSH bucket rows with ones for its current signature."""
+        JobSimilarityBucket.objects.filter(job=self).delete()
+        JobSimilarityBucket.objects.bulk_create([
+            JobSimilarityBucket(job=self, bucket=bucket)
+            for bucket in band_buckets(self.minhash_signature)
+        ])
+
+    def find_duplicates(self, **kwargs):
+        """Return [(job, similarity)] for listings that look like re-posts of this one."""
+        return find_duplicate_candidates(self, **kwargs)
     
     @property
     def days_until_deadline(self):
@@ -351,15 +538,7 @@ class Event(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.title)[:240] or str(uuid.uuid4())
-            slug_candidate = base_slug
-            counter = 1
-
-            while self.__class__.objects.filter(slug=slug_candidate).exclude(pk=self.pk).exists():
-                slug_candidate = f"{base_slug}-{counter}"
-                counter += 1
-
-            self.slug = slug_candidate
+            self.slug = unique_slug(Event, self.title, instance=self)
 
         super().save(*args, **kwargs)
 
@@ -398,6 +577,10 @@ class ClickAnalytics(models.Model):
         default='apply'
     )
     click_count = models.PositiveIntegerField(default=0)
+    unique_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Clicks that were the visitor's first of this type on the job that day"
+    )
     last_clicked_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -409,18 +592,47 @@ class ClickAnalytics(models.Model):
         return f"{self.job.title} - {self.click_type}: {self.click_count}"
     
     @classmethod
-    def track_click(cls, job_id, click_type):
-        """Increment click counter for a job."""
+    def track_click(cls, job_id, click_type, unique=False):
+        """
+        Increment click counter for a job; `unique` also counts the click
+        as a distinct visitor (see listings.clicks).
+        """
         analytics, _ = cls.objects.get_or_create(
             job_id=job_id,
             click_type=click_type,
             defaults={'click_count': 0}
         )
         analytics.click_count += 1
+        if unique:
+            analytics.unique_count += 1
         analytics.save()
         return analytics
 
 
+class JobSimilarityBucket(models.Model):
+    """
+    LSH bucket index for near-duplicate detection.
+
+    One row per (job, band) of the job's MinHash signature. Jobs sharing a
+    bucket are duplicate candidates, found with a single indexed lookup.
+    """
+
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='similarity_buckets'
+    )
+    bucket = models.BigIntegerField(db_index=True)
+
+    class Meta:
+        verbose_name = 'Job Similarity Bucket'
+        verbose_name_plural = 'Job Similarity Buckets'
+        unique_together = ['job', 'bucket']
+
+    def __str__(self):
+        return f"{self.job_id}: {self.bucket}"
+
+
 class Subscription(models.Model):
     """
     Email subscription model for opportunity alerts.
@@ -455,15 +667,50 @@ class Subscription(models.Model):
         help_text="When the subscription was confirmed"
     )
     
+    # Digest preferences (empty = no preference; see listings.digests)
+    categories = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Opportunity categories to include in digests"
+    )
+    locations = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Opportunity locations to include in digests"
+    )
+    documents = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="ID documents the subscriber holds; digests skip opportunities accepting none of them"
+    )
+    
+    PREFERENCE_FIELDS = ('categories', 'locations', 'documents')
+    
+    objects = EmailQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Email Subscription'
         verbose_name_plural = 'Email Subscriptions'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(Lower('email'), name='subscription_email_lower_idx'),
+        ]
     
     def __str__(self):
         status = "Active" if self.is_active else "Pending"
         return f"{self.email} ({status})"
     
+    def save(self, *args, **kwargs):
+        self.email = normalize_email(self.email)
+        for field in self.PREFERENCE_FIELDS:
+            setattr(self, field, normalize_preferences(getattr(self, field)))
+        super().save(*args, **kwargs)
+    
+    @property
+    def preference_key(self):
+        """Hashable form of the digest preferences; equal keys receive the same jobs."""
+        return tuple(tuple(getattr(self, field)) for field in self.PREFERENCE_FIELDS)
+    
     def confirm(self):
         """Confirm the subscription."""
         self.is_active = True
@@ -493,10 +740,17 @@ class Partner(models.Model):
     )
     logo = models.ImageField(
         upload_to='partners/logos/%Y/%m/',
+        storage=logo_storage,
         blank=True,
         null=True,
         help_text="Upload partner logo image from your computer"
     )
+    logo_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/AVIF copies of the logo (see listings.images)"
+    )
     logo_url = models.URLField(
         blank=True,
         null=True,
@@ -520,3 +774,19 @@ class Partner(models.Model):
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        """Flag a new logo upload for `listings.signals` to render derivatives."""
+        update_fields = kwargs.get('update_fields')
+        logo_changed = (
+            (update_fields is None or 'logo' in update_fields)
+            and variants_are_stale(self, 'logo')
+        )
+        if logo_changed and not self.logo:
+            self.logo_variants = {}
+            logo_changed = False
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'logo_variants'}
+
+        self._logo_changed = logo_changed
+        super().save(*args, **kwargs)
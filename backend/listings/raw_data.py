@@ -0,0 +1,373 @@
+"""
+Raw Data Parser for BYN-K Platform.
+
+Phase 4: Admin "WhatsApp-to-Web" Efficiency
+Extracts structured Job fields (deadline, email, URLs, category, location,
+required documents, stipend) from the WhatsApp message pasted into
+`Job.raw_data`, so admins only need to review the result.
+
+All patterns are compiled once at import time and keyword lookups run
+through a token trie, so a message is parsed in a single pass per field.
+"""
+
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercase word tokens used by the keyword tries."""
+    return TOKEN_RE.findall(text.lower())
+
+
+class KeywordTrie:
+    """
+    Token-level trie mapping (multi-word) keyword phrases to values.
+
+    Phrases are matched on lowercase word tokens, so "dar es salaam" or
+    "convention travel document" are found without compiling a regex
+    alternation per keyword.
+    """
+
+    def __init__(self, phrases=None):
+        self._root = {}
+        for phrase, value in (phrases or {}).items():
+            self.add(phrase, value)
+
+    def add(self, phrase, value):
+        node = self._root
+        for token in tokenize(phrase):
+            node = node.setdefault(token, {})
+        node[None] = value
+
+    def find_all(self, tokens):
+        """Yield values for every longest phrase match, left to right."""
+        index = 0
+        total = len(tokens)
+        while index < total:
+            node = self._root
+            match_value = None
+            match_end = index
+            cursor = index
+            while cursor < total and tokens[cursor] in node:
+                node = node[tokens[cursor]]
+                cursor += 1
+                if None in node:
+                    match_value = node[None]
+                    match_end = cursor
+            if match_end > index:
+                yield match_value
+                index = match_end
+            else:
+                index += 1
+
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}", re.IGNORECASE)
+URL_RE = re.compile(r"(?:https?://|www\.)[^\s<>\"']+", re.IGNORECASE)
+URL_TRAILING_PUNCTUATION = ".,;:!?)]}*_"
+ROLLING_RE = re.compile(r"\brolling\b|\bno deadline\b|\buntil filled\b", re.IGNORECASE)
+DEADLINE_RE = re.compile(
+    r"(?:deadline|closing date|closes on|apply by|apply before|due date|"
+    r"applications? close[sd]?(?: on)?|submit by|last date)[^\n]{0,80}",
+    re.IGNORECASE,
+)
+
+MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8, 'sep': 9, 'sept': 9, 'september': 9, 'oct': 10,
+    'october': 10, 'nov': 11, 'november': 11, 'dec': 12, 'december': 12,
+}
+_MONTH_PATTERN = "|".join(sorted(MONTHS, key=len, reverse=True))
+ISO_DATE_RE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+NUMERIC_DATE_RE = re.compile(r"\b(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})\b")
+DAY_MONTH_DATE_RE = re.compile(
+    rf"\b(\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?({_MONTH_PATTERN})\.?,?\s+(\d{{4}})\b",
+    re.IGNORECASE,
+)
+MONTH_DAY_DATE_RE = re.compile(
+    rf"\b({_MONTH_PATTERN})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b",
+    re.IGNORECASE,
+)
+
+_CURRENCY_PATTERN = r"(?:kshs?|kes|usd|us\$|\$|ugx|tzs|rwf)"
+_AMOUNT_PATTERN = r"(\d[\d,]*(?:\.\d+)?)\s*(k\b)?"
+STIPEND_RE = re.compile(
+    rf"(?<![a-z]){_CURRENCY_PATTERN}\.?\s*{_AMOUNT_PATTERN}"
+    rf"(?:\s*(?:-|–|to)\s*{_CURRENCY_PATTERN}?\.?\s*{_AMOUNT_PATTERN})?",
+    re.IGNORECASE,
+)
+# Job.stipend_* allow 10 digits with 2 decimal places.
+MAX_STIPEND = Decimal('99999999.99')
+
+CATEGORY_TRIE = KeywordTrie({
+    'scholarship': 'scholarship',
+    'scholarships': 'scholarship',
+    'bursary': 'scholarship',
+    'internship': 'internship',
+    'internships': 'internship',
+    'intern': 'internship',
+    'interns': 'internship',
+    'fellowship': 'fellowship',
+    'fellowships': 'fellowship',
+    'training': 'training',
+    'bootcamp': 'training',
+    'workshop': 'training',
+    'vacancy': 'job',
+    'vacancies': 'job',
+    'hiring': 'job',
+    'job': 'job',
+    'jobs': 'job',
+    'position': 'job',
+    'recruitment': 'job',
+})
+# Used to break ties when several categories are mentioned equally often.
+CATEGORY_PRIORITY = ['scholarship', 'fellowship', 'internship', 'training', 'job']
+
+# Values are (location, city) pairs; cities imply their country.
+LOCATION_TRIE = KeywordTrie({
+    'kenya': ('kenya', ''),
+    'uganda': ('uganda', ''),
+    'tanzania': ('tanzania', ''),
+    'rwanda': ('rwanda', ''),
+    'remote': ('remote', ''),
+    'nairobi': ('kenya', 'Nairobi'),
+    'mombasa': ('kenya', 'Mombasa'),
+    'kisumu': ('kenya', 'Kisumu'),
+    'nakuru': ('kenya', 'Nakuru'),
+    'eldoret': ('kenya', 'Eldoret'),
+    'kakuma': ('kenya', 'Kakuma'),
+    'kalobeyei': ('kenya', 'Kalobeyei'),
+    'dadaab': ('kenya', 'Dadaab'),
+    'kampala': ('uganda', 'Kampala'),
+    'nakivale': ('uganda', 'Nakivale'),
+    'kyangwali': ('uganda', 'Kyangwali'),
+    'dar es salaam': ('tanzania', 'Dar es Salaam'),
+    'arusha': ('tanzania', 'Arusha'),
+    'kigali': ('rwanda', 'Kigali'),
+})
+
+DOCUMENT_TRIE = KeywordTrie({
+    'alien card': 'alien_card',
+    'alien id': 'alien_card',
+    'refugee id': 'alien_card',
+    'refugee card': 'alien_card',
+    'ctd': 'ctd',
+    'convention travel document': 'ctd',
+    'passport': 'passport',
+    'waiting slip': 'waiting_slip',
+    'national id': 'national_id',
+    'national identity card': 'national_id',
+    'work permit': 'work_permit',
+    'class m': 'work_permit',
+    'birth certificate': 'birth_certificate',
+    'any valid id': 'any_id',
+    'any id': 'any_id',
+    'any identification': 'any_id',
+})
+
+
+def _build_deadline(year, month, day):
+    if year < 100:
+        year += 2000
+    try:
+        naive = datetime(year, month, day, 23, 59)
+    except ValueError:
+        return None
+    return timezone.make_aware(naive, timezone.get_current_timezone())
+
+
+def parse_deadline(text):
+    """
+    Return an aware datetime (end of day) for the first date that follows
+    a deadline keyword, or None. Numeric dates are read day-first.
+    """
+    for match in DEADLINE_RE.finditer(text):
+        segment = match.group(0)
+
+        iso = ISO_DATE_RE.search(segment)
+        if iso:
+            deadline = _build_deadline(int(iso.group(1)), int(iso.group(2)), int(iso.group(3)))
+            if deadline:
+                return deadline
+
+        named = DAY_MONTH_DATE_RE.search(segment)
+        if named:
+            deadline = _build_deadline(
+                int(named.group(3)), MONTHS[named.group(2).lower()], int(named.group(1))
+            )
+            if deadline:
+                return deadline
+
+        named = MONTH_DAY_DATE_RE.search(segment)
+        if named:
+            deadline = _build_deadline(
+                int(named.group(3)), MONTHS[named.group(1).lower()], int(named.group(2))
+            )
+            if deadline:
+                return deadline
+
+        numeric = NUMERIC_DATE_RE.search(segment)
+        if numeric:
+            deadline = _build_deadline(
+                int(numeric.group(3)), int(numeric.group(2)), int(numeric.group(1))
+            )
+            if deadline:
+                return deadline
+    return None
+
+
+def _to_amount(number, thousands_suffix):
+    try:
+        amount = Decimal(number.replace(',', ''))
+    except InvalidOperation:
+        return None
+    if thousands_suffix:
+        amount *= 1000
+    if amount <= 0 or amount > MAX_STIPEND:
+        return None
+    return amount
+
+
+def parse_stipend(text):
+    """Return (min, max) Decimal amounts found next to a currency marker."""
+    amounts = []
+    for match in STIPEND_RE.finditer(text):
+        low = _to_amount(match.group(1), match.group(2))
+        if low is not None:
+            amounts.append(low)
+        if match.group(3):
+            high = _to_amount(match.group(3), match.group(4))
+            if high is not None:
+                amounts.append(high)
+    if not amounts:
+        return None, None
+    return min(amounts), max(amounts)
+
+
+def parse_urls(text):
+    urls = []
+    for match in URL_RE.finditer(text):
+        url = match.group(0).rstrip(URL_TRAILING_PUNCTUATION)
+        if url.lower().startswith('www.'):
+            url = f"https://{url}"
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+
+def parse_raw_data(text):
+    """
+    Extract Job field values from a pasted WhatsApp message.
+
+    Returns a dict keyed by Job field name containing only the fields
+    that could be detected; callers decide whether to overwrite.
+    """
+    if not text or not text.strip():
+        return {}
+
+    parsed = {}
+    tokens = tokenize(text)
+
+    deadline = parse_deadline(text)
+    if deadline:
+        parsed['deadline'] = deadline
+    elif ROLLING_RE.search(text):
+        parsed['is_rolling'] = True
+
+    urls = parse_urls(text)
+    # Emails inside URLs (e.g. mailto links) are still useful, so scan the full text.
+    emails = [email.rstrip('.') for email in EMAIL_RE.findall(text)]
+    if urls:
+        parsed['external_url'] = urls[0]
+    if emails:
+        parsed['application_email'] = emails[0].lower()
+    if urls:
+        parsed['application_type'] = 'link'
+    elif emails:
+        parsed['application_type'] = 'email'
+
+    category_hits = {}
+    for category in CATEGORY_TRIE.find_all(tokens):
+        category_hits[category] = category_hits.get(category, 0) + 1
+    if category_hits:
+        parsed['category'] = max(
+            category_hits,
+            key=lambda cat: (category_hits[cat], -CATEGORY_PRIORITY.index(cat)),
+        )
+
+    countries = []
+    city = ''
+    for country, found_city in LOCATION_TRIE.find_all(tokens):
+        if country not in countries:
+            countries.append(country)
+        if found_city and not city:
+            city = found_city
+    physical = [country for country in countries if country != 'remote']
+    if len(physical) > 1:
+        parsed['location'] = 'multiple'
+    elif physical:
+        parsed['location'] = physical[0]
+    elif countries:
+        parsed['location'] = 'remote'
+    if city:
+        parsed['city'] = city
+
+    documents = []
+    for document in DOCUMENT_TRIE.find_all(tokens):
+        if document not in documents:
+            documents.append(document)
+    if documents:
+        parsed['required_documents'] = documents
+
+    stipend_min, stipend_max = parse_stipend(text)
+    if stipend_min is not None:
+        parsed['stipend_min'] = stipend_min
+        parsed['stipend_max'] = stipend_max
+        parsed['is_paid'] = True
+
+    return parsed
+
+
+def _is_empty(job, field, value):
+    current = getattr(job, field)
+    if isinstance(value, bool):
+        # Boolean fields default to False, so only a False value counts as unset.
+        return current is False
+    # Fields with a non-blank default (category, application_type) always hold
+    # a value an admin may have chosen, so they are only replaced on overwrite.
+    return current in ('', None, [])
+
+
+def autofill_job(job, overwrite=False):
+    """
+    Apply parsed raw_data values to a Job instance without saving it.
+
+    Only blank fields are filled unless `overwrite` is True. Returns the
+    list of field names that were changed.
+    """
+    changed = []
+    for field, value in parse_raw_data(job.raw_data).items():
+        if not overwrite and not _is_empty(job, field, value):
+            continue
+        if getattr(job, field) == value:
+            continue
+        setattr(job, field, value)
+        changed.append(field)
+    return changed
+
+
+def save_autofilled(job, changed):
+    """
+    Save the fields `autofill_job` changed through `Job.save`, so the slug,
+    duplicate-detection buckets and similar lists follow the new values.
+    """
+    fields = set(changed) | {'updated_at'}
+    if not job.slug:
+        fields.add('slug')
+    job.save(update_fields=fields)
@@ -9,6 +9,7 @@ from rest_framework import serializers
 from django.conf import settings
 from django.utils import timezone
 from .models import Job, ClickAnalytics, Subscription, Partner, Event
+from .images import build_srcset
 
 
 class PrepChecklistItemSerializer(serializers.Serializer):
@@ -29,6 +30,7 @@ class JobSerializer(serializers.ModelSerializer):
     is_expired = serializers.BooleanField(read_only=True)
     brochure_url = serializers.SerializerMethodField()
     org_logo_url = serializers.SerializerMethodField()
+    org_logo_srcset = serializers.SerializerMethodField()
     disclaimer = serializers.SerializerMethodField()
     
     class Meta:
@@ -41,6 +43,7 @@ class JobSerializer(serializers.ModelSerializer):
             'organization_name',
             'org_logo',
             'org_logo_url',
+            'org_logo_srcset',
             'location',
             'city',
             'category',
@@ -89,6 +92,12 @@ class JobSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.org_logo.url)
             return obj.org_logo.url
         return None
+
+    def get_org_logo_srcset(self, obj):
+        """Return resized logo URLs per format, ready for `<source srcset>`."""
+        if not obj.org_logo:
+            return {}
+        return build_srcset(obj.org_logo_variants, obj.org_logo.storage, self.context.get('request'))
     
     def get_brochure_url(self, obj):
         """
@@ -112,6 +121,7 @@ class JobListSerializer(serializers.ModelSerializer):
     days_until_deadline = serializers.IntegerField(read_only=True)
     brochure_url = serializers.SerializerMethodField()
     org_logo_url = serializers.SerializerMethodField()
+    org_logo_srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = Job
@@ -122,6 +132,7 @@ class JobListSerializer(serializers.ModelSerializer):
             'organization',
             'org_logo',
             'org_logo_url',
+            'org_logo_srcset',
             'location',
             'city',
             'category',
@@ -162,6 +173,12 @@ class JobListSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.org_logo.url)
             return obj.org_logo.url
         return None
+
+    def get_org_logo_srcset(self, obj):
+        """Return resized logo URLs per format, ready for `<source srcset>`."""
+        if not obj.org_logo:
+            return {}
+        return build_srcset(obj.org_logo_variants, obj.org_logo.storage, self.context.get('request'))
     
     def get_brochure_url(self, obj):
         if obj.brochure_upload:
@@ -215,8 +232,8 @@ class ClickAnalyticsSerializer(serializers.ModelSerializer):
     """Serializer for Click Analytics."""
     class Meta:
         model = ClickAnalytics
-        fields = ['id', 'job', 'click_type', 'click_count', 'last_clicked_at']
-        read_only_fields = ['id', 'click_count', 'last_clicked_at']
+        fields = ['id', 'job', 'click_type', 'click_count', 'unique_count', 'last_clicked_at']
+        read_only_fields = ['id', 'click_count', 'unique_count', 'last_clicked_at']
 
 
 class TrackClickSerializer(serializers.Serializer):
@@ -235,25 +252,48 @@ class SubscriptionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'is_active', 'created_at', 'confirmed_at']
 
 
+def preference_field(choices):
+    """Optional list of choice values; an empty list means no preference."""
+    return serializers.ListField(
+        child=serializers.ChoiceField(choices=choices), required=False, allow_empty=True
+    )
+
+
 class SubscriptionCreateSerializer(serializers.Serializer):
     """Serializer for creating a new subscription."""
     email = serializers.EmailField()
+    categories = preference_field(Job.CATEGORY_CHOICES)
+    locations = preference_field(Job.LOCATION_CHOICES)
+    documents = preference_field(Job.DOCUMENT_CHOICES)
     
     def validate_email(self, value):
         """Validate and normalize email."""
         return value.lower().strip()
 
 
+class SubscriptionPreferencesSerializer(serializers.ModelSerializer):
+    """Digest preferences of a subscription, edited through its token link."""
+    categories = preference_field(Job.CATEGORY_CHOICES)
+    locations = preference_field(Job.LOCATION_CHOICES)
+    documents = preference_field(Job.DOCUMENT_CHOICES)
+
+    class Meta:
+        model = Subscription
+        fields = ['email', 'is_active', 'categories', 'locations', 'documents']
+        read_only_fields = ['email', 'is_active']
+
+
 class PartnerSerializer(serializers.ModelSerializer):
     """Serializer for partner organizations."""
 
     opportunity_count = serializers.SerializerMethodField()
     logo_url = serializers.SerializerMethodField()
+    logo_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Partner
-        fields = ['id', 'name', 'logo', 'logo_url', 'website_url', 'is_featured', 'opportunity_count']
-        read_only_fields = ['id', 'logo_url', 'opportunity_count']
+        fields = ['id', 'name', 'logo', 'logo_url', 'logo_srcset', 'website_url', 'is_featured', 'opportunity_count']
+        read_only_fields = ['id', 'logo_url', 'logo_srcset', 'opportunity_count']
 
     def get_logo_url(self, obj):
         """
@@ -266,7 +306,17 @@ class PartnerSerializer(serializers.ModelSerializer):
             return obj.logo.url
         return obj.logo_url
 
+    def get_logo_srcset(self, obj):
+        """Return resized uploaded-logo URLs per format, ready for `<source srcset>`."""
+        if not obj.logo:
+            return {}
+        return build_srcset(obj.logo_variants, obj.logo.storage, self.context.get('request'))
+
     def get_opportunity_count(self, obj):
+        # Annotated by the partner views; avoids one COUNT query per partner.
+        annotated = getattr(obj, 'active_opportunity_count', None)
+        if annotated is not None:
+            return annotated
         from .models import Job
         return Job.objects.filter(organization_name=obj.name, is_active=True).count()
     
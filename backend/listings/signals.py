@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.context_processors import invalidate_admin_dashboard_cache
+from .images import schedule_derivatives
+from .models import Event, Job, Partner, Subscription
+from .similarity import schedule_update as schedule_similarity_update
+
+
+@receiver([post_save, post_delete], sender=Job)
+@receiver([post_save, post_delete], sender=Partner)
+@receiver([post_save, post_delete], sender=Subscription)
+@receiver([post_save, post_delete], sender=Event)
+def refresh_admin_dashboard(sender, **kwargs):
+    """
+    Keep admin dashboard tiles current after listings edits.
+
+    Click counters are deliberately not wired in: they change on every
+    click, and the dashboard TTL already bounds how stale they get.
+    """
+    invalidate_admin_dashboard_cache()
+
+
+@receiver(post_save, sender=Job)
+def refresh_similarity_buckets(sender, instance, **kwargs):
+    """Replace the job's LSH bucket rows after its MinHash signature changed."""
+    if getattr(instance, '_signature_changed', False):
+        instance.sync_similarity_buckets()
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Partner)
+def queue_logo_derivatives(sender, instance, **kwargs):
+    """Render resized variants of a freshly uploaded logo once committed."""
+    if getattr(instance, '_logo_changed', False):
+        field_name = 'org_logo' if sender is Job else 'logo'
+        schedule_derivatives(instance, field_name)
+
+
+@receiver(post_save, sender=Job)
+def refresh_similar_lists(sender, instance, **kwargs):
+    """Refresh similar-opportunity lists after a field they use changed."""
+    if getattr(instance, '_similarity_changed', False):
+        schedule_similarity_update(instance.pk)
+
+
+@receiver(post_delete, sender=Job)
+def drop_deleted_job_from_similar_lists(sender, instance, **kwargs):
+    """Replace a deleted job wherever it was listed as a similar opportunity."""
+    schedule_similarity_update(instance.pk)
@@ -0,0 +1,372 @@
+"""
+"Similar opportunities" for BYN-K Platform.
+
+Each active Job is a sparse vector: TF-IDF weights of the words in its
+title (counted twice), organization and description, plus a one-hot block
+for its choice fields (category, location, work mode, ...). Both blocks
+are unit length and weighted so that the cosine similarity of two jobs is
+
+    (1 - SIMILAR_JOBS_CHOICE_WEIGHT) * text cosine + SIMILAR_JOBS_CHOICE_WEIGHT * choice cosine
+
+The `SIMILAR_JOBS_COUNT` nearest neighbours scoring at least
+`SIMILAR_JOBS_MIN_SCORE` are stored in `Job.similar_job_ids`, so the
+detail page reads them without any text matching.
+
+`rebuild_all()` recomputes every list (nightly, and from the
+`build_similar_opportunities` command). `update_jobs()` runs after saves
+that changed a source field, or deletes: it recomputes the jobs' own lists
+and only those lists the jobs can enter or leave. Jobs saved or deleted in
+one transaction are refreshed together, and large batches (a bulk delete)
+trigger one rebuild instead.
+
+Each process keeps its `SimilarityIndex` between updates. An update only
+re-vectorizes the jobs edited since the last one, against the cached IDF
+weights, and drops rows of jobs that are gone or inactive. IDF weights are
+recomputed nightly, or once the cached index is older than
+`SIMILAR_JOBS_INDEX_MAX_AGE` seconds; until then a word first seen after
+the build is weighted as if only one job had it.
+"""
+
+import logging
+import math
+import threading
+from collections import Counter
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from scipy import sparse
+
+from .duplicates import normalize_text
+
+logger = logging.getLogger(__name__)
+
+TEXT_SOURCE_FIELDS = ('title', 'organization_name', 'description')
+CHOICE_FIELDS = (
+    'category', 'location', 'work_mode', 'commitment', 'target_group', 'education_level', 'funding_type',
+)
+SIMILARITY_SOURCE_FIELDS = frozenset({*TEXT_SOURCE_FIELDS, *CHOICE_FIELDS, 'is_active'})
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or our the this to we will with you your'.split()
+)
+# Rows of the similarity matrix computed per batch (dense batch x jobs floats).
+ROW_BATCH_SIZE = 256
+# Jobs edited this long before the previous sync are re-read anyway, to
+# cover saves that committed while it ran.
+SYNC_OVERLAP = timedelta(minutes=1)
+# More jobs than this changed in one transaction are handled by a rebuild.
+REBUILD_THRESHOLD = 50
+
+
+def tokenize(job):
+    """Word counts for a job; title words count twice."""
+    words = normalize_text(job.title).split() * 2 + normalize_text(job.organization_name, job.description).split()
+    return Counter(word for word in words if len(word) > 1 and word not in STOPWORDS)
+
+
+def choice_features(job):
+    return [f'{field}={getattr(job, field)}' for field in CHOICE_FIELDS if getattr(job, field)]
+
+
+def source_snapshot(job):
+    """The loaded values of the fields similarity is computed from (deferred ones are left out)."""
+    return {field: job.__dict__[field] for field in SIMILARITY_SOURCE_FIELDS if field in job.__dict__}
+
+
+def source_changed(job, update_fields=None):
+    """Whether saving `job` can change its similarity vector or active flag, judged against the loaded values."""
+    fields = SIMILARITY_SOURCE_FIELDS if update_fields is None else SIMILARITY_SOURCE_FIELDS.intersection(update_fields)
+    loaded = getattr(job, '_similarity_source', None)
+    if not fields or job._state.adding or loaded is None:
+        return bool(fields)
+    for field in fields:
+        if field not in job.__dict__:
+            continue  # Still deferred, so never changed.
+        if field not in loaded or job.__dict__[field] != loaded[field]:
+            return True
+    return False
+
+
+class SimilarityIndex:
+    """
+    Unit-length job vectors as a CSR matrix, one row per job in `ids`.
+
+    IDF weights are fixed when the index is built; words first seen later
+    (by `update()`) get a column and the weight of a word only one job has.
+    """
+
+    def __init__(self, jobs):
+        counts = [tokenize(job) for job in jobs]
+        choices = [choice_features(job) for job in jobs]
+
+        document_frequency = Counter(word for words in counts for word in words)
+        total = len(jobs)
+        self.idf = {word: math.log((1 + total) / (1 + frequency)) + 1 for word, frequency in document_frequency.items()}
+        self.unseen_idf = math.log((1 + total) / 2) + 1
+
+        choice_weight = getattr(settings, 'SIMILAR_JOBS_CHOICE_WEIGHT', 0.2)
+        self.text_scale, self.choice_scale = math.sqrt(1 - choice_weight), math.sqrt(choice_weight)
+        # Word and choice-feature columns, assigned on first sight.
+        self.columns = {}
+
+        self.ids = [job.pk for job in jobs]
+        self.rows = {pk: row for row, pk in enumerate(self.ids)}
+        self.matrix = self.vectorize(counts, choices)
+
+    def column(self, key):
+        return self.columns.setdefault(key, len(self.columns))
+
+    def vectorize(self, counts, choices):
+        """CSR rows for the given word counts and choice features."""
+        data, indices, indptr = [], [], [0]
+        for words, row_choices in zip(counts, choices):
+            weights = {word: (1 + math.log(count)) * self.idf.get(word, self.unseen_idf) for word, count in words.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for word, weight in weights.items():
+                indices.append(self.column(('word', word)))
+                data.append(self.text_scale * weight / norm)
+            for feature in row_choices:
+                indices.append(self.column(('choice', feature)))
+                data.append(self.choice_scale / math.sqrt(len(row_choices)))
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(counts), len(self.columns)),
+        )
+
+    def update(self, jobs, active_ids):
+        """Re-vectorize `jobs` and drop the rows of jobs not in `active_ids`."""
+        replaced = {job.pk for job in jobs}
+        keep = [row for row, pk in enumerate(self.ids) if pk in active_ids and pk not in replaced]
+        jobs = [job for job in jobs if job.pk in active_ids]
+        added = self.vectorize([tokenize(job) for job in jobs], [choice_features(job) for job in jobs])
+        self.ids = [self.ids[row] for row in keep] + [job.pk for job in jobs]
+        self.rows = {pk: row for row, pk in enumerate(self.ids)}
+        kept = self.matrix[keep]
+        # New words widen the matrix; existing rows have no weight in those columns.
+        kept = sparse.csr_matrix((kept.data, kept.indices, kept.indptr), shape=(kept.shape[0], added.shape[1]))
+        self.matrix = sparse.vstack([kept, added], format='csr')
+
+    def scores_against(self, pk):
+        """Similarity of `pk` to every indexed job, as a dense array."""
+        row = self.matrix[self.rows[pk]]
+        return (self.matrix @ row.T).toarray().ravel()
+
+    def pair_scores(self, left, right):
+        """Similarity of each (left[i], right[i]) pair of indexed jobs."""
+        rows_left = [self.rows[pk] for pk in left]
+        rows_right = [self.rows[pk] for pk in right]
+        return np.asarray(self.matrix[rows_left].multiply(self.matrix[rows_right]).sum(axis=1)).ravel()
+
+    def neighbours(self, pks, count, min_score):
+        """{pk: [neighbour pk, ...]} for the given indexed jobs, best first."""
+        result = {}
+        pks = list(pks)
+        ids = np.array(self.ids)
+        for start in range(0, len(pks), ROW_BATCH_SIZE):
+            batch = pks[start:start + ROW_BATCH_SIZE]
+            rows = [self.rows[pk] for pk in batch]
+            scores = (self.matrix[rows] @ self.matrix.T).toarray()
+            scores[np.arange(len(rows)), rows] = -1.0
+            for offset, pk in enumerate(batch):
+                row_scores = scores[offset]
+                if len(row_scores) > count:
+                    top = np.argpartition(-row_scores, count)[:count]
+                else:
+                    top = np.arange(len(row_scores))
+                top = top[np.argsort(-row_scores[top], kind='stable')]
+                result[pk] = [int(ids[column]) for column in top if row_scores[column] >= min_score]
+        return result
+
+
+def _with_sources(queryset):
+    return list(queryset.only('pk', *TEXT_SOURCE_FIELDS, *CHOICE_FIELDS))
+
+
+# The process's index and when it was built and last synced with the database.
+_cache = {'index': None, 'built_at': None, 'synced_at': None}
+# Held for a whole update: an index is mutated in place.
+_cache_lock = threading.RLock()
+
+
+def _cache_index(index, now):
+    _cache.update(index=index, built_at=now, synced_at=now)
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache_index(None, None)
+
+
+def current_index(active_ids, job_ids=()):
+    """
+    The cached index, brought up to date with `active_ids` and the jobs
+    edited since the last sync (`job_ids` are always re-read). Builds a new
+    one when there is none or it is older than SIMILAR_JOBS_INDEX_MAX_AGE.
+    """
+    from .models import Job
+
+    now = timezone.now()
+    index = _cache['index']
+    max_age = timedelta(seconds=getattr(settings, 'SIMILAR_JOBS_INDEX_MAX_AGE', 86400))
+    if index is None or now - _cache['built_at'] > max_age:
+        index = SimilarityIndex(_with_sources(Job.objects.filter(is_active=True).order_by('pk')))
+        _cache_index(index, now)
+        return index
+
+    missing = active_ids - index.rows.keys()
+    edited = Q(updated_at__gte=_cache['synced_at'] - SYNC_OVERLAP) | Q(pk__in=missing)
+    if job_ids:
+        edited |= Q(pk__in=job_ids)
+    index.update(_with_sources(Job.objects.filter(edited, is_active=True)), active_ids)
+    _cache['synced_at'] = now
+    return index
+
+
+def _settings():
+    return getattr(settings, 'SIMILAR_JOBS_COUNT', 6), getattr(settings, 'SIMILAR_JOBS_MIN_SCORE', 0.25)
+
+
+def _store(changed):
+    from .models import Job
+
+    # bulk_update skips Job.save(), which would schedule another update.
+    Job.objects.bulk_update(
+        [Job(pk=pk, similar_job_ids=ids) for pk, ids in changed.items()], ['similar_job_ids'], batch_size=500
+    )
+
+
+def rebuild_all():
+    """Recompute every active job's list and clear inactive ones. Returns the number of lists written."""
+    from .models import Job
+
+    count, min_score = _settings()
+    with _cache_lock:
+        now = timezone.now()
+        jobs = list(
+            Job.objects.filter(is_active=True)
+            .only('pk', 'similar_job_ids', *TEXT_SOURCE_FIELDS, *CHOICE_FIELDS)
+            .order_by('pk')
+        )
+        current = {job.pk: job.similar_job_ids for job in jobs}
+        index = SimilarityIndex(jobs)
+        _cache_index(index, now)
+        neighbours = index.neighbours(current, count, min_score) if jobs else {}
+    changed = {pk: ids for pk, ids in neighbours.items() if ids != current[pk]}
+    with transaction.atomic():
+        _store(changed)
+        Job.objects.filter(is_active=False).exclude(similar_job_ids=[]).update(similar_job_ids=[])
+    return len(changed)
+
+
+def lists_entered(index, job_id, current, count, min_score):
+    """
+    Lists an indexed job can enter: it clears the minimum score, and the
+    list has room or its current last entry scores lower.
+    """
+    scores = index.scores_against(job_id)
+    candidates = [index.ids[row] for row in np.flatnonzero(scores >= min_score) if index.ids[row] != job_id]
+    entered, full, last = set(), [], []
+    for pk in candidates:
+        ids = current[pk]
+        if len(ids) < count or ids[-1] not in index.rows:
+            entered.add(pk)
+        else:
+            full.append(pk)
+            last.append(ids[-1])
+    if full:
+        beaten = scores[[index.rows[pk] for pk in full]] > index.pair_scores(full, last)
+        entered.update(pk for pk, won in zip(full, beaten) if won)
+    return entered
+
+
+def update_jobs(job_ids):
+    """Bring the lists touched by saved (or deleted) jobs up to date. Returns the number of lists written."""
+    from .models import Job
+
+    job_ids = set(job_ids)
+    count, min_score = _settings()
+    with _cache_lock:
+        current = dict(Job.objects.filter(is_active=True).values_list('pk', 'similar_job_ids'))
+        index = current_index(current.keys(), job_ids)
+        # Jobs activated between the two queries are left to the next update.
+        affected = {pk for pk, ids in current.items() if pk in index.rows and not job_ids.isdisjoint(ids)}
+
+        gone = []
+        for job_id in job_ids:
+            if job_id in index.rows:
+                affected |= lists_entered(index, job_id, current, count, min_score)
+                affected.add(job_id)
+            else:
+                gone.append(job_id)
+        if gone:
+            Job.objects.filter(pk__in=gone, is_active=False).exclude(similar_job_ids=[]).update(similar_job_ids=[])
+
+        neighbours = index.neighbours(affected, count, min_score) if affected else {}
+    changed = {pk: ids for pk, ids in neighbours.items() if ids != current[pk]}
+    _store(changed)
+    return len(changed)
+
+
+def dispatch_update(job_ids):
+    """
+    Refresh the lists touched by `job_ids`, or rebuild them all for a large
+    batch. With SIMILAR_JOBS_ASYNC the work is queued on Celery; if the
+    broker is unavailable it is skipped rather than run in the request, and
+    the nightly rebuild catches up.
+    """
+    from .tasks import rebuild_similar_jobs, update_similar_jobs
+
+    job_ids = sorted(job_ids)
+    rebuild = len(job_ids) > REBUILD_THRESHOLD
+    if not getattr(settings, 'SIMILAR_JOBS_ASYNC', False):
+        if rebuild:
+            rebuild_all()
+        else:
+            update_jobs(job_ids)
+        return
+    try:
+        if rebuild:
+            rebuild_similar_jobs.delay()
+        else:
+            update_similar_jobs.delay(job_ids)
+    except Exception:
+        logger.exception(
+            "Failed to queue similar opportunities update; the nightly rebuild will catch up.",
+            extra={"job_ids": job_ids},
+        )
+
+
+# Jobs waiting for the current transaction to commit, per thread.
+_pending = threading.local()
+
+
+def schedule_update(job_id):
+    """
+    Refresh similar-opportunity lists once the save or delete is committed.
+
+    Jobs changed in the same transaction (e.g. an admin bulk delete) are
+    collected and dispatched once, on commit.
+    """
+    connection = transaction.get_connection()
+    batch = getattr(_pending, 'batch', None)
+    # A rolled-back transaction drops its callback; start a new batch then.
+    if batch is not None and any(entry[1] is batch['flush'] for entry in connection.run_on_commit):
+        batch['job_ids'].add(job_id)
+        return
+
+    batch = {'job_ids': {job_id}}
+
+    def flush():
+        if getattr(_pending, 'batch', None) is batch:
+            _pending.batch = None
+        dispatch_update(batch['job_ids'])
+
+    batch['flush'] = flush
+    _pending.batch = batch
+    # Runs immediately outside a transaction.
+    transaction.on_commit(flush)
@@ -0,0 +1,98 @@
+"""
+Slug allocation for BYN-K Platform.
+
+Shared by Job and Event so every public URL slug is unique. The next free
+suffix is found with a single prefix query (`slug`, `slug-1`, `slug-2`, ...)
+instead of probing `exists()` once per collision.
+"""
+
+import re
+import uuid
+
+from django.utils.text import slugify
+
+# Room kept at the end of the base slug for a "-<n>" suffix.
+SUFFIX_RESERVE = 10
+
+
+def _base_slug(value, max_length):
+    base = slugify(value or '')[:max_length - SUFFIX_RESERVE].strip('-')
+    return base or uuid.uuid4().hex[:12]
+
+
+def _next_free(base, taken, wanted=None):
+    """
+    Return `wanted` (default `base`) when no other row holds it, else `base`
+    if that is free, else `base-<max suffix + 1>` given the slugs already taken.
+    """
+    taken = set(taken)
+    wanted = wanted or base
+    if wanted not in taken:
+        return wanted
+    if base not in taken:
+        return base
+    pattern = re.compile(rf"^{re.escape(base)}(?:-(\d+))?$")
+    highest = max(int(match.group(1) or 0) for match in map(pattern.match, taken) if match)
+    return f"{base}-{highest + 1}"
+
+
+def unique_slug(model_class, value, instance=None, field_name='slug'):
+    """
+    Return a slug derived from `value` that is unused in `model_class`.
+
+    The slug is returned unchanged when no other row holds it; only a real
+    collision gets a suffix. Runs exactly one query: a prefix match
+    (index-friendly) narrowed to `base` or `base-<digits>`, from which the
+    highest suffix is taken.
+    """
+    max_length = model_class._meta.get_field(field_name).max_length
+    base = _base_slug(value, max_length)
+    # A slug that is already valid (e.g. the one being re-saved) is kept as is.
+    wanted = slugify(value or '')[:max_length].strip('-') or base
+
+    queryset = model_class._default_manager.filter(**{
+        f'{field_name}__startswith': base,
+        f'{field_name}__regex': rf"^({re.escape(base)}(-[0-9]+)?|{re.escape(wanted)})$",
+    })
+    if instance is not None and instance.pk:
+        queryset = queryset.exclude(pk=instance.pk)
+
+    return _next_free(base, queryset.values_list(field_name, flat=True), wanted)
+
+
+def repair_slugs(model_class, source_field='title', field_name='slug', batch_size=500, dry_run=False):
+    """
+    Give every row of `model_class` a unique, non-empty slug in bulk.
+
+    The oldest row (lowest pk) keeps a contested slug; later duplicates and
+    blank slugs are reassigned in memory and written with `bulk_update`.
+    Returns the number of rows that were (or would be) changed.
+    """
+    max_length = model_class._meta.get_field(field_name).max_length
+    manager = model_class._default_manager
+
+    taken = set()
+    pending = []
+    rows = manager.order_by('pk').values_list('pk', field_name, source_field)
+    for pk, slug, source in rows.iterator(chunk_size=batch_size):
+        if slug and slug not in taken:
+            taken.add(slug)
+        else:
+            pending.append((pk, slug or source))
+
+    next_suffix = {}
+    updates = []
+    for pk, value in pending:
+        base = _base_slug(value, max_length)
+        candidate = base
+        suffix = next_suffix.get(base, 0)
+        while candidate in taken:
+            suffix += 1
+            candidate = f"{base}-{suffix}"
+        next_suffix[base] = suffix
+        taken.add(candidate)
+        updates.append(model_class(pk=pk, **{field_name: candidate}))
+
+    if updates and not dry_run:
+        manager.bulk_update(updates, [field_name], batch_size=batch_size)
+    return len(updates)
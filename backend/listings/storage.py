@@ -0,0 +1,107 @@
+"""
+Content-addressed logo storage for BYN-K Platform.
+
+The same organization logo used to be uploaded again for every Job under
+`logos/%Y/%m/`. Logos are now stored once per unique content under a name
+derived from its SHA-256 digest:
+
+    logos/sha256/1a/1a2b3c...e9f0.png
+
+Identical uploads resolve to the same blob (no second write), and because
+a name can only ever hold one content, its URL is immutable and served
+with far-future cache headers (see `serve_content_addressed`).
+"""
+
+import hashlib
+import os
+import posixpath
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.module_loading import import_string
+from django.views.static import serve
+
+CONTENT_ADDRESSED_PREFIX = 'logos/sha256'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(content):
+    """SHA-256 hex digest of a File / UploadedFile, read in chunks."""
+    digest = hashlib.sha256()
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def content_addressed_name(digest, filename, prefix=CONTENT_ADDRESSED_PREFIX):
+    """Storage name for a blob: `<prefix>/<2 hex>/<digest><ext>`."""
+    extension = posixpath.splitext(filename)[1].lower()
+    return posixpath.join(prefix, digest[:2], f"{digest}{extension}")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that names every file after the SHA-256 of its bytes.
+
+    `upload_to` only contributes the file extension. Saving content that is
+    already stored returns the existing name without writing; new blobs are
+    written to a temporary name and renamed into place, so concurrent
+    uploads of the same logo cannot produce `-<random>` suffixed copies.
+    """
+
+    def __init__(self, prefix=CONTENT_ADDRESSED_PREFIX, **kwargs):
+        super().__init__(**kwargs)
+        self.prefix = prefix
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is chosen by `_save()` from the content digest.
+        return name
+
+    def _save(self, name, content):
+        key = content_addressed_name(file_digest(content), name, self.prefix)
+        if self.exists(key):
+            return key
+        temporary = super()._save(f"{key}.{uuid.uuid4().hex}.tmp", content)
+        os.replace(self.path(temporary), self.path(key))
+        return key
+
+    def delete(self, name):
+        # Blobs are shared between rows; `dedupe_logos --prune` removes
+        # the ones no row references any more.
+        if not self.is_content_addressed(name):
+            super().delete(name)
+
+    def purge(self, name):
+        """Really delete a blob; callers must ensure nothing references it."""
+        super().delete(name)
+
+    def is_content_addressed(self, name):
+        return bool(name) and name.startswith(f"{self.prefix}/")
+
+
+def logo_storage():
+    """
+    Storage used by `Job.org_logo` and `Partner.logo`.
+
+    Resolved from `LOGO_STORAGE_BACKEND` so object storage can be swapped in
+    without a migration.
+    """
+    backend = getattr(settings, 'LOGO_STORAGE_BACKEND', 'listings.storage.ContentAddressedStorage')
+    return import_string(backend)()
+
+
+def serve_content_addressed(request, path):
+    """
+    Serve a content-addressed blob with a one-year immutable cache policy.
+
+    Only used when Django serves media itself; behind nginx/CDN configure
+    the same `Cache-Control` on the `logos/sha256/` location.
+    """
+    document_root = os.path.join(settings.MEDIA_ROOT, CONTENT_ADDRESSED_PREFIX)
+    response = serve(request, path, document_root=document_root)
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
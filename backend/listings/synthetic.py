@@ -0,0 +1,302 @@
+"""
+Synthetic Catalog for BYN-K Platform.
+
+Deterministic, production-shaped rows for benchmarks and scale testing.
+The same seed always produces the same catalog, so timings from two
+commits are measured against identical data.
+
+Rows are written with `bulk_create` in batches and skip `Model.save()`:
+slugs are allocated from the row index instead of `unique_slug()`, no
+MinHash signatures, logo derivatives or cache invalidations are
+produced, and every synthetic user shares one password hash. Timestamps
+(`created_at`, `last_clicked_at`) are spread over time instead of all
+being "now".
+"""
+
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .models import ClickAnalytics, Event, Job, Partner, Subscription
+
+ROLES = [
+    'Office Manager', 'Community Mobilizer', 'Data Analyst', 'Protection Officer',
+    'Software Developer', 'Teacher', 'Nurse', 'Finance Assistant', 'Field Monitor',
+    'Program Coordinator', 'Logistics Officer', 'Graphic Designer', 'Research Fellow',
+    'Livelihoods Trainer', 'Communications Intern', 'Case Worker',
+]
+CATEGORY_TITLES = {
+    'job': '{role}',
+    'scholarship': '{org} Scholarship for {group}',
+    'internship': '{role} Internship',
+    'fellowship': '{org} {role} Fellowship',
+    'training': '{role} Training Bootcamp',
+}
+ORGANIZATIONS = [
+    'Refugee Consortium of Kenya', 'UNHCR', 'Mastercard Foundation', 'Akili Dada',
+    'Windle International', 'Kiron Open Higher Education', 'IRC', 'Jesuit Refugee Service',
+    'Norwegian Refugee Council', 'Danish Refugee Council', 'FilmAid', 'Xavier Project',
+    'Lutheran World Federation', 'Save the Children', 'Kakuma Ventures', 'RefuSHE',
+]
+CITIES = {
+    'kenya': ['Nairobi', 'Kakuma', 'Dadaab', 'Mombasa', 'Kisumu'],
+    'uganda': ['Kampala', 'Nakivale', 'Kyangwali', 'Arua'],
+    'tanzania': ['Dar es Salaam', 'Kigoma', 'Arusha'],
+    'rwanda': ['Kigali', 'Mahama', 'Kiziba'],
+    'remote': [''],
+    'multiple': [''],
+}
+GROUP_NAMES = ['Refugee Youth', 'Young Women', 'Graduates', 'Community Leaders']
+PREP_ITEMS = [
+    'Resume', 'Cover Letter', 'Recommendation Letters', 'Academic Transcripts',
+    'Copy of ID', 'Motivation Essay', 'Portfolio', 'Birth Certificate',
+]
+DESCRIPTION_SENTENCES = [
+    'We are looking for motivated candidates from refugee and host communities.',
+    'The successful applicant will support day-to-day program operations.',
+    'Applicants must be available to start immediately.',
+    'Training and mentorship are provided throughout the program.',
+    'Strong written and spoken English or Swahili is required.',
+    'Women and persons with disabilities are encouraged to apply.',
+    'The position involves regular travel to field locations.',
+    'Shortlisted candidates will be contacted for an interview.',
+]
+FIRST_NAMES = ['Amani', 'Neema', 'Esther', 'David', 'Grace', 'Joseph', 'Aline', 'Patrick', 'Ruth', 'Eric']
+LAST_NAMES = ['Mugisha', 'Uwimana', 'Byiringiro', 'Rukundo', 'Niyonzima', 'Kabera', 'Mutesi', 'Habimana']
+EVENT_TOPICS = [
+    'Digital Skills Webinar', 'Scholarship Application Clinic', 'Climate Action Forum',
+    'Youth Policy Dialogue', 'Career Fair', 'Community Town Hall', 'Startup Pitch Night',
+]
+
+DEFAULT_BATCH_SIZE = 2000
+SYNTHETIC_PASSWORD = 'synthetic-password'
+
+
+def _choice_keys(choices):
+    return [key for key, _ in choices]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@contextmanager
+def keep_timestamps(*models):
+    """Let bulk_create keep explicit values for auto_now/auto_now_add fields."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def bulk_insert(model, rows, batch_size=DEFAULT_BATCH_SIZE, using='default'):
+    """Insert an iterable of unsaved instances in batches; return the row count."""
+    total = 0
+    manager = model.objects.db_manager(using)
+    # One transaction per model: no commit (fsync) per batch.
+    with keep_timestamps(model), transaction.atomic(using=using):
+        for batch in batched(rows, batch_size):
+            manager.bulk_create(batch, batch_size=batch_size)
+            total += len(batch)
+    return total
+
+
+def partner_names(count):
+    """Unique partner names; the first ones match real organization names."""
+    return [
+        ORGANIZATIONS[index] if index < len(ORGANIZATIONS) else f'{ORGANIZATIONS[index % len(ORGANIZATIONS)]} {index}'
+        for index in range(count)
+    ]
+
+
+def generate_partners(rng, count, now=None):
+    now = now or timezone.now()
+    for index, name in enumerate(partner_names(count)):
+        yield Partner(
+            name=name,
+            website_url=f'https://partner-{index}.example.org',
+            is_featured=rng.random() < 0.1,
+            created_at=now - timedelta(days=rng.randint(0, 730)),
+        )
+
+
+def generate_jobs(rng, count, organizations, now=None, start=0):
+    """
+    Yield `count` unsaved Job rows covering every choice field.
+
+    `organizations` is the pool of organization names, so partner
+    opportunity counts have matches.
+    """
+    now = now or timezone.now()
+    categories = _choice_keys(Job.CATEGORY_CHOICES)
+    locations = _choice_keys(Job.LOCATION_CHOICES)
+    work_modes = _choice_keys(Job.WORK_MODE_CHOICES) + ['']
+    commitments = _choice_keys(Job.COMMITMENT_CHOICES) + ['']
+    target_groups = _choice_keys(Job.TARGET_GROUP_CHOICES) + ['']
+    education_levels = _choice_keys(Job.EDUCATION_LEVEL_CHOICES) + ['']
+    funding_types = _choice_keys(Job.FUNDING_TYPE_CHOICES) + ['']
+    documents = _choice_keys(Job.DOCUMENT_CHOICES)
+    application_types = _choice_keys(Job.APPLICATION_TYPE_CHOICES)
+
+    for index in range(start, start + count):
+        category = rng.choices(categories, weights=(50, 20, 15, 8, 7))[0]
+        organization = rng.choice(organizations)
+        title = CATEGORY_TITLES[category].format(
+            role=rng.choice(ROLES), org=organization, group=rng.choice(GROUP_NAMES),
+        )
+        location = rng.choice(locations)
+        application_type = rng.choices(application_types, weights=(70, 25, 5))[0]
+        is_paid = category != 'scholarship' and rng.random() < 0.6
+        stipend_min = Decimal(rng.randrange(50, 1500) * 100) if is_paid else None
+        is_rolling = rng.random() < 0.1
+        created_at = now - timedelta(minutes=rng.randrange(0, 365 * 24 * 60))
+        yield Job(
+            title=title,
+            slug=f'{slugify(title)[:230]}-{index}',
+            organization_name=organization,
+            location=location,
+            city=rng.choice(CITIES[location]),
+            category=category,
+            description=' '.join(rng.sample(DESCRIPTION_SENTENCES, rng.randint(2, 5))),
+            work_mode=rng.choice(work_modes),
+            commitment=rng.choice(commitments),
+            target_group=rng.choice(target_groups),
+            education_level=rng.choice(education_levels),
+            funding_type=rng.choice(funding_types) if category in ('scholarship', 'fellowship') else '',
+            is_paid=is_paid,
+            stipend_min=stipend_min,
+            stipend_max=stipend_min * 2 if stipend_min else None,
+            is_rolling=is_rolling,
+            required_documents=rng.sample(documents, rng.randint(1, 3)),
+            application_type=application_type,
+            external_url=f'https://apply.example.org/{index}' if application_type == 'link' else None,
+            application_email=f'jobs{index}@example.org' if application_type == 'email' else None,
+            prep_checklist=rng.sample(PREP_ITEMS, rng.randint(0, 4)),
+            is_verified=rng.random() < 0.4,
+            is_active=rng.random() < 0.85,
+            is_featured=rng.random() < 0.05,
+            deadline=None if is_rolling else created_at + timedelta(days=rng.randint(7, 120)),
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+
+def generate_events(rng, count, organizations, now=None):
+    now = now or timezone.now()
+    categories = _choice_keys(Event.CLASSIFICATION_CHOICES)
+    for index in range(count):
+        title = f'{rng.choice(EVENT_TOPICS)} {index}'
+        start_time = now + timedelta(hours=rng.randint(-30 * 24, 90 * 24))
+        is_virtual = rng.random() < 0.4
+        yield Event(
+            title=title,
+            slug=slugify(title),
+            partner=rng.choice(organizations),
+            category=rng.choice(categories),
+            description=' '.join(rng.sample(DESCRIPTION_SENTENCES, 2)),
+            location='Online' if is_virtual else rng.choice(CITIES['kenya']),
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=rng.randint(1, 8)),
+            is_virtual=is_virtual,
+            stream_url='https://meet.example.org/live' if is_virtual else '',
+            created_at=now,
+            updated_at=now,
+        )
+
+
+def generate_clicks(rng, job_ids, now=None):
+    """Per-job click counters with a long-tailed popularity distribution."""
+    now = now or timezone.now()
+    click_types = _choice_keys(ClickAnalytics.CLICK_TYPE_CHOICES)
+    for job_id in job_ids:
+        for click_type in rng.sample(click_types, rng.randint(0, len(click_types))):
+            yield ClickAnalytics(
+                job_id=job_id,
+                click_type=click_type,
+                click_count=int(rng.paretovariate(1.2) * 3),
+                last_clicked_at=now - timedelta(minutes=rng.randrange(0, 30 * 24 * 60)),
+            )
+
+
+def generate_subscriptions(rng, count, now=None):
+    now = now or timezone.now()
+    for index in range(count):
+        is_active = rng.random() < 0.8
+        created_at = now - timedelta(days=rng.randint(1, 365))
+        yield Subscription(
+            email=f'subscriber{index}@example.org',
+            confirmation_token=uuid.UUID(int=rng.getrandbits(128), version=4),
+            is_active=is_active,
+            created_at=created_at,
+            confirmed_at=created_at + timedelta(hours=1) if is_active else None,
+            last_notified_at=now - timedelta(days=rng.randint(1, 7)) if is_active else None,
+        )
+
+
+def generate_users(rng, count, now=None):
+    """Community accounts sharing one pre-hashed password (SYNTHETIC_PASSWORD)."""
+    user_model = get_user_model()
+    now = now or timezone.now()
+    # Hashing once keeps a million users in minutes; the fixed salt keeps it deterministic.
+    password = make_password(SYNTHETIC_PASSWORD, salt='synthetic')
+    for index in range(count):
+        joined = now - timedelta(minutes=rng.randrange(0, 730 * 24 * 60))
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield user_model(
+            username=f'user{index}',
+            email=f'user{index}@example.org',
+            password=password,
+            first_name=first_name,
+            last_name=last_name,
+            email_notifications=rng.random() < 0.7,
+            date_joined=joined,
+            last_login=joined + timedelta(days=rng.randint(0, 30)) if rng.random() < 0.6 else None,
+            created_at=joined,
+            updated_at=joined,
+        )
+
+
+def seed_catalog(jobs, partners=200, events=500, subscriptions=0, users=0, seed=0,
+                 batch_size=DEFAULT_BATCH_SIZE, using='default'):
+    """
+    Insert a synthetic catalog; return {model name: rows inserted}.
+
+    Click rows are generated for every inserted job.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    organizations = partner_names(max(partners, len(ORGANIZATIONS)))
+    last_job_pk = Job.objects.using(using).order_by('-pk').values_list('pk', flat=True).first() or 0
+    counts = {
+        'partners': bulk_insert(Partner, generate_partners(rng, partners, now), batch_size, using),
+        'jobs': bulk_insert(Job, generate_jobs(rng, jobs, organizations, now), batch_size, using),
+        'events': bulk_insert(Event, generate_events(rng, events, organizations, now), batch_size, using),
+    }
+    job_ids = list(
+        Job.objects.using(using).filter(pk__gt=last_job_pk).order_by('pk').values_list('pk', flat=True)
+    )
+    counts['clicks'] = bulk_insert(ClickAnalytics, generate_clicks(rng, job_ids, now), batch_size, using)
+    counts['subscriptions'] = bulk_insert(
+        Subscription, generate_subscriptions(rng, subscriptions, now), batch_size, using,
+    )
+    counts['users'] = bulk_insert(get_user_model(), generate_users(rng, users, now), batch_size, using)
+    return counts
@@ -3,45 +3,99 @@ from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
-from .models import Subscription, Job
+from config.context_processors import invalidate_admin_dashboard_cache
+from config.metrics import track_email
+from .digests import send_digests, send_job_notification
+from .models import Subscription, Job, ClickAnalytics, normalize_email
+from .images import generate_derivatives
+
+SYNC_BATCH_SIZE = 500
 
 
 def _sync_signed_up_users_to_subscribers():
     """
     Ensure all eligible platform account holders are active update subscribers.
+
+    Works in batches of emails (a few queries each) rather than a
+    get_or_create per user.
     """
     from users.models import User
 
-    eligible_users = User.objects.filter(
+    eligible_emails = User.objects.filter(
         is_superuser=False,
         is_active=True,
         email_notifications=True,
-    ).exclude(email="")
+    ).exclude(email="").values_list("email", flat=True)
+    emails = sorted({normalize_email(email) for email in eligible_emails} - {""})
 
     now = timezone.now()
-    for user in eligible_users:
-        email = (user.email or "").strip().lower()
-        if not email:
-            continue
-
-        subscription, _ = Subscription.objects.get_or_create(
-            email=email,
-            defaults={
-                "is_active": True,
-                "confirmed_at": now,
-            },
+    changed = False
+    for start in range(0, len(emails), SYNC_BATCH_SIZE):
+        batch = emails[start:start + SYNC_BATCH_SIZE]
+        subscriptions = Subscription.objects.filter(email__in=batch)
+        existing = set(subscriptions.values_list("email", flat=True))
+        created = Subscription.objects.bulk_create(
+            [Subscription(email=email, is_active=True, confirmed_at=now) for email in batch if email not in existing],
+            ignore_conflicts=True,
         )
+        activated = subscriptions.filter(is_active=False).update(is_active=True)
+        confirmed = subscriptions.filter(confirmed_at__isnull=True).update(confirmed_at=now)
+        changed = changed or bool(created or activated or confirmed)
 
-        updates = {}
-        if not subscription.is_active:
-            updates["is_active"] = True
-        if not subscription.confirmed_at:
-            updates["confirmed_at"] = now
+    # Bulk writes skip the post_save receiver that refreshes the dashboard.
+    if changed:
+        invalidate_admin_dashboard_cache()
 
-        if updates:
-            for field, value in updates.items():
-                setattr(subscription, field, value)
-            subscription.save(update_fields=list(updates.keys()))
+
+@shared_task
+def record_click(job_id, click_type, unique=False):
+    """
+    Record a click outside the request/response cycle.
+    """
+    if not Job.objects.filter(id=job_id).exists():
+        return
+    ClickAnalytics.track_click(job_id, click_type, unique=unique)
+
+
+@shared_task
+def update_trending_scores():
+    """
+    Fold clicks since the last run into the decayed trending scores.
+    """
+    from .trending import recompute_trending_scores
+
+    return recompute_trending_scores()
+
+
+@shared_task
+def update_similar_jobs(job_ids):
+    """
+    Refresh the similar-opportunity lists affected by saved or deleted jobs.
+    """
+    from .similarity import update_jobs
+
+    if isinstance(job_ids, int):
+        # Queued before updates were batched.
+        job_ids = [job_ids]
+    return update_jobs(job_ids)
+
+
+@shared_task
+def rebuild_similar_jobs():
+    """
+    Recompute every similar-opportunity list (picks up IDF drift).
+    """
+    from .similarity import rebuild_all
+
+    return rebuild_all()
+
+
+@shared_task
+def generate_image_derivatives(model_label, pk, field_name):
+    """
+    Render WebP/AVIF thumbnails for a newly uploaded logo.
+    """
+    generate_derivatives(model_label, pk, field_name)
 
 
 @shared_task
@@ -63,14 +117,15 @@ def send_subscription_confirmation_email(subscription_id):
             text_body = render_to_string('listings/emails/subscription_confirmation.txt', context)
             html_body = render_to_string('listings/emails/subscription_confirmation.html', context)
 
-            send_mail(
-                subject,
-                text_body,
-                settings.DEFAULT_FROM_EMAIL,
-                [subscription.email],
-                html_message=html_body,
-                fail_silently=False,
-            )
+            with track_email('subscription_confirmation') as outcome:
+                outcome['sent'] = send_mail(
+                    subject,
+                    text_body,
+                    settings.DEFAULT_FROM_EMAIL,
+                    [subscription.email],
+                    html_message=html_body,
+                    fail_silently=False,
+                )
     except Subscription.DoesNotExist:
         # Handle case where subscription might have been deleted
         pass
@@ -79,53 +134,17 @@ def send_subscription_confirmation_email(subscription_id):
 @shared_task
 def send_new_opportunity_notifications():
     """
-    Sends new opportunity notifications to all active subscribers.
+    Sends each active subscriber the new opportunities matching their preferences.
     This task is scheduled to run daily by Celery Beat.
     """
     _sync_signed_up_users_to_subscribers()
-    active_subscriptions = Subscription.objects.filter(is_active=True)
-    
-    for subscription in active_subscriptions:
-        # If the user has never been notified, we can select all jobs from last 24h
-        if subscription.last_notified_at:
-            new_jobs = Job.objects.filter(
-                is_active=True,
-                created_at__gt=subscription.last_notified_at
-            )
-        else:
-            new_jobs = Job.objects.filter(
-                is_active=True,
-                created_at__gte=timezone.now() - timezone.timedelta(days=1)
-            )
-
-        if new_jobs.exists():
-            context = {
-                'jobs': new_jobs,
-                'unsubscribe_link': f"{settings.FRONTEND_URL}/unsubscribe?token={subscription.confirmation_token}",
-                'frontend_url': settings.FRONTEND_URL,
-            }
-            
-            subject = f'New Opportunities on BYN-K Platform ({new_jobs.count()} new)'
-            text_body = render_to_string('listings/emails/new_opportunities.txt', context)
-            html_body = render_to_string('listings/emails/new_opportunities.html', context)
-
-            send_mail(
-                subject,
-                text_body,
-                settings.DEFAULT_FROM_EMAIL,
-                [subscription.email],
-                html_message=html_body,
-                fail_silently=False,
-            )
-            
-        subscription.last_notified_at = timezone.now()
-        subscription.save()
+    return send_digests()
 
 
 @shared_task
 def send_immediate_opportunity_notification(job_id):
     """
-    Sends an immediate notification to all active subscribers when a new opportunity is posted.
+    Sends an immediate notification to the active subscribers whose preferences match a new opportunity.
     This task should be called from the Job model's save method or admin action.
     """
     _sync_signed_up_users_to_subscribers()
@@ -134,26 +153,4 @@ def send_immediate_opportunity_notification(job_id):
         job = Job.objects.get(id=job_id, is_active=True)
     except Job.DoesNotExist:
         return
-    
-    active_subscriptions = Subscription.objects.filter(is_active=True)
-    
-    for subscription in active_subscriptions:
-        context = {
-            'job': job,
-            'unsubscribe_link': f"{settings.FRONTEND_URL}/unsubscribe?token={subscription.confirmation_token}",
-            'frontend_url': settings.FRONTEND_URL,
-            'job_url': f"{settings.FRONTEND_URL}/opportunities/{job.slug or job.id}",
-        }
-        
-        subject = f'New Opportunity: {job.title} at {job.organization_name}'
-        text_body = render_to_string('listings/emails/single_opportunity.txt', context)
-        html_body = render_to_string('listings/emails/single_opportunity.html', context)
-
-        send_mail(
-            subject,
-            text_body,
-            settings.DEFAULT_FROM_EMAIL,
-            [subscription.email],
-            html_message=html_body,
-            fail_silently=True,  # Don't fail for individual emails
-        )
+    return send_job_notification(job)
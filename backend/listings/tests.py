@@ -7,10 +7,10 @@ from django.urls import reverse
 from django.utils import timezone
 from django.core.management import call_command
 from datetime import timedelta
-from io import StringIO
+from io import BytesIO, StringIO
 import json
 
-from .models import Job, ClickAnalytics, Event
+from .models import Job, ClickAnalytics, Event, Subscription
 from users.models import User
 
 
@@ -707,6 +707,1470 @@ class PlatformManagementAccessTests(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class ExportAPITests(TestCase):
+    """Tests for the streaming CSV/NDJSON export endpoints."""
+
+    def setUp(self):
+        self.client = Client()
+        self.super_admin = User.objects.create_user(
+            username='exporter',
+            email='exporter@example.com',
+            password='Testpass123!',
+            is_staff=True,
+            is_superuser=True,
+        )
+        self.scholarship = Job.objects.create(
+            title='Export Scholarship',
+            organization_name='Fund',
+            category='scholarship',
+            required_documents=['passport'],
+        )
+        self.job = Job.objects.create(
+            title='Export Job',
+            organization_name='Corp',
+            category='job',
+        )
+        ClickAnalytics.track_click(self.scholarship.id, 'apply')
+        ClickAnalytics.track_click(self.job.id, 'apply')
+
+    def _read(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_export_requires_super_admin(self):
+        response = self.client.get('/api/opportunities/export/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_opportunity_csv_export_honors_filters(self):
+        import csv
+
+        self.client.force_login(self.super_admin)
+        response = self.client.get('/api/opportunities/export/?category=scholarship')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(self._read(response).splitlines()))
+        self.assertEqual([row['title'] for row in rows], ['Export Scholarship'])
+        self.assertEqual(json.loads(rows[0]['required_documents']), ['passport'])
+
+    def test_analytics_ndjson_export(self):
+        self.client.force_login(self.super_admin)
+        response = self.client.get('/api/analytics/export/?format=ndjson&category=job')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in self._read(response).splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['job_title'], 'Export Job')
+        self.assertEqual(lines[0]['click_count'], 1)
+
+
+class ProtectedBrochureTests(TestCase):
+    """Tests for brochure serving backends."""
+
+    PDF_BYTES = b'%PDF-1.4 ' + b'x' * 1000
+
+    def setUp(self):
+        import tempfile
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        self.job = Job.objects.create(
+            title='Brochure Job',
+            organization_name='Org',
+            application_type='pdf',
+            brochure_upload=SimpleUploadedFile('guide.pdf', self.PDF_BYTES, content_type='application/pdf'),
+        )
+        self.url = f'/api/opportunities/{self.job.id}/brochure/'
+
+    def tearDown(self):
+        import shutil
+
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _clicks(self):
+        analytics = ClickAnalytics.objects.filter(job=self.job, click_type='view_brochure').first()
+        return analytics.click_count if analytics else 0
+
+    def test_direct_backend_serves_full_file(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.PDF_BYTES)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('inline', response['Content-Disposition'])
+        self.assertEqual(self._clicks(), 1)
+
+    def test_direct_backend_serves_byte_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.PDF_BYTES[10:20])
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.PDF_BYTES)}')
+        # Follow-up range requests are not counted as new views.
+        self.assertEqual(self._clicks(), 0)
+
+    def test_direct_backend_honors_if_modified_since(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self._clicks(), 1)
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=5000-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.PDF_BYTES)}')
+
+    def test_invalid_range_serves_full_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=500-100')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.PDF_BYTES)
+
+    def test_x_accel_redirect_backend(self):
+        from django.test import override_settings
+
+        with override_settings(
+            BROCHURE_SERVING_BACKEND='x-accel-redirect',
+            BROCHURE_X_ACCEL_PREFIX='/protected-media/',
+        ):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(
+            response['X-Accel-Redirect'], f'/protected-media/{self.job.brochure_upload.name}'
+        )
+        self.assertEqual(self._clicks(), 1)
+
+    def test_views_are_queued_when_async(self):
+        from unittest import mock
+        from django.test import override_settings
+
+        with override_settings(TRACK_CLICKS_ASYNC=True), \
+                mock.patch('listings.views.record_click.delay') as delay:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        delay.assert_called_once_with(self.job.id, 'view_brochure', mock.ANY)
+        self.assertEqual(self._clicks(), 0)
+
+
+class ImageDerivativeTests(TestCase):
+    """Tests for logo WebP/AVIF derivatives."""
+
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root, IMAGE_DERIVATIVE_SIZES=(64, 128))
+        self.override.enable()
+
+    def tearDown(self):
+        import shutil
+
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _logo(self, color='red'):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('RGB', (600, 400), color).save(buffer, format='PNG')
+        return SimpleUploadedFile('logo.png', buffer.getvalue(), content_type='image/png')
+
+    def _create_job(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = Job.objects.create(title='Logo Job', organization_name='Org', org_logo=self._logo())
+        job.refresh_from_db()
+        return job
+
+    def test_derivatives_generated_after_upload(self):
+        from PIL import Image
+
+        job = self._create_job()
+
+        self.assertEqual(job.org_logo_variants['source'], job.org_logo.name)
+        webp = job.org_logo_variants['webp']
+        self.assertEqual(set(webp), {'64', '128'})
+        with job.org_logo.storage.open(webp['64']) as handle:
+            image = Image.open(handle)
+            self.assertEqual(image.format, 'WEBP')
+            self.assertEqual(image.size[0], 64)
+
+    def test_api_exposes_srcset(self):
+        job = self._create_job()
+
+        response = self.client.get(f'/api/opportunities/{job.id}/')
+
+        srcset = response.json()['org_logo_srcset']
+        self.assertIn('64w', srcset['webp'])
+        self.assertIn('128w', srcset['webp'])
+
+    def test_removing_logo_clears_variants(self):
+        job = self._create_job()
+
+        job.org_logo = None
+        with self.captureOnCommitCallbacks(execute=True):
+            job.save()
+        job.refresh_from_db()
+
+        self.assertEqual(job.org_logo_variants, {})
+
+    def test_stale_full_save_keeps_variants(self):
+        stale = Job.objects.create(title='Logo Job', organization_name='Org', org_logo=self._logo())
+        Job.objects.filter(pk=stale.pk).update(org_logo_variants={'source': stale.org_logo.name, 'webp': {'64': 'x'}})
+
+        stale.title = 'Renamed'
+        stale.save()
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.org_logo_variants['webp'], {'64': 'x'})
+
+    def test_upload_queues_derivatives_on_celery(self):
+        from unittest import mock
+
+        from django.test import override_settings
+
+        with override_settings(IMAGE_DERIVATIVES_ASYNC=True), \
+                mock.patch('listings.tasks.generate_image_derivatives.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                job = Job.objects.create(title='Logo Job', organization_name='Org', org_logo=self._logo())
+
+        delay.assert_called_once_with('listings.Job', job.pk, 'org_logo')
+        job.refresh_from_db()
+        self.assertEqual(job.org_logo_variants, {})
+
+    def test_backfill_command_fills_missing_variants(self):
+        job = self._create_job()
+        Job.objects.filter(pk=job.pk).update(org_logo_variants={})
+
+        call_command('generate_image_derivatives', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertIn('webp', job.org_logo_variants)
+
+
+class ContentAddressedLogoTests(TestCase):
+    """Tests for deduplicated, content-addressed logo storage."""
+
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root, IMAGE_DERIVATIVE_FORMATS=())
+        self.override.enable()
+
+    def tearDown(self):
+        import shutil
+
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _png(self, color='blue'):
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('RGB', (40, 40), color).save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    def test_identical_uploads_share_one_blob(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        first = Job.objects.create(
+            title='One', organization_name='Org', org_logo=SimpleUploadedFile('a.png', self._png()),
+        )
+        second = Job.objects.create(
+            title='Two', organization_name='Org', org_logo=SimpleUploadedFile('b.png', self._png()),
+        )
+        other = Job.objects.create(
+            title='Three', organization_name='Org', org_logo=SimpleUploadedFile('a.png', self._png('green')),
+        )
+
+        self.assertEqual(first.org_logo.name, second.org_logo.name)
+        self.assertNotEqual(first.org_logo.name, other.org_logo.name)
+        self.assertTrue(first.org_logo.name.startswith('logos/sha256/'))
+
+    def test_blob_served_with_immutable_cache_headers(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        job = Job.objects.create(
+            title='One', organization_name='Org', org_logo=SimpleUploadedFile('a.png', self._png()),
+        )
+
+        response = self.client.get(job.org_logo.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_dedupe_command_rewrites_legacy_references(self):
+        import os
+
+        legacy_dir = os.path.join(self.media_root, 'logos', '2025', '01')
+        os.makedirs(legacy_dir)
+        for filename in ('rck.png', 'rck_copy.png'):
+            with open(os.path.join(legacy_dir, filename), 'wb') as handle:
+                handle.write(self._png())
+        first = Job.objects.create(title='One', organization_name='Org')
+        second = Job.objects.create(title='Two', organization_name='Org')
+        Job.objects.filter(pk=first.pk).update(org_logo='logos/2025/01/rck.png')
+        Job.objects.filter(pk=second.pk).update(org_logo='logos/2025/01/rck_copy.png')
+
+        call_command('dedupe_logos', stdout=StringIO())
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.org_logo.name, second.org_logo.name)
+        self.assertTrue(first.org_logo.storage.exists(first.org_logo.name))
+        self.assertFalse(os.path.exists(os.path.join(legacy_dir, 'rck.png')))
+
+
+class QueryInstrumentationTests(TestCase):
+    """Tests for per-request query counting and query budgets."""
+
+    def setUp(self):
+        from .models import Partner
+
+        for index in range(3):
+            Partner.objects.create(name=f'Org {index}')
+            Job.objects.create(title=f'Job {index}', organization_name='Org 0')
+
+    def test_server_timing_header_reports_queries(self):
+        from django.test import override_settings
+
+        with override_settings(QUERY_SERVER_TIMING=True):
+            response = self.client.get('/api/opportunities/')
+
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('queries', response['Server-Timing'])
+
+    def test_partner_counts_do_not_query_per_row(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/partners/')
+
+        counts = {row['name']: row['opportunity_count'] for row in response.json()['results']}
+        self.assertEqual(counts, {'Org 0': 3, 'Org 1': 0, 'Org 2': 0})
+
+    def test_exceeded_budget_fails_in_strict_mode(self):
+        from unittest import mock
+        from config.query_budget import QueryBudgetExceeded
+        from .views import JobListView
+
+        with mock.patch.object(JobListView, 'query_budget', 0):
+            with self.assertRaises(QueryBudgetExceeded), self.assertLogs('config.queries', 'WARNING'):
+                self.client.get('/api/opportunities/')
+
+    async def test_async_views_are_counted(self):
+        import re
+        from unittest import mock
+        from django.test import override_settings
+        from django.urls import path
+        from config.query_budget import QueryBudgetExceeded
+        from .async_views import job_list, read_path
+        from .views import JobListView
+
+        with override_settings(ASYNC_READ_VIEWS=True):
+            view = read_path(JobListView, job_list)
+
+        class urls:
+            urlpatterns = [path('api/opportunities/', view)]
+
+        # Only async-capable middleware, so the instrumentation runs as a coroutine.
+        middleware = ['config.middleware.QueryInstrumentationMiddleware']
+        with override_settings(ROOT_URLCONF=urls, MIDDLEWARE=middleware, QUERY_SERVER_TIMING=True):
+            response = await self.async_client.get('/api/opportunities/')
+            self.assertEqual(response.status_code, 200)
+            queries = int(re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1))
+            self.assertGreater(queries, 0)
+
+            with mock.patch.object(view, 'query_budget', 0), self.assertRaises(QueryBudgetExceeded), \
+                    self.assertLogs('config.queries', 'WARNING'):
+                await self.async_client.get('/api/opportunities/')
+
+    def test_sql_shape_ignores_in_list_length(self):
+        from config.query_budget import normalize_sql
+
+        self.assertEqual(
+            normalize_sql('SELECT * FROM t WHERE id IN (%s, %s)'),
+            normalize_sql('SELECT *  FROM t WHERE id IN (%s, %s, %s)'),
+        )
+
+
+class MetricsEndpointTests(TestCase):
+    """Tests for the Prometheus /metrics endpoint."""
+
+    TOKEN = 'scrape-secret'
+
+    def _scrape(self, **headers):
+        from django.test import override_settings
+
+        with override_settings(METRICS_AUTH_TOKEN=self.TOKEN):
+            return self.client.get('/metrics', **headers)
+
+    def test_exposes_request_metrics(self):
+        self.client.get('/api/opportunities/')
+
+        response = self._scrape(HTTP_AUTHORIZATION=f'Bearer {self.TOKEN}')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('bynk_http_requests_total{method="GET",status="200",view="listings:opportunity-list"}', body)
+        self.assertIn('bynk_http_request_duration_seconds_bucket', body)
+
+    def test_click_ingest_counter(self):
+        from prometheus_client import REGISTRY
+
+        job = Job.objects.create(title='Clicked', organization_name='Org')
+        labels = {'click_type': 'apply', 'path': 'sync'}
+        before = REGISTRY.get_sample_value('bynk_clicks_ingested_total', labels) or 0
+
+        self.client.post('/api/track-click/', {'job_id': job.id, 'click_type': 'apply'}, content_type='application/json')
+
+        self.assertEqual(REGISTRY.get_sample_value('bynk_clicks_ingested_total', labels), before + 1)
+
+    def test_requires_token(self):
+        self.assertEqual(self._scrape().status_code, 401)
+        self.assertEqual(self._scrape(HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+
+    def test_disabled_without_token(self):
+        from django.test import override_settings
+
+        with override_settings(METRICS_AUTH_TOKEN=''):
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+
+class HealthProbeTests(TestCase):
+    """Tests for the /livez and /readyz probes."""
+
+    # The database check covers every configured alias, including the replica.
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        from config.health import reset_readiness_cache
+
+        reset_readiness_cache()
+        self.addCleanup(reset_readiness_cache)
+
+    def test_livez_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/livez')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_readyz_reports_checks_and_caches_result(self):
+        from unittest import mock
+        from django.test import override_settings
+        from config import health
+
+        cache_check = mock.Mock()
+        with override_settings(READINESS_CHECKS=['database', 'cache']), \
+                mock.patch.dict(health.CHECKS, {'cache': cache_check}):
+            first = self.client.get('/readyz')
+            second = self.client.get('/readyz')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(set(first.json()['checks']), {'database', 'cache'})
+        self.assertFalse(first.json()['cached'])
+        self.assertTrue(second.json()['cached'])
+        self.assertEqual(cache_check.call_count, 1)
+
+    def test_readyz_fails_when_a_dependency_is_down(self):
+        from unittest import mock
+        from django.test import override_settings
+        from config import health
+
+        broken = mock.Mock(side_effect=ConnectionError('broker down'))
+        with override_settings(READINESS_CHECKS=['broker']), mock.patch.dict(health.CHECKS, {'broker': broken}):
+            response = self.client.get('/readyz')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks']['broker'], {'ok': False, 'error': 'ConnectionError'})
+
+    def test_hung_check_is_not_started_again(self):
+        import threading
+        from unittest import mock
+        from django.test import override_settings
+        from config import health
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+        hung = mock.Mock(side_effect=lambda: release.wait(5))
+        with override_settings(READINESS_CHECKS=['storage'], READINESS_TIMEOUT=0.05), \
+                mock.patch.dict(health.CHECKS, {'storage': hung}):
+            for _ in range(3):
+                ready, results = health.run_checks()
+                self.assertFalse(ready)
+                self.assertEqual(results['storage'], {'ok': False, 'error': 'timeout'})
+
+        self.assertEqual(hung.call_count, 1)
+
+    def test_probe_connections_carry_timeouts(self):
+        from config.health import probe_database_settings
+
+        probe = probe_database_settings({
+            'ENGINE': 'django.db.backends.postgresql',
+            'OPTIONS': {'pool': {'max_size': 10}, 'options': '-c search_path=app'},
+        }, 2.5)
+
+        self.assertEqual(probe['OPTIONS'], {
+            'connect_timeout': 3,
+            'options': '-c search_path=app -c statement_timeout=2500',
+        })
+
+
+class AdminDashboardContextTests(TestCase):
+    """Tests for the cached, lazy admin dashboard context processor."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from django.test import RequestFactory
+
+        cache.clear()
+        self.admin = User.objects.create_superuser(username='dash', email='dash@example.com', password='pass')
+        self.request = RequestFactory().get('/admin/')
+        self.request.user = self.admin
+        Job.objects.create(title='Dashboard Job', organization_name='Org')
+
+    def _context(self):
+        from config.context_processors import admin_dashboard_context
+
+        return admin_dashboard_context(self.request)
+
+    def test_metrics_are_lazy(self):
+        with self.assertNumQueries(0):
+            self._context()
+
+    def test_metrics_are_shared_until_invalidated(self):
+        self.assertEqual(self._context()['admin_metrics']['total_jobs'], 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._context()['admin_metrics']['total_jobs'], 1)
+
+        Job.objects.create(title='Another Job', organization_name='Org')
+        self.assertEqual(self._context()['admin_metrics']['total_jobs'], 2)
+
+
+class JobAdminChangelistTests(TestCase):
+    """Tests for the JobAdmin changelist click totals."""
+
+    def setUp(self):
+        admin_user = User.objects.create_superuser(username='lister', email='lister@example.com', password='pass')
+        self.client.force_login(admin_user)
+        session = self.client.session
+        session['admin_console_authenticated'] = True
+        session.save()
+
+        self.quiet = Job.objects.create(title='Quiet Job', organization_name='Org')
+        self.popular = Job.objects.create(title='Popular Job', organization_name='Org')
+        ClickAnalytics.objects.create(job=self.popular, click_type='apply', click_count=7)
+        ClickAnalytics.objects.create(job=self.popular, click_type='compose_email', click_count=5)
+
+    def _changelist(self, query=''):
+        response = self.client.get(f'/admin/listings/job/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_click_totals_are_annotated(self):
+        response = self._changelist()
+
+        totals = {job.pk: job.total_clicks for job in response.context['cl'].result_list}
+        self.assertEqual(totals, {self.quiet.pk: 0, self.popular.pk: 12})
+
+    def test_query_count_does_not_grow_with_rows(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self._changelist()  # the first request also stamps the session refresh time
+        with CaptureQueriesContext(connection) as baseline:
+            self._changelist()
+        for index in range(5):
+            job = Job.objects.create(title=f'Extra {index}', organization_name='Org')
+            ClickAnalytics.objects.create(job=job, click_type='apply', click_count=1)
+
+        with self.assertNumQueries(len(baseline)):
+            self._changelist()
+
+    def test_sortable_by_total_clicks(self):
+        # The changelist prepends the action checkbox, so its columns are
+        # numbered from its own list_display rather than JobAdmin's.
+        column = self._changelist().context['cl'].list_display.index('total_clicks_display')
+
+        for direction, first in (('', self.quiet), ('-', self.popular)):
+            response = self._changelist(f'?o={direction}{column}')
+            cl = response.context['cl']
+            self.assertEqual(cl.get_ordering_field_columns(), {column: 'desc' if direction else 'asc'})
+            self.assertEqual(cl.get_ordering(response.wsgi_request, cl.queryset)[0], f'{direction}total_clicks')
+            self.assertEqual(cl.result_list[0], first)
+
+
+class AsyncReadPathTests(TestCase):
+    """The async read views return the same payloads as the DRF views."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from .models import Partner
+
+        cache.clear()
+        self.job = Job.objects.create(
+            title='Async Job', organization_name='Async Org', category='scholarship',
+            deadline=timezone.now() + timedelta(days=5),
+        )
+        Job.objects.create(title='Other Job', organization_name='Async Org', category='job')
+        Partner.objects.create(name='Async Org')
+        Event.objects.create(title='Async Event', start_time=timezone.now() + timedelta(days=1))
+
+    async def _async_get(self, view, path, **kwargs):
+        from django.test import AsyncRequestFactory
+
+        response = await view(AsyncRequestFactory().get(path), **kwargs)
+        return response.status_code, self._without_injected_disclaimer(json.loads(response.content))
+
+    def _sync_get(self, path):
+        response = self.client.get(path)
+        return response.status_code, self._without_injected_disclaimer(response.json())
+
+    def _without_injected_disclaimer(self, payload):
+        # DisclaimerMiddleware adds it to every response; views are called directly here.
+        payload.pop('disclaimer', None)
+        return payload
+
+    async def test_job_list_matches_sync_view(self):
+        from asgiref.sync import sync_to_async
+        from .async_views import job_list
+
+        for path in ['/api/opportunities/', '/api/opportunities/?category=scholarship&ordering=-created_at']:
+            expected = await sync_to_async(self._sync_get)(path)
+            self.assertEqual(await self._async_get(job_list, path), expected)
+
+    async def test_job_list_rejects_invalid_filters_and_pages(self):
+        from .async_views import job_list
+
+        status_code, _ = await self._async_get(job_list, '/api/opportunities/?page=9')
+        self.assertEqual(status_code, 404)
+
+    async def test_detail_events_counts_and_partners_match_sync_views(self):
+        from asgiref.sync import sync_to_async
+        from .async_views import category_counts, event_list, job_detail_by_slug, partner_list
+
+        cases = [
+            (job_detail_by_slug, f'/api/opportunities/by-slug/{self.job.slug}/', {'slug': self.job.slug}),
+            (job_detail_by_slug, '/api/opportunities/by-slug/missing/', {'slug': 'missing'}),
+            (event_list, '/api/events/', {}),
+            (category_counts, '/api/category-counts/', {}),
+            (partner_list, '/api/partners/', {}),
+        ]
+        for view, path, kwargs in cases:
+            expected = await sync_to_async(self._sync_get)(path)
+            self.assertEqual(await self._async_get(view, path, **kwargs), expected, path)
+
+    async def test_partner_cache_key_ignores_unread_params(self):
+        from django.core.cache import cache
+        from django.test import AsyncRequestFactory
+        from .async_views import partner_list
+
+        factory = AsyncRequestFactory()
+        first = await partner_list(factory.get('/api/partners/?utm=a&page=1'))
+        second = await partner_list(factory.get('/api/partners/?utm=b'))
+        invalid = await partner_list(factory.get('/api/partners/?page=9'))
+
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(invalid.status_code, 404)
+        self.assertIsNotNone(await cache.aget('public_read:partners:http://testserver/api/partners/'))
+        self.assertIsNone(await cache.aget('public_read:partners:http://testserver/api/partners/?page=9'))
+
+    async def test_read_path_sends_writes_to_drf_view(self):
+        from django.test import AsyncRequestFactory, override_settings
+        from .async_views import partner_list, read_path
+        from .views import PartnerListView
+
+        with override_settings(ASYNC_READ_VIEWS=True):
+            view = read_path(PartnerListView, partner_list)
+        response = await view(AsyncRequestFactory().post('/api/partners/', {'name': 'New'}))
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ReplicaRoutingTests(TestCase):
+    """Read-only views read from the replica; writes and pinned clients use the primary."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        from django.test import override_settings
+
+        self.primary_job = Job.objects.create(title='Primary Job', organization_name='Org')
+        self.replica_job = Job.objects.using('replica').create(title='Replica Job', organization_name='Org')
+        replica_on = override_settings(DATABASE_READ_REPLICA='replica')
+        replica_on.enable()
+        self.addCleanup(replica_on.disable)
+
+    def _listed_titles(self):
+        response = self.client.get('/api/opportunities/')
+        self.assertEqual(response.status_code, 200)
+        return [job['title'] for job in response.json()['results']]
+
+    def test_listing_reads_from_replica(self):
+        self.assertEqual(self._listed_titles(), ['Replica Job'])
+
+    def test_reads_outside_wrapped_views_use_primary(self):
+        self.assertEqual(list(Job.objects.values_list('title', flat=True)), ['Primary Job'])
+
+    def test_writes_go_to_primary_inside_replica_reads(self):
+        from config.db_routing import reads_from_replica
+
+        with reads_from_replica():
+            job = Job.objects.get(pk=self.replica_job.pk)
+            job.title = 'Edited'
+            job.save()
+
+        self.assertEqual(job._state.db, 'default')
+        self.assertTrue(Job.objects.using('default').filter(title='Edited').exists())
+        self.assertEqual(Job.objects.using('replica').get(pk=self.replica_job.pk).title, 'Replica Job')
+
+    def test_successful_write_pins_client_to_primary(self):
+        from django.conf import settings
+
+        response = self.client.post(
+            '/api/track-click/', {'job_id': self.primary_job.pk, 'click_type': 'apply'}, content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies[settings.REPLICA_PIN_COOKIE]['max-age'], settings.REPLICA_PIN_SECONDS)
+        self.assertEqual(self._listed_titles(), ['Primary Job'])
+
+    def test_no_pin_without_replica(self):
+        from django.conf import settings
+        from django.test import override_settings
+
+        with override_settings(DATABASE_READ_REPLICA=None):
+            response = self.client.post(
+                '/api/track-click/', {'job_id': self.primary_job.pk, 'click_type': 'apply'}, content_type='application/json'
+            )
+            titles = self._listed_titles()
+
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        self.assertEqual(titles, ['Primary Job'])
+
+
+class SyntheticCatalogTests(TestCase):
+    """The synthetic catalog used by the benchmarks is deterministic and well-formed."""
+
+    def test_same_seed_generates_same_rows(self):
+        import random
+        from .synthetic import ORGANIZATIONS, generate_jobs
+
+        def titles(seed):
+            return [job.title for job in generate_jobs(random.Random(seed), 25, ORGANIZATIONS)]
+
+        self.assertEqual(titles(3), titles(3))
+        self.assertNotEqual(titles(3), titles(4))
+
+    def test_seed_catalog_inserts_related_rows(self):
+        from .models import Partner, Subscription
+        from .synthetic import seed_catalog
+
+        counts = seed_catalog(40, partners=5, events=4, subscriptions=3, seed=1, batch_size=7)
+
+        self.assertEqual(
+            {name: counts[name] for name in ('jobs', 'partners', 'events', 'subscriptions')},
+            {'jobs': 40, 'partners': 5, 'events': 4, 'subscriptions': 3},
+        )
+        self.assertEqual(ClickAnalytics.objects.count(), counts['clicks'])
+        self.assertEqual(Partner.objects.count(), 5)
+        self.assertEqual(Subscription.objects.count(), 3)
+        # Explicit timestamps survive bulk_create instead of all being "now".
+        self.assertGreater(Job.objects.dates('created_at', 'day').count(), 1)
+        self.assertEqual(Job.objects.filter(slug__isnull=True).count(), 0)
+
+
+class SeedSyntheticCommandTests(TestCase):
+    """seed_synthetic writes every model into the chosen database alias."""
+
+    databases = {'default', 'replica'}
+
+    def test_seeds_selected_database_only(self):
+        from django.core.management.base import CommandError
+        from .models import Partner, Subscription
+
+        out = StringIO()
+        call_command(
+            'seed_synthetic', jobs=12, partners=3, events=2, subscribers=4, users=5,
+            database='replica', batch_size=5, stdout=out,
+        )
+
+        self.assertEqual(Job.objects.using('replica').count(), 12)
+        self.assertEqual(Partner.objects.using('replica').count(), 3)
+        self.assertEqual(Event.objects.using('replica').count(), 2)
+        self.assertEqual(Subscription.objects.using('replica').count(), 4)
+        self.assertEqual(User.objects.using('replica').count(), 5)
+        self.assertTrue(ClickAnalytics.objects.using('replica').exists())
+        self.assertTrue(User.objects.using('replica').first().has_usable_password())
+        self.assertFalse(Job.objects.exists())
+        self.assertIn("into 'replica'", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('seed_synthetic', jobs=1, database='replica', stdout=StringIO())
+
+
+class SlidingSessionTests(TestCase):
+    """Sessions slide their expiry without a database write on every request."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', email='reader@example.com', password='x')
+        self.client.force_login(self.user)
+
+    def _session_writes(self, path='/api/auth/me/'):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return [
+            query['sql'] for query in queries.captured_queries
+            if 'django_session' in query['sql'] and query['sql'].startswith(('UPDATE', 'INSERT'))
+        ]
+
+    def test_session_written_only_when_refresh_is_due(self):
+        import time
+        from unittest import mock
+        from django.conf import settings
+
+        # Logging in stamped the refresh time, so the first request doesn't write either.
+        self.assertEqual(self._session_writes(), [])
+        self.assertEqual(self._session_writes(), [])
+        self.assertEqual(self._session_writes(), [])
+
+        later = time.time() + settings.SESSION_COOKIE_AGE * settings.SESSION_REFRESH_FRACTION + 1
+        with mock.patch('config.middleware.time.time', return_value=later):
+            self.assertTrue(self._session_writes())
+
+    def test_unknown_session_cookie_does_not_create_a_session(self):
+        from django.conf import settings
+        from django.contrib.sessions.models import Session
+
+        self.client.logout()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'not-a-real-session-key'
+
+        self.assertEqual(self._session_writes('/api/category-counts/'), [])
+        self.assertFalse(Session.objects.exists())
+
+    def test_signed_cookie_engine_refreshes_cookie_instead(self):
+        from django.conf import settings
+        from django.test import override_settings
+
+        import time
+        from unittest import mock
+
+        later = time.time() + settings.SESSION_COOKIE_AGE * settings.SESSION_REFRESH_FRACTION + 1
+        with override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'):
+            self.client.force_login(self.user)
+            fresh = self.client.get('/api/auth/me/')
+            with mock.patch('config.middleware.time.time', return_value=later):
+                due = self.client.get('/api/auth/me/')
+
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, fresh.cookies)
+        self.assertIn(settings.SESSION_COOKIE_NAME, due.cookies)
+
+
+class RateLimitTests(TestCase):
+    """Public write endpoints answer 429 from a token bucket before touching the database."""
+
+    def setUp(self):
+        from config import ratelimit
+
+        self.job = Job.objects.create(title='Rate Limited Job', organization_name='Test Org')
+        ratelimit.local_buckets.clear()
+        self.addCleanup(ratelimit.local_buckets.clear)
+        self.addCleanup(ratelimit._redis_buckets.clear)
+
+    def _limits(self, **rates):
+        from django.test import override_settings
+
+        return override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMIT_REDIS_URL='', RATE_LIMITS=rates)
+
+    def _click(self, address):
+        return self.client.post(
+            '/api/track-click/',
+            {'job_id': self.job.id, 'click_type': 'apply'},
+            content_type='application/json',
+            REMOTE_ADDR=address,
+        )
+
+    def test_rejects_with_429_without_queries(self):
+        with self._limits(subscribe='2/min'):
+            for index in range(2):
+                response = self.client.post(
+                    '/api/subscriptions/', {'email': f'rate{index}@example.com'}, content_type='application/json',
+                )
+                self.assertLess(response.status_code, 400)
+            with self.assertNumQueries(0):
+                response = self.client.post(
+                    '/api/subscriptions/', {'email': 'rate3@example.com'}, content_type='application/json',
+                )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_buckets_are_per_address_and_ipv6_network(self):
+        with self._limits(**{'track-click': '1/min'}):
+            self.assertEqual(self._click('203.0.113.5').status_code, 200)
+            self.assertEqual(self._click('203.0.113.5').status_code, 429)
+            self.assertEqual(self._click('203.0.113.6').status_code, 200)
+            self.assertEqual(self._click('2001:db8::1').status_code, 200)
+            self.assertEqual(self._click('2001:db8::2').status_code, 429)
+
+    def test_buckets_are_per_client_behind_a_proxy(self):
+        from django.test import override_settings
+
+        def click(forwarded_for):
+            return self.client.post(
+                '/api/track-click/',
+                {'job_id': self.job.id, 'click_type': 'apply'},
+                content_type='application/json',
+                REMOTE_ADDR='10.0.0.1',
+                HTTP_X_FORWARDED_FOR=forwarded_for,
+            )
+
+        with self._limits(**{'track-click': '1/min'}), override_settings(RATE_LIMIT_TRUSTED_PROXIES=1):
+            self.assertEqual(click('203.0.113.5').status_code, 200)
+            self.assertEqual(click('203.0.113.6').status_code, 200)
+            self.assertEqual(click('203.0.113.5').status_code, 429)
+            # A client-supplied X-Forwarded-For entry is not trusted; the proxy's entry is.
+            self.assertEqual(click('198.51.100.1, 203.0.113.6').status_code, 429)
+
+    def test_bucket_refills_over_time(self):
+        import time
+        from unittest import mock
+
+        with self._limits(**{'track-click': '1/min'}):
+            self.assertEqual(self._click('203.0.113.5').status_code, 200)
+            self.assertEqual(self._click('203.0.113.5').status_code, 429)
+            with mock.patch('config.ratelimit.time.time', return_value=time.time() + 61):
+                self.assertEqual(self._click('203.0.113.5').status_code, 200)
+
+    def test_falls_back_to_local_buckets_when_redis_is_unreachable(self):
+        from django.test import override_settings
+
+        with self._limits(login='1/min'), override_settings(RATE_LIMIT_REDIS_URL='redis://127.0.0.1:1/0'), \
+                self.assertLogs('config.ratelimit', 'WARNING'):
+            first = self.client.post('/api/auth/login/', {'username': 'a', 'password': 'b'})
+            second = self.client.post('/api/auth/login/', {'username': 'a', 'password': 'b'})
+
+        self.assertEqual(first.status_code, 401)
+        self.assertEqual(second.status_code, 429)
+
+    def test_parse_rate(self):
+        from config.ratelimit import parse_rate
+
+        self.assertEqual(parse_rate('10/min'), (10, 10 / 60))
+        self.assertEqual(parse_rate('5/hour'), (5, 5 / 3600))
+        with self.assertRaises(ValueError):
+            parse_rate('ten/min')
+
+
+class ClickDeduplicationTests(TestCase):
+    """Repeat clicks from one visitor count once per job, click type and day."""
+
+    def setUp(self):
+        from .clicks import local_filters
+
+        self.job = Job.objects.create(title='Dedup Job', organization_name='Test Org')
+        local_filters.clear()
+        self.addCleanup(local_filters.clear)
+
+    def _click(self, user_agent='Browser A', address='198.51.100.7'):
+        return self.client.post(
+            '/api/track-click/',
+            {'job_id': self.job.id, 'click_type': 'apply'},
+            content_type='application/json',
+            REMOTE_ADDR=address,
+            HTTP_USER_AGENT=user_agent,
+        )
+
+    def test_repeat_clicks_count_once_per_visitor(self):
+        self._click()
+        self._click()
+        self._click(user_agent='Browser B')
+        response = self._click(address='198.51.100.8')
+
+        self.assertEqual(response.data['click_count'], 4)
+        self.assertEqual(response.data['unique_count'], 3)
+
+    def test_unknown_job_does_not_allocate_a_filter(self):
+        from .clicks import local_filters
+
+        response = self.client.post(
+            '/api/track-click/', {'job_id': self.job.id + 1000, 'click_type': 'apply'}, content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(local_filters.filters, {})
+
+    def test_filters_rotate_daily(self):
+        from unittest import mock
+
+        self._click()
+        tomorrow = timezone.now() + timedelta(days=1)
+        with mock.patch('listings.clicks.timezone.now', return_value=tomorrow):
+            response = self._click()
+
+        self.assertEqual(response.data['unique_count'], 2)
+
+    def test_false_positive_rate_stays_low_at_expected_load(self):
+        import os
+        from .clicks import LocalFilters, bit_positions
+
+        filters = LocalFilters()
+        for _ in range(500):
+            filters.add('day', 'key', bit_positions(os.urandom(32), 8192, 4), 8192)
+        bitmap = filters.filters['key']
+
+        def seen(positions):
+            return all(bitmap[position >> 3] & (1 << (position & 7)) for position in positions)
+
+        false_positives = sum(seen(bit_positions(os.urandom(32), 8192, 4)) for _ in range(5000))
+        # About 0.2% expected.
+        self.assertLess(false_positives, 5000 * 0.01)
+
+    def test_analytics_overview_reports_unique_clicks(self):
+        from django.test import override_settings
+
+        self._click()
+        self._click()
+        admin = User.objects.create_user(
+            username='clickadmin', email='clickadmin@example.com', password='x', is_staff=True, is_superuser=True,
+        )
+        self.client.force_login(admin)
+        session = self.client.session
+        session['admin_console_authenticated'] = True
+        session.save()
+
+        with override_settings(DATABASE_READ_REPLICA=None):
+            data = self.client.get('/api/analytics/').json()
+
+        self.assertEqual((data['total_clicks'], data['unique_clicks']), (2, 1))
+        self.assertEqual(data['top_clicked'][0]['unique_clicks'], 1)
+
+
+class TrendingOpportunitiesTests(TestCase):
+    """Trending scores decay clicks exponentially and are served from one index read."""
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.old = Job.objects.create(title='Old Favourite', organization_name='Org A')
+        self.new = Job.objects.create(title='Rising Star', organization_name='Org B')
+        self.quiet = Job.objects.create(title='Quiet Listing', organization_name='Org C')
+
+    def _clicks(self, job, count):
+        analytics, _ = ClickAnalytics.objects.get_or_create(job=job, click_type='apply')
+        ClickAnalytics.objects.filter(pk=analytics.pk).update(
+            click_count=analytics.click_count + count, last_clicked_at=timezone.now()
+        )
+
+    def _recompute(self, hours_later=0):
+        from .trending import recompute_trending_scores
+
+        return recompute_trending_scores(now=self.now + timedelta(hours=hours_later))
+
+    def _trending(self):
+        from django.test import override_settings
+
+        with override_settings(DATABASE_READ_REPLICA=None):
+            response = self.client.get('/api/opportunities/trending/')
+        self.assertEqual(response.status_code, 200)
+        return [job['title'] for job in response.json()['results']]
+
+    def test_recent_clicks_outrank_older_ones(self):
+        self._clicks(self.old, 40)
+        self._recompute()
+        self._clicks(self.new, 15)
+        self._recompute(hours_later=48)
+
+        self.old.refresh_from_db()
+        self.new.refresh_from_db()
+        self.assertAlmostEqual(self.old.trending_score, 10.0)
+        self.assertAlmostEqual(self.new.trending_score, 15.0)
+        self.assertEqual(self._trending(), ['Rising Star', 'Old Favourite'])
+
+    def test_clicks_before_trending_existed_are_not_counted(self):
+        import importlib
+
+        from django.apps import apps
+
+        migration = importlib.import_module('listings.migrations.0023_seed_trending_clicks')
+        self._clicks(self.old, 10000)
+        migration.seed_trending_clicks(apps, None)
+        self._clicks(self.new, 3)
+        self._recompute()
+
+        self.old.refresh_from_db()
+        self.assertEqual(self.old.trending_score, 0.0)
+        self.assertEqual(self.old.trending_clicks, 10000)
+        self.assertEqual(self._trending(), ['Rising Star'])
+
+    def test_only_new_clicks_are_added(self):
+        self._clicks(self.new, 5)
+        self._recompute()
+        self._recompute()
+        self._clicks(self.new, 2)
+        self._recompute()
+
+        self.new.refresh_from_db()
+        self.assertAlmostEqual(self.new.trending_score, 7.0)
+        self.assertEqual(self.new.trending_clicks, 7)
+
+    def test_scores_fade_out_and_inactive_jobs_are_hidden(self):
+        self._clicks(self.old, 1)
+        self._clicks(self.new, 3)
+        self._recompute()
+        Job.objects.filter(pk=self.new.pk).update(is_active=False)
+        self.assertEqual(self._trending(), ['Old Favourite'])
+
+        self._recompute(hours_later=24 * 30)
+        self.assertEqual(self._trending(), [])
+
+    def test_only_clicked_or_decaying_jobs_are_rescored(self):
+        from .trending import rescore_candidates
+
+        self._clicks(self.old, 1)
+        self._clicks(self.new, 3)
+        self._recompute()
+        # Long enough for the old score to fade out, while the new job is clicked again.
+        ClickAnalytics.objects.filter(job=self.old).update(last_clicked_at=self.now - timedelta(days=1))
+        self._recompute(hours_later=24 * 30)
+        self._clicks(self.new, 1)
+        ClickAnalytics.objects.filter(job=self.new).update(last_clicked_at=self.now + timedelta(days=31))
+
+        self.assertEqual(list(rescore_candidates().values_list('pk', flat=True)), [self.new.pk])
+        with self.assertNumQueries(1):
+            candidates = list(rescore_candidates())
+        self.assertEqual(candidates[0].click_total, 4)
+        self.assertNotIn(' IN (', str(rescore_candidates().query))
+
+    def test_full_save_reinserts_a_deleted_row(self):
+        job = Job.objects.get(pk=self.new.pk)
+        Job.objects.filter(pk=job.pk).delete()
+
+        job.save()
+
+        self.assertTrue(Job.objects.filter(pk=job.pk, title='Rising Star').exists())
+
+    def test_full_save_keeps_recomputed_score(self):
+        stale = Job.objects.get(pk=self.new.pk)
+        self._clicks(self.new, 4)
+        self._recompute()
+
+        stale.title = 'Rising Star (edited)'
+        stale.save()
+
+        self.new.refresh_from_db()
+        self.assertEqual(self.new.title, 'Rising Star (edited)')
+        self.assertAlmostEqual(self.new.trending_score, 4.0)
+
+    def test_trending_query_uses_partial_index(self):
+        from django.db import connection
+        from .trending import trending_jobs
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        self.assertIn('job_trending_idx', trending_jobs(10).explain())
+
+
+class SimilarOpportunitiesTests(TestCase):
+    """Similar-opportunity lists come from TF-IDF vectors and refresh incrementally on save."""
+
+    def _job(self, title, description, **fields):
+        fields.setdefault('organization_name', 'Org')
+        with self.captureOnCommitCallbacks(execute=True):
+            return Job.objects.create(title=title, description=description, **fields)
+
+    def _similar(self, job):
+        job.refresh_from_db()
+        return job.similar_job_ids
+
+    def setUp(self):
+        from .similarity import clear_cache
+
+        clear_cache()
+        self.addCleanup(clear_cache)
+        self.python = self._job(
+            'Python backend developer', 'Build Django APIs and Python services for refugee programmes.',
+            category='job', location='kenya',
+        )
+        self.django = self._job(
+            'Junior Django developer', 'Python and Django web development internship with mentoring.',
+            category='internship', location='kenya',
+        )
+        self.nursing = self._job(
+            'Nursing scholarship', 'Fully funded nursing degree scholarship for young women.',
+            category='scholarship', funding_type='fully',
+        )
+
+    def test_similar_lists_update_when_jobs_are_saved(self):
+        self.assertEqual(self._similar(self.python), [self.django.pk])
+        self.assertEqual(self._similar(self.django), [self.python.pk])
+        self.assertEqual(self._similar(self.nursing), [])
+
+        medicine = self._job(
+            'Medicine scholarship', 'Fully funded medicine and nursing degree scholarship.',
+            category='scholarship', funding_type='fully',
+        )
+        self.assertEqual(self._similar(self.nursing), [medicine.pk])
+        self.assertEqual(self._similar(medicine), [self.nursing.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            medicine.is_active = False
+            medicine.save()
+        self.assertEqual(self._similar(self.nursing), [])
+        self.assertEqual(self._similar(medicine), [])
+
+    def test_updates_reuse_the_cached_index(self):
+        from unittest import mock
+
+        from . import similarity
+
+        with mock.patch.object(similarity, 'SimilarityIndex', wraps=similarity.SimilarityIndex) as build:
+            nursing = Job.objects.get(pk=self.nursing.pk)
+            with self.captureOnCommitCallbacks(execute=True):
+                nursing.title = 'Python data developer'
+                nursing.description = 'Python and Django services for data programmes.'
+                nursing.category = 'job'
+                nursing.location = 'kenya'
+                nursing.save()
+
+        build.assert_not_called()
+        self.assertIn(self.nursing.pk, self._similar(self.python))
+
+    def test_saves_without_source_changes_do_not_refresh(self):
+        from unittest import mock
+
+        job = Job.objects.get(pk=self.python.pk)
+        with mock.patch('listings.signals.schedule_similarity_update') as schedule:
+            job.is_featured = not job.is_featured
+            job.save()
+            job.save(update_fields=['title'])
+            schedule.assert_not_called()
+
+            job.description = 'Now about nursing.'
+            job.save()
+            schedule.assert_called_once_with(job.pk)
+
+    def test_deleted_job_leaves_similar_lists(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.django.delete()
+        self.assertEqual(self._similar(self.python), [])
+
+    def test_bulk_delete_dispatches_one_update(self):
+        from unittest import mock
+
+        from . import similarity
+
+        with mock.patch.object(similarity, 'update_jobs') as update, \
+                mock.patch.object(similarity, 'rebuild_all') as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                Job.objects.filter(pk__in=[self.django.pk, self.nursing.pk]).delete()
+            update.assert_called_once_with(sorted([self.django.pk, self.nursing.pk]))
+
+            with mock.patch.object(similarity, 'REBUILD_THRESHOLD', 0):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.python.delete()
+            rebuild.assert_called_once_with()
+        self.assertEqual(update.call_count, 1)
+
+    def test_unreachable_broker_skips_the_update(self):
+        from unittest import mock
+
+        from django.test import override_settings
+
+        from . import similarity
+
+        with override_settings(SIMILAR_JOBS_ASYNC=True), \
+                mock.patch('listings.tasks.update_similar_jobs.delay', side_effect=ConnectionError), \
+                mock.patch.object(similarity, 'update_jobs') as update, \
+                self.assertLogs('listings.similarity', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.django.delete()
+
+        update.assert_not_called()
+
+    def test_rebuild_matches_incremental_lists(self):
+        from .similarity import rebuild_all
+
+        Job.objects.update(similar_job_ids=[])
+        rebuild_all()
+        self.assertEqual(self._similar(self.python), [self.django.pk])
+        self.assertEqual(self._similar(self.nursing), [])
+
+    def test_similar_endpoint(self):
+        from django.test import override_settings
+
+        with override_settings(DATABASE_READ_REPLICA=None):
+            response = self.client.get(f'/api/opportunities/{self.python.pk}/similar/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job['id'] for job in response.json()['results']], [self.django.pk])
+
+
+class SubscriberDigestTests(TestCase):
+    """Digests follow subscriber preferences and are matched per distinct preference set."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            title='Field Officer', organization_name='Org', category='job', location='kenya',
+            required_documents=['alien_card'], is_active=True,
+        )
+        self.scholarship = Job.objects.create(
+            title='Nursing Scholarship', organization_name='Org', category='scholarship', location='uganda',
+            is_active=True,
+        )
+        self.internship = Job.objects.create(
+            title='Data Internship', organization_name='Org', category='internship', location='kenya',
+            required_documents=['passport'], is_active=True,
+        )
+
+    def _subscriber(self, email, **preferences):
+        return Subscription.objects.create(email=email, is_active=True, **preferences)
+
+    def test_digest_matches_preferences_and_renders_each_job_set_once(self):
+        from unittest import mock
+
+        from django.core import mail
+
+        from . import digests
+
+        everything = self._subscriber('all@example.com')
+        officer = self._subscriber('officer@example.com', categories=['job'], documents=['alien_card'])
+        officer_twin = self._subscriber('twin@example.com', documents=['alien_card', 'alien_card'], categories=['job'])
+        nothing = self._subscriber('ctd@example.com', locations=['kenya'], documents=['ctd'])
+        self.assertEqual(officer.preference_key, officer_twin.preference_key)
+
+        with mock.patch.object(digests, 'render_digest', wraps=digests.render_digest) as render:
+            with self.assertNumQueries(3):
+                sent = digests.send_digests()
+
+        self.assertEqual(sent, 3)
+        self.assertEqual(render.call_count, 2)
+        by_email = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(set(by_email), {everything.email, officer.email, officer_twin.email})
+        self.assertIn('(3 new)', by_email[everything.email].subject)
+        self.assertIn('(1 new)', by_email[officer.email].subject)
+        self.assertIn('Field Officer', by_email[officer.email].body)
+        self.assertNotIn('Nursing Scholarship', by_email[officer.email].body)
+        self.assertIn(str(officer_twin.confirmation_token), by_email[officer_twin.email].body)
+        self.assertNotIn(str(officer.confirmation_token), by_email[officer_twin.email].body)
+        self.assertNotIn(digests.TOKEN_PLACEHOLDER, by_email[officer.email].alternatives[0][0])
+
+        nothing.refresh_from_db()
+        self.assertIsNotNone(nothing.last_notified_at)
+
+    def test_any_valid_id_matches_holders_of_any_id_document(self):
+        from .digests import PreferenceIndex
+
+        passport, national_id, permit = ((), (), ('passport',)), ((), (), ('national_id',)), ((), (), ('work_permit',))
+        index = PreferenceIndex([passport, national_id, permit])
+        job = Job(category='job', location='kenya', required_documents=['any_id'])
+
+        self.assertEqual({index.sets[number] for number in index.matches(job)}, {passport, national_id})
+
+    def test_not_specified_documents_match_every_holder(self):
+        from .digests import PreferenceIndex
+
+        holders = [((), (), ('alien_card',)), ((), (), ('ctd', 'passport'))]
+        index = PreferenceIndex(holders)
+
+        for documents in (['not_specified'], []):
+            job = Job(category='job', location='kenya', required_documents=documents)
+            self.assertEqual(index.matches(job), {0, 1})
+
+    def test_digest_only_includes_jobs_since_last_notification(self):
+        from django.core import mail
+
+        from .tasks import send_new_opportunity_notifications
+
+        now = timezone.now()
+        Job.objects.filter(pk=self.job.pk).update(created_at=now - timedelta(hours=3))
+        self._subscriber('recent@example.com', last_notified_at=now - timedelta(hours=1))
+
+        send_new_opportunity_notifications()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('(2 new)', mail.outbox[0].subject)
+        self.assertNotIn('Field Officer', mail.outbox[0].body)
+
+        mail.outbox = []
+        send_new_opportunity_notifications()
+        self.assertEqual(mail.outbox, [])
+
+    def test_immediate_notification_respects_preferences(self):
+        from django.core import mail
+
+        from .tasks import send_immediate_opportunity_notification
+
+        self._subscriber('kenya@example.com', locations=['kenya'])
+        self._subscriber('uganda@example.com', locations=['uganda'])
+
+        send_immediate_opportunity_notification(self.scholarship.pk)
+
+        self.assertEqual([message.to for message in mail.outbox], [['uganda@example.com']])
+
+    def test_signed_up_users_are_synced_in_batches(self):
+        from .tasks import _sync_signed_up_users_to_subscribers
+
+        User.objects.create_user(username='new', email='New@Example.com', password='x')
+        User.objects.create_user(username='lapsed', email='lapsed@example.com', password='x')
+        User.objects.create_user(username='quiet', email='quiet@example.com', password='x', email_notifications=False)
+        # Queryset writes skip the post_save receiver that normally keeps these in step.
+        Subscription.objects.filter(email='new@example.com').delete()
+        Subscription.objects.filter(email__in=['lapsed@example.com', 'quiet@example.com']).update(
+            is_active=False, confirmed_at=None
+        )
+
+        _sync_signed_up_users_to_subscribers()
+
+        subscriptions = {sub.email: sub for sub in Subscription.objects.all()}
+        for email in ('new@example.com', 'lapsed@example.com'):
+            self.assertTrue(subscriptions[email].is_active)
+            self.assertIsNotNone(subscriptions[email].confirmed_at)
+        self.assertFalse(subscriptions['quiet@example.com'].is_active)
+
+    def test_preferences_are_set_on_subscribe_and_edited_by_token(self):
+        import uuid
+
+        response = self.client.post(
+            '/api/subscriptions/',
+            {'email': 'prefs@example.com', 'categories': ['scholarship', 'job', 'job']},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        subscription = Subscription.objects.get(email='prefs@example.com')
+        self.assertEqual(subscription.categories, ['job', 'scholarship'])
+
+        url = f'/api/subscriptions/preferences/{subscription.confirmation_token}/'
+        response = self.client.patch(url, {'locations': ['kenya'], 'documents': ['ctd']}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['email'], 'prefs@example.com')
+        self.assertEqual(
+            [data['categories'], data['locations'], data['documents']], [['job', 'scholarship'], ['kenya'], ['ctd']]
+        )
+
+        response = self.client.patch(url, {'locations': ['atlantis']}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f'/api/subscriptions/preferences/{uuid.uuid4()}/').status_code, 404)
+
+
 class ConsolidateOpportunitiesCommandTests(TestCase):
     """Tests for the consolidate_opportunities management command."""
 
@@ -800,3 +2264,249 @@ class ConsolidateOpportunitiesCommandTests(TestCase):
         self.assertTrue(self.staff_user.is_staff)
         self.assertEqual(self.job_a.created_by_id, original_owner_ids[self.job_a.id])
         self.assertEqual(self.job_b.created_by_id, original_owner_ids[self.job_b.id])
+
+
+class RawDataParserTests(TestCase):
+    """Tests for the WhatsApp raw_data parser and auto-fill."""
+
+    MESSAGE = (
+        "*VACANCY* UNHCR is hiring an Office Assistant in Kakuma.\n"
+        "Requirements: Alien Card or CTD.\n"
+        "Stipend: KES 15,000 - 20,000 per month.\n"
+        "Deadline: 15th March 2026\n"
+        "Apply: https://forms.office.com/r/abc123. Queries: jobs@example.org"
+    )
+
+    def test_parse_raw_data_extracts_fields(self):
+        from decimal import Decimal
+        from .raw_data import parse_raw_data
+
+        parsed = parse_raw_data(self.MESSAGE)
+
+        self.assertEqual(parsed['category'], 'job')
+        self.assertEqual(parsed['location'], 'kenya')
+        self.assertEqual(parsed['city'], 'Kakuma')
+        self.assertEqual(parsed['required_documents'], ['alien_card', 'ctd'])
+        self.assertEqual(parsed['external_url'], 'https://forms.office.com/r/abc123')
+        self.assertEqual(parsed['application_email'], 'jobs@example.org')
+        self.assertEqual(parsed['application_type'], 'link')
+        self.assertEqual(parsed['stipend_min'], Decimal('15000'))
+        self.assertEqual(parsed['stipend_max'], Decimal('20000'))
+        self.assertTrue(parsed['is_paid'])
+        deadline = timezone.localtime(parsed['deadline'])
+        self.assertEqual((deadline.year, deadline.month, deadline.day), (2026, 3, 15))
+
+    def test_parse_raw_data_ignores_dates_without_deadline_keyword(self):
+        from .raw_data import parse_raw_data
+
+        parsed = parse_raw_data("Orientation on 12/05/2026 for selected scholarship applicants.")
+
+        self.assertNotIn('deadline', parsed)
+        self.assertEqual(parsed['category'], 'scholarship')
+
+    def test_autofill_keeps_existing_values(self):
+        from .raw_data import autofill_job
+
+        job = Job(
+            title='Office Assistant',
+            organization_name='UNHCR',
+            city='Nairobi',
+            raw_data=self.MESSAGE,
+        )
+
+        changed = autofill_job(job)
+
+        self.assertEqual(job.city, 'Nairobi')
+        self.assertNotIn('city', changed)
+        self.assertIn('required_documents', changed)
+        self.assertEqual(job.location, 'kenya')
+
+    def test_autofill_command_updates_existing_rows(self):
+        job = Job.objects.create(
+            title='Office Assistant',
+            organization_name='UNHCR',
+            raw_data=self.MESSAGE,
+        )
+        untouched = Job.objects.create(title='No Raw Data', organization_name='Org')
+
+        call_command('autofill_raw_data', stdout=StringIO())
+
+        job.refresh_from_db()
+        untouched.refresh_from_db()
+        self.assertEqual(job.city, 'Kakuma')
+        self.assertEqual(job.required_documents, ['alien_card', 'ctd'])
+        self.assertIsNotNone(job.deadline)
+        self.assertEqual(untouched.required_documents, [])
+
+    def test_autofill_keeps_chosen_defaulted_fields(self):
+        from .raw_data import autofill_job
+
+        job = Job(
+            title='Office Assistant',
+            organization_name='UNHCR',
+            category='job',
+            application_type='email',
+            raw_data=self.MESSAGE.replace('*VACANCY*', '*SCHOLARSHIP*'),
+        )
+
+        changed = autofill_job(job)
+
+        self.assertEqual((job.category, job.application_type), ('job', 'email'))
+        self.assertNotIn('category', changed)
+        self.assertNotIn('application_type', changed)
+
+    def test_admin_overwrite_action_fills_defaulted_fields(self):
+        admin_user = User.objects.create_superuser(username='filler', email='filler@example.com', password='pass')
+        self.client.force_login(admin_user)
+        session = self.client.session
+        session['admin_console_authenticated'] = True
+        session.save()
+        job = Job.objects.create(
+            title='Nursing Scholarship', organization_name='Org',
+            raw_data='Fully funded scholarship for nursing students. Apply by email: apply@example.org',
+        )
+        self.assertEqual((job.category, job.application_type), ('job', 'link'))
+
+        for action, category in (('autofill_from_raw_data', 'job'), ('autofill_from_raw_data_overwrite', 'scholarship')):
+            response = self.client.post(
+                '/admin/listings/job/', {'action': action, '_selected_action': [job.pk]},
+            )
+            self.assertEqual(response.status_code, 302)
+            job.refresh_from_db()
+            self.assertEqual(job.category, category)
+        self.assertEqual(job.application_email, 'apply@example.org')
+
+    def test_autofill_command_saves_through_job_save(self):
+        from unittest import mock
+
+        job = Job.objects.create(title='Office Assistant', organization_name='UNHCR', raw_data=self.MESSAGE)
+        Job.objects.filter(pk=job.pk).update(slug='')
+
+        with mock.patch('listings.signals.schedule_similarity_update') as schedule:
+            call_command('autofill_raw_data', stdout=StringIO())
+
+        job.refresh_from_db()
+        self.assertEqual(job.location, 'kenya')
+        self.assertEqual(job.slug, 'office-assistant')
+        schedule.assert_called_once_with(job.pk)
+
+
+class DuplicateDetectionTests(TestCase):
+    """Tests for MinHash/LSH near-duplicate detection."""
+
+    DESCRIPTION = (
+        'RCK is recruiting a full-time office manager to coordinate the Nairobi '
+        'office, manage supplies and support the programs team.'
+    )
+
+    def setUp(self):
+        self.original = Job.objects.create(
+            title='Office Manager',
+            organization_name='Refugee Consortium of Kenya',
+            description=self.DESCRIPTION,
+        )
+        self.forward = Job.objects.create(
+            title='Office Manager Vacancy!!',
+            organization_name='Refugee Consortium of Kenya (RCK)',
+            description=self.DESCRIPTION,
+        )
+        self.unrelated = Job.objects.create(
+            title='Mastercard Foundation Scholarship',
+            organization_name='Mastercard Foundation',
+            description='Fully funded undergraduate scholarship for refugee youth.',
+        )
+
+    def test_signature_and_buckets_stored_on_save(self):
+        from .duplicates import BANDS
+        from .models import JobSimilarityBucket
+
+        self.assertIsNotNone(self.original.minhash_signature)
+        self.assertEqual(
+            JobSimilarityBucket.objects.filter(job=self.original).count(), BANDS
+        )
+
+    def test_find_duplicates_returns_near_duplicate_only(self):
+        matches = [job.pk for job, _ in self.original.find_duplicates()]
+
+        self.assertEqual(matches, [self.forward.pk])
+
+    def test_find_duplicate_jobs_command_reports_cluster(self):
+        stdout = StringIO()
+        call_command('find_duplicate_jobs', rebuild=True, stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertIn('Found 1 duplicate clusters', output)
+        self.assertIn(f'#{self.forward.pk}', output)
+        self.assertNotIn(f'#{self.unrelated.pk}', output)
+
+
+class SlugAllocationTests(TestCase):
+    """Tests for unique slug allocation shared by Job and Event."""
+
+    def test_job_slugs_are_suffixed_on_collision(self):
+        first = Job.objects.create(title='Office Manager', organization_name='Org A')
+        second = Job.objects.create(title='Office Manager', organization_name='Org B')
+        third = Job.objects.create(title='Office Manager', organization_name='Org C')
+
+        self.assertEqual(first.slug, 'office-manager')
+        self.assertEqual(second.slug, 'office-manager-1')
+        self.assertEqual(third.slug, 'office-manager-2')
+
+    def test_unique_slug_uses_single_query(self):
+        from .slugs import unique_slug
+
+        for suffix in ['', '-1', '-7']:
+            Job.objects.create(title='Trainer', slug=f'trainer{suffix}', organization_name='Org')
+        Job.objects.create(title='Trainer Lead', slug='trainer-lead', organization_name='Org')
+
+        with self.assertNumQueries(1):
+            slug = unique_slug(Job, 'Trainer')
+
+        self.assertEqual(slug, 'trainer-8')
+
+    def test_editing_job_keeps_slug_when_suffixed_siblings_exist(self):
+        from .admin import JobAdminForm
+
+        first = Job.objects.create(title='Office Manager', organization_name='Org A')
+        Job.objects.create(title='Office Manager', organization_name='Org B')
+        Job.objects.create(title='Office Manager', organization_name='Org C')
+
+        form = JobAdminForm(instance=first)
+        form.cleaned_data = {'slug': first.slug}
+        self.assertEqual(form.clean_slug(), 'office-manager')
+        form.cleaned_data = {'slug': 'office-manager-1'}
+        self.assertEqual(form.clean_slug(), 'office-manager-1-1')
+
+    def test_unique_slug_prefers_free_base(self):
+        from .slugs import unique_slug
+
+        Job.objects.create(title='Trainer', slug='trainer-7', organization_name='Org')
+
+        self.assertEqual(unique_slug(Job, 'Trainer'), 'trainer')
+
+    def test_event_slugs_use_shared_allocator(self):
+        start = timezone.now() + timedelta(days=3)
+        first = Event.objects.create(title='Tech Meetup', start_time=start)
+        second = Event.objects.create(title='Tech Meetup', start_time=start)
+
+        self.assertEqual(first.slug, 'tech-meetup')
+        self.assertEqual(second.slug, 'tech-meetup-1')
+
+    def test_detail_by_slug_after_collision(self):
+        Job.objects.create(title='Data Clerk', organization_name='Org A')
+        second = Job.objects.create(title='Data Clerk', organization_name='Org B')
+
+        response = Client().get(f'/api/opportunities/by-slug/{second.slug}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['organization_name'], 'Org B')
+
+    def test_repair_slugs_command_fills_blank_slugs(self):
+        Job.objects.create(title='Field Officer', organization_name='Org A')
+        blank = Job.objects.create(title='Field Officer', organization_name='Org B')
+        Job.objects.filter(pk=blank.pk).update(slug=None)
+
+        call_command('repair_slugs', model='job', stdout=StringIO())
+
+        blank.refresh_from_db()
+        self.assertEqual(blank.slug, 'field-officer-1')
@@ -0,0 +1,87 @@
+"""
+Trending opportunities for BYN-K Platform.
+
+`ClickAnalytics` only keeps running totals, so velocity is measured
+between recomputes: each run adds the clicks a job gained since the last
+run (`Job.trending_clicks` is that snapshot) to its score, after decaying
+the score by the time elapsed. The result is an exponentially weighted
+click count with a half-life of `TRENDING_HALF_LIFE_HOURS`: a click
+counts 1 now, 0.5 one half-life later, and so on.
+
+Scores are written to the indexed `Job.trending_score` column, so
+`/api/opportunities/trending/` is a single top-K index read.
+"""
+
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import ClickAnalytics, Job
+
+# Scores below this are reset to 0 and leave the trending index.
+MIN_SCORE = 0.01
+BATCH_SIZE = 500
+# Clicks stamped just before a run may commit after it read the totals;
+# look this far back so they are picked up by the next run.
+CLICK_OVERLAP = timedelta(minutes=1)
+
+
+def decay_factor(elapsed_seconds, half_life_hours):
+    if elapsed_seconds <= 0:
+        return 1.0
+    return math.pow(0.5, elapsed_seconds / (half_life_hours * 3600))
+
+
+def rescore_candidates():
+    """
+    Jobs a run has to touch, with their click totals: those clicked since
+    their last rescore, and those whose score still has to decay. Jobs whose
+    clicks were all folded in and whose score is 0 are never read.
+    """
+    job_clicks = ClickAnalytics.objects.filter(job=OuterRef('pk'))
+    click_total = job_clicks.order_by().values('job').annotate(total=Sum('click_count')).values('total')
+    clicked_since = Q(trending_updated_at__isnull=True, has_clicks=True) | Q(clicked_since_rescore=True)
+    return (
+        Job.objects.alias(
+            has_clicks=Exists(job_clicks),
+            clicked_since_rescore=Exists(
+                job_clicks.filter(last_clicked_at__gt=OuterRef('trending_updated_at') - CLICK_OVERLAP)
+            ),
+        )
+        .filter(Q(trending_score__gt=0) | clicked_since)
+        .annotate(click_total=Coalesce(Subquery(click_total, output_field=IntegerField()), 0))
+        .only('pk', 'trending_score', 'trending_clicks', 'trending_updated_at')
+    )
+
+
+def recompute_trending_scores(now=None):
+    """Fold new clicks into the decayed scores of the affected jobs. Returns the number of jobs updated."""
+    now = now or timezone.now()
+    half_life = getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24)
+
+    changed = []
+    for job in rescore_candidates().iterator(chunk_size=BATCH_SIZE):
+        new_clicks = max(0, job.click_total - job.trending_clicks)
+        if not new_clicks and not job.trending_score:
+            continue
+        elapsed = (now - job.trending_updated_at).total_seconds() if job.trending_updated_at else 0
+        score = job.trending_score * decay_factor(elapsed, half_life) + new_clicks
+        job.trending_score = score if score >= MIN_SCORE else 0.0
+        job.trending_clicks = job.click_total
+        job.trending_updated_at = now
+        changed.append(job)
+
+    # bulk_update skips Job.save(): no signature, slug or cache side effects.
+    Job.objects.bulk_update(
+        changed, ['trending_score', 'trending_clicks', 'trending_updated_at'], batch_size=BATCH_SIZE
+    )
+    return len(changed)
+
+
+def trending_jobs(limit):
+    """Active jobs by descending trending score, served by `job_trending_idx`."""
+    return Job.objects.filter(is_active=True, trending_score__gt=0).order_by('-trending_score', '-pk')[:limit]
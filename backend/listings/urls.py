@@ -4,24 +4,44 @@ Updated to match Next.js frontend naming conventions.
 """
 
 from django.urls import path
+from config.db_routing import replica_reads
 from . import views
+from .async_views import ASYNC_READ_VIEWS, read_path
+
+
+def read_view(view_class):
+    """
+    DRF view, or its async GET counterpart when ASYNC_READ_VIEWS is on;
+    reads go to the replica when one is configured.
+    """
+    return replica_reads(read_path(view_class, ASYNC_READ_VIEWS[view_class]))
+
 
 app_name = 'listings'
 
 urlpatterns = [
     # 1. Main Opportunities List (Matches: /api/opportunities/)
     # Handles both the full list and filtered featured list via query params
-    path('opportunities/', views.JobListView.as_view(), name='opportunity-list'),
+    path('opportunities/', read_view(views.JobListView), name='opportunity-list'),
     # 1.5. Upcoming events feed consumed by the landing and events pages.
-    path('events/', views.EventListView.as_view(), name='event-list'),
+    path('events/', read_view(views.EventListView), name='event-list'),
     
     # 2. Featured Opportunities (Specific endpoint if you prefer this over query params)
     # Matches: /api/opportunities/featured/
     path('opportunities/featured/', views.FeaturedJobsView.as_view(), name='opportunity-featured'),
 
+    # 2.2. Trending Opportunities by recent click velocity
+    # Matches: /api/opportunities/trending/?limit=10
+    path('opportunities/trending/', replica_reads(views.TrendingJobsView.as_view()), name='opportunity-trending'),
+
+    # 2.5. Streaming CSV/NDJSON export for partner reports (superuser only)
+    # Matches: /api/opportunities/export/?format=csv|ndjson
+    path('opportunities/export/', replica_reads(views.JobExportView.as_view()), name='opportunity-export'),
+
     # 3. Opportunity Detail (Matches: /api/opportunities/<id>/)
     path('opportunities/<int:pk>/', views.JobDetailView.as_view(), name='opportunity-detail'),
-    path('opportunities/by-slug/<slug:slug>/', views.JobDetailBySlugView.as_view(), name='opportunity-detail-by-slug'),
+    path('opportunities/by-slug/<slug:slug>/', read_view(views.JobDetailBySlugView), name='opportunity-detail-by-slug'),
+    path('opportunities/<int:pk>/similar/', replica_reads(views.SimilarJobsView.as_view()), name='opportunity-similar'),
     
     # 4. Protected brochure download (Matches: /api/opportunities/<id>/brochure/)
     path('opportunities/<int:job_id>/brochure/', views.ProtectedBrochureView.as_view(), name='brochure'),
@@ -30,13 +50,14 @@ urlpatterns = [
     path('track-click/', views.TrackClickView.as_view(), name='track-click'),
     
     # 6. Analytics (Matches: /api/analytics/)
-    path('analytics/', views.AnalyticsOverviewView.as_view(), name='analytics'),
+    path('analytics/', replica_reads(views.AnalyticsOverviewView.as_view()), name='analytics'),
+    path('analytics/export/', replica_reads(views.AnalyticsExportView.as_view()), name='analytics-export'),
 
     # 6.1 Category counts (Matches: /api/category-counts/)
-    path('category-counts/', views.CategoryCountsView.as_view(), name='category-counts'),
+    path('category-counts/', read_view(views.CategoryCountsView), name='category-counts'),
 
     # 6.2 Partners (Matches: /api/partners/)
-    path('partners/', views.PartnerListView.as_view(), name='partners'),
+    path('partners/', read_view(views.PartnerListView), name='partners'),
     path('partners/<int:pk>/', views.PartnerDetailView.as_view(), name='partner-detail'),
     
     # ============================================
@@ -51,4 +72,7 @@ urlpatterns = [
     
     # 9. Unsubscribe (Matches: /api/subscriptions/unsubscribe/<token>/)
     path('subscriptions/unsubscribe/<uuid:token>/', views.SubscriptionUnsubscribeView.as_view(), name='subscription-unsubscribe'),
+    
+    # 10. Digest preferences (Matches: /api/subscriptions/preferences/<token>/)
+    path('subscriptions/preferences/<uuid:token>/', views.SubscriptionPreferencesView.as_view(), name='subscription-preferences'),
 ]
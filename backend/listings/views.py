@@ -8,15 +8,17 @@ from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.conf import settings
-from django.http import FileResponse, Http404
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework.filters import OrderingFilter
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 import logging
 
+from config.metrics import CLICKS_INGESTED
 from .models import Job, ClickAnalytics, Subscription, Partner, Event
 from .serializers import (
     JobSerializer, 
@@ -25,12 +27,23 @@ from .serializers import (
     TrackClickSerializer,
     SubscriptionSerializer,
     SubscriptionCreateSerializer,
+    SubscriptionPreferencesSerializer,
     PartnerSerializer,
     EventSerializer,
 )
 from .filters import JobFilter
-from .tasks import send_subscription_confirmation_email
+from .tasks import send_subscription_confirmation_email, record_click
+from .brochures import get_brochure_backend
+from .clicks import is_first_click
+from .trending import trending_jobs
 from .permissions import IsSuperUser
+from .exports import (
+    ANALYTICS_EXPORT_COLUMNS,
+    JOB_EXPORT_FIELDS,
+    CSVRenderer,
+    NDJSONRenderer,
+    streaming_export,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +83,30 @@ def dispatch_subscription_confirmation_email(subscription_id):
             )
 
 
+def dispatch_click_tracking(job_id, click_type, unique=False):
+    """
+    Record a click without holding up the response when configured.
+
+    With TRACK_CLICKS_ASYNC the counter update is queued on Celery; if the
+    broker is unavailable, fall back to a synchronous write.
+    """
+    if not getattr(settings, "TRACK_CLICKS_ASYNC", False):
+        ClickAnalytics.track_click(job_id, click_type, unique=unique)
+        CLICKS_INGESTED.labels(click_type=click_type, path="sync").inc()
+        return
+
+    try:
+        record_click.delay(job_id, click_type, unique)
+        CLICKS_INGESTED.labels(click_type=click_type, path="queued").inc()
+    except Exception:
+        logger.exception(
+            "Failed to dispatch click tracking asynchronously. Falling back to sync write.",
+            extra={"job_id": job_id, "click_type": click_type},
+        )
+        ClickAnalytics.track_click(job_id, click_type, unique=unique)
+        CLICKS_INGESTED.labels(click_type=click_type, path="sync").inc()
+
+
 class JobListView(generics.ListAPIView):
     """
     List all active job listings.
@@ -100,6 +137,7 @@ class JobListView(generics.ListAPIView):
     filterset_class = JobFilter
     ordering_fields = ['created_at', 'deadline', 'title', 'stipend_min', 'stipend_max']
     ordering = ['deadline', '-created_at']
+    query_budget = 5
     
     def list(self, request, *args, **kwargs):
         """Override list to include disclaimer in response."""
@@ -127,6 +165,7 @@ class JobDetailView(generics.RetrieveAPIView):
     queryset = Job.objects.filter(is_active=True)
     serializer_class = JobSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 4
 
 class JobDetailBySlugView(generics.RetrieveAPIView):
     """
@@ -137,6 +176,7 @@ class JobDetailBySlugView(generics.RetrieveAPIView):
     serializer_class = JobSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'slug'
+    query_budget = 4
 
 
 class FeaturedJobsView(generics.ListAPIView):
@@ -149,6 +189,7 @@ class FeaturedJobsView(generics.ListAPIView):
     queryset = Job.objects.filter(is_active=True, is_featured=True)
     serializer_class = JobListSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 4
     
     def list(self, request, *args, **kwargs):
         """Override list to include disclaimer."""
@@ -160,6 +201,58 @@ class FeaturedJobsView(generics.ListAPIView):
         return response
 
 
+class TrendingJobsView(generics.ListAPIView):
+    """
+    List opportunities by recent click velocity.
+
+    GET /api/opportunities/trending/?limit=10 (1-50)
+
+    Scores are recomputed periodically (listings.trending); the request
+    is one read of the trending index.
+    """
+
+    serializer_class = JobListSerializer
+    permission_classes = [permissions.AllowAny]
+    query_budget = 4
+
+    def list(self, request, *args, **kwargs):
+        limit = request.GET.get('limit')
+        try:
+            limit_value = int(limit) if limit else 10
+        except (TypeError, ValueError):
+            limit_value = 10
+        limit_value = max(1, min(limit_value, 50))
+        serializer = self.get_serializer(trending_jobs(limit_value), many=True)
+        return Response({
+            'results': serializer.data,
+            'disclaimer': settings.PLATFORM_DISCLAIMER
+        })
+
+
+class SimilarJobsView(generics.ListAPIView):
+    """
+    Opportunities similar to one listing, best match first.
+
+    GET /api/opportunities/<id>/similar/
+
+    Reads the precomputed `similar_job_ids` (listings.similarity).
+    """
+
+    serializer_class = JobListSerializer
+    permission_classes = [permissions.AllowAny]
+    query_budget = 4
+
+    def list(self, request, *args, **kwargs):
+        job = get_object_or_404(Job.objects.only('id', 'similar_job_ids'), pk=kwargs['pk'], is_active=True)
+        ids = job.similar_job_ids or []
+        jobs = {similar.pk: similar for similar in Job.objects.filter(pk__in=ids, is_active=True)}
+        serializer = self.get_serializer([jobs[pk] for pk in ids if pk in jobs], many=True)
+        return Response({
+            'results': serializer.data,
+            'disclaimer': settings.PLATFORM_DISCLAIMER
+        })
+
+
 class EventListView(generics.ListCreateAPIView):
     """
     Upcoming events list exposed to the frontend.
@@ -168,6 +261,7 @@ class EventListView(generics.ListCreateAPIView):
     # Limit responses to events that are still active or scheduled soon.
     serializer_class = EventSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 4
 
     def get_queryset(self):
         now = timezone.now()
@@ -200,6 +294,7 @@ class TrackClickView(APIView):
     """
     
     permission_classes = [permissions.AllowAny]
+    rate_limit = 'track-click'
     
     def post(self, request):
         serializer = TrackClickSerializer(data=request.data)
@@ -208,17 +303,23 @@ class TrackClickView(APIView):
             job_id = serializer.validated_data['job_id']
             click_type = serializer.validated_data['click_type']
             
-            try:
-                analytics = ClickAnalytics.track_click(job_id, click_type)
-                return Response({
-                    'success': True,
-                    'click_count': analytics.click_count
-                })
-            except Job.DoesNotExist:
+            # Check the job first: every (job, click type) gets its own
+            # de-duplication filter, so unknown ids must not allocate one.
+            if not Job.objects.filter(pk=job_id).exists():
                 return Response(
                     {'error': 'Job not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
+            
+            analytics = ClickAnalytics.track_click(
+                job_id, click_type, unique=is_first_click(request, job_id, click_type)
+            )
+            CLICKS_INGESTED.labels(click_type=click_type, path='sync').inc()
+            return Response({
+                'success': True,
+                'click_count': analytics.click_count,
+                'unique_count': analytics.unique_count,
+            })
         
         return Response(
             serializer.errors,
@@ -239,29 +340,27 @@ class ProtectedBrochureView(APIView):
     
     def get(self, request, job_id):
         """Serve the brochure file securely."""
-        job = get_object_or_404(Job, id=job_id, is_active=True)
+        job = get_object_or_404(
+            Job.objects.only('id', 'brochure_upload'), id=job_id, is_active=True
+        )
         
         if not job.brochure_upload:
             raise Http404("No brochure available for this job.")
         
-        # Track the brochure view
-        ClickAnalytics.track_click(job_id, 'view_brochure')
-        
-        # Serve the file using FileResponse which handles file closing
-        # FileResponse accepts a file object and manages its lifecycle
-        file_path = job.brochure_upload.path
         # Get the filename from the path for the Content-Disposition header
         filename = job.brochure_upload.name.split('/')[-1]
-        
-        # FileResponse handles closing the file automatically
-        response = FileResponse(
-            open(file_path, 'rb'),
-            as_attachment=False,
-            filename=filename,
-            content_type='application/pdf'
-        )
-        # Force browser preview (new tab) instead of download.
-        response["Content-Disposition"] = f'inline; filename="{filename}"'
+
+        # The configured backend decides whether Django, the web server
+        # (X-Accel-Redirect / X-Sendfile) or object storage streams the bytes.
+        response = get_brochure_backend().serve(request, job.brochure_upload, filename)
+
+        # Count the initial view only; PDF viewers follow up with range
+        # requests and revalidations that should not inflate the counter.
+        range_header = request.META.get('HTTP_RANGE', '')
+        if response.status_code in (200, 206, 302) and (
+            not range_header or range_header.replace(' ', '').startswith('bytes=0-')
+        ):
+            dispatch_click_tracking(job.id, 'view_brochure', unique=is_first_click(request, job.id, 'view_brochure'))
         
         return response
 
@@ -270,7 +369,8 @@ class AnalyticsOverviewView(APIView):
     """
     Analytics overview for admin dashboard.
     
-    Returns aggregated click data for all jobs.
+    Returns aggregated click data for all jobs. `unique_clicks` counts each
+    visitor once per job, click type and day (see listings.clicks).
     """
     
     permission_classes = [IsSuperUser]
@@ -280,21 +380,29 @@ class AnalyticsOverviewView(APIView):
         from django.db.models import Sum
         
         top_jobs = Job.objects.annotate(
-            total_clicks=Sum('click_analytics__click_count')
+            total_clicks=Sum('click_analytics__click_count'),
+            unique_clicks=Sum('click_analytics__unique_count'),
         ).filter(
             total_clicks__isnull=False
         ).order_by('-total_clicks')[:10]
+        totals = ClickAnalytics.objects.aggregate(
+            total_clicks=Sum('click_count'),
+            unique_clicks=Sum('unique_count'),
+        )
         
         data = {
             'total_jobs': Job.objects.filter(is_active=True).count(),
             'verified_jobs': Job.objects.filter(is_active=True, is_verified=True).count(),
             'featured_jobs': Job.objects.filter(is_active=True, is_featured=True).count(),
+            'total_clicks': totals['total_clicks'] or 0,
+            'unique_clicks': totals['unique_clicks'] or 0,
             'top_clicked': [
                 {
                     'id': job.id,
                     'title': job.title,
                     'organization': job.organization_name,
-                    'total_clicks': job.total_clicks or 0
+                    'total_clicks': job.total_clicks or 0,
+                    'unique_clicks': job.unique_clicks or 0,
                 }
                 for job in top_jobs
             ],
@@ -304,6 +412,59 @@ class AnalyticsOverviewView(APIView):
         return Response(data)
 
 
+class JobExportView(APIView):
+    """
+    Stream opportunities as CSV (default) or NDJSON for partner reports.
+
+    GET /api/opportunities/export/?format=csv|ndjson
+
+    Accepts the same filter params as the opportunity list (JobFilter).
+    """
+
+    permission_classes = [IsSuperUser]
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+
+    def get(self, request):
+        filterset = JobFilter(request.GET, queryset=Job.objects.all(), request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return streaming_export(
+            filterset.qs,
+            columns=JOB_EXPORT_FIELDS,
+            lookups=JOB_EXPORT_FIELDS,
+            export_format=request.accepted_renderer.format,
+            filename_prefix='opportunities',
+        )
+
+
+class AnalyticsExportView(APIView):
+    """
+    Stream per-job click analytics as CSV (default) or NDJSON.
+
+    GET /api/analytics/export/?format=csv|ndjson
+
+    JobFilter params narrow the exported rows to matching opportunities.
+    """
+
+    permission_classes = [IsSuperUser]
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+
+    def get(self, request):
+        filterset = JobFilter(request.GET, queryset=Job.objects.all(), request=request)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = ClickAnalytics.objects.filter(job__in=filterset.qs.values('pk'))
+        return streaming_export(
+            queryset,
+            columns=[column for column, _ in ANALYTICS_EXPORT_COLUMNS],
+            lookups=[lookup for _, lookup in ANALYTICS_EXPORT_COLUMNS],
+            export_format=request.accepted_renderer.format,
+            filename_prefix='click-analytics',
+        )
+
+
 class CategoryCountsView(APIView):
     """
     Return opportunity counts per category plus partner count.
@@ -312,6 +473,7 @@ class CategoryCountsView(APIView):
     """
 
     permission_classes = [permissions.AllowAny]
+    query_budget = 4
 
     def get(self, request):
         counts = {
@@ -343,6 +505,20 @@ class CategoryCountsView(APIView):
         })
 
 
+def partners_with_opportunity_count():
+    """Partners annotated with their active opportunity count in one query."""
+    active_jobs = (
+        Job.objects.filter(organization_name=OuterRef('name'), is_active=True)
+        .order_by()
+        .values('organization_name')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Partner.objects.annotate(
+        active_opportunity_count=Coalesce(Subquery(active_jobs, output_field=IntegerField()), 0)
+    )
+
+
 class PartnerListView(generics.ListCreateAPIView):
     """
     List or create partner organizations.
@@ -351,9 +527,12 @@ class PartnerListView(generics.ListCreateAPIView):
     POST /api/partners/
     """
 
-    queryset = Partner.objects.all()
     serializer_class = PartnerSerializer
     parser_classes = [MultiPartParser, FormParser, JSONParser]
+    query_budget = 6
+
+    def get_queryset(self):
+        return partners_with_opportunity_count()
 
     def get_permissions(self):
         if self.request.method in permissions.SAFE_METHODS:
@@ -370,9 +549,12 @@ class PartnerDetailView(generics.RetrieveUpdateDestroyAPIView):
     DELETE /api/partners/<id>/
     """
 
-    queryset = Partner.objects.all()
     serializer_class = PartnerSerializer
     parser_classes = [MultiPartParser, FormParser, JSONParser]
+    query_budget = 6
+
+    def get_queryset(self):
+        return partners_with_opportunity_count()
 
     def get_permissions(self):
         if self.request.method in permissions.SAFE_METHODS:
@@ -395,15 +577,21 @@ class SubscriptionCreateView(APIView):
     """
     
     permission_classes = [permissions.AllowAny]
+    rate_limit = 'subscribe'
     
     def post(self, request):
         serializer = SubscriptionCreateSerializer(data=request.data)
         
         if serializer.is_valid():
             email = serializer.validated_data['email']
+            preferences = {
+                field: serializer.validated_data[field]
+                for field in Subscription.PREFERENCE_FIELDS
+                if field in serializer.validated_data
+            }
             
             # Check if subscription already exists
-            existing = Subscription.objects.filter(email=email).first()
+            existing = Subscription.objects.with_email(email).first()
             
             if existing:
                 if existing.is_active:
@@ -413,7 +601,10 @@ class SubscriptionCreateView(APIView):
                         'status': 'already_subscribed'
                     })
                 else:
-                    # Regenerate token and resend confirmation
+                    # Regenerate token and resend confirmation; the new owner
+                    # of the token may restate their preferences.
+                    for field, value in preferences.items():
+                        setattr(existing, field, value)
                     existing.regenerate_token()
                     dispatch_subscription_confirmation_email(existing.id)
                     return Response({
@@ -423,7 +614,7 @@ class SubscriptionCreateView(APIView):
                     })
             
             # Create new subscription
-            subscription = Subscription.objects.create(email=email)
+            subscription = Subscription.objects.create(email=email, **preferences)
             
             # Send confirmation email asynchronously
             dispatch_subscription_confirmation_email(subscription.id)
@@ -474,6 +665,35 @@ class SubscriptionConfirmView(APIView):
         })
 
 
+class SubscriptionPreferencesView(APIView):
+    """
+    Read or change the digest preferences of a subscription.
+    
+    GET/PATCH /api/subscriptions/preferences/{token}/
+    
+    Authorized by the subscription token, like unsubscribe. Preferences
+    are lists of categories, locations and held documents; an empty list
+    means no preference.
+    """
+    
+    permission_classes = [permissions.AllowAny]
+    
+    def get_subscription(self, token):
+        return get_object_or_404(Subscription, confirmation_token=token)
+    
+    def get(self, request, token):
+        return Response(SubscriptionPreferencesSerializer(self.get_subscription(token)).data)
+    
+    def patch(self, request, token):
+        serializer = SubscriptionPreferencesSerializer(
+            self.get_subscription(token), data=request.data, partial=True
+        )
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 class SubscriptionUnsubscribeView(APIView):
     """
     Unsubscribe from email notifications using the token.
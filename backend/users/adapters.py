@@ -0,0 +1,114 @@
+"""
+Social account adapter.
+
+allauth builds a fresh `requests.Session` for every provider call, so each
+login pays a new TCP and TLS handshake to Google or LinkedIn and re-downloads
+Google's signing certificates. This adapter hands out one pooled session per
+process instead, with connect/read timeouts and no cookie jar, and keeps
+provider key sets (JWKS and certificate documents) in the Django cache for
+as long as the provider's Cache-Control allows.
+"""
+
+import hashlib
+import re
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
+from allauth.socialaccount.providers.google.views import CERTS_URL
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+_session = None
+_session_lock = threading.Lock()
+
+MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+def metadata_urls():
+    """Provider URLs whose responses are public and safe to share between logins."""
+    return {CERTS_URL, *getattr(settings, 'SOCIAL_METADATA_URLS', ())}
+
+
+def metadata_cache_key(url):
+    return f'social:metadata:{hashlib.sha256(url.encode()).hexdigest()}'
+
+
+def metadata_cache_timeout(response):
+    """
+    Seconds a metadata response may be cached: its remaining max-age, or
+    SOCIAL_METADATA_CACHE_SECONDS when it sends none. 0 means don't cache.
+    """
+    cache_control = response.headers.get('Cache-Control', '').lower()
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return 0
+    match = MAX_AGE_RE.search(cache_control)
+    if not match:
+        return getattr(settings, 'SOCIAL_METADATA_CACHE_SECONDS', 3600)
+    age = response.headers.get('Age', '')
+    return max(int(match.group(1)) - (int(age) if age.isdigit() else 0), 0)
+
+
+class ProviderSession(requests.Session):
+    """
+    A `requests.Session` with default timeouts that serves provider
+    metadata from the cache.
+
+    Only plain GETs of `metadata_urls()` are cached; token exchanges and
+    user-info calls carry credentials and always go to the provider. The
+    session is shared by every login, so it never stores cookies.
+    """
+
+    def __init__(self, timeout, pool_size):
+        super().__init__()
+        self.timeout = timeout
+        # An empty allow-list rejects every cookie a provider sets.
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        cacheable = method.upper() == 'GET' and url in metadata_urls() and not kwargs.get('headers')
+        if not cacheable:
+            return super().request(method, url, **kwargs)
+
+        key = metadata_cache_key(url)
+        body = cache.get(key)
+        if body is not None:
+            response = requests.Response()
+            response.status_code = 200
+            response.url = url
+            response._content = body
+            response.headers['Content-Type'] = 'application/json'
+            return response
+
+        response = super().request(method, url, **kwargs)
+        timeout = metadata_cache_timeout(response) if response.ok else 0
+        if timeout:
+            cache.set(key, response.content, timeout)
+        return response
+
+
+def get_provider_session():
+    """The process-wide provider session, created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = ProviderSession(
+                    timeout=(
+                        getattr(settings, 'SOCIAL_HTTP_CONNECT_TIMEOUT', 3),
+                        getattr(settings, 'SOCIAL_HTTP_READ_TIMEOUT', 5),
+                    ),
+                    pool_size=getattr(settings, 'SOCIAL_HTTP_POOL_SIZE', 10),
+                )
+    return _session
+
+
+class SocialAccountAdapter(DefaultSocialAccountAdapter):
+    def get_requests_session(self):
+        return get_provider_session()
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:02
+
+from django.db import migrations, models
+
+# Frozen copy of users.models.avatar_url_from_extra_data at the time of this
+# migration; migrations must not follow later changes to application code.
+AVATAR_EXTRA_DATA_KEYS = ('picture', 'profilePicture', 'avatar_url', 'pictureUrl')
+
+
+def avatar_url_from_extra_data(extra_data):
+    extra = extra_data or {}
+    for key in AVATAR_EXTRA_DATA_KEYS:
+        if extra.get(key):
+            return extra[key]
+    return None
+
+
+def backfill_avatar_and_roles(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    SocialAccount = apps.get_model('socialaccount', 'SocialAccount')
+
+    avatars = {}
+    for user_id, extra_data in SocialAccount.objects.order_by('-pk').values_list('user_id', 'extra_data'):
+        # Descending pk: the first (lowest pk) account wins, as in User.refresh_social_avatar().
+        avatars[user_id] = avatar_url_from_extra_data(extra_data)
+
+    for user in User.objects.prefetch_related('groups').iterator(chunk_size=500):
+        user.social_avatar_url = avatars.get(user.pk)
+        user.group_roles = sorted({group.name.strip().lower() for group in user.groups.all() if group.name})
+        if user.social_avatar_url or user.group_roles:
+            user.save(update_fields=['social_avatar_url', 'group_roles'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_signedupuser_updatesubscriber'),
+        ('socialaccount', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='group_roles',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text="Normalized names of the user's groups"),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='social_avatar_url',
+            field=models.URLField(blank=True, editable=False, help_text='Profile picture of the linked social account', max_length=1000, null=True),
+        ),
+        migrations.RunPython(backfill_avatar_and_roles, migrations.RunPython.noop),
+    ]
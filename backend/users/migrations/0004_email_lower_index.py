@@ -0,0 +1,34 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:09
+
+import django.db.models.functions.text
+import users.models
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def normalize_emails(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    normalized = Lower(Trim('email'))
+    User.objects.exclude(email=normalized).update(email=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0003_denormalized_avatar_roles'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', users.models.UserManager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='user_email_lower_idx'),
+        ),
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+    ]
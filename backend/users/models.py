@@ -6,16 +6,37 @@ Implements a simple user model with:
 - Admin role for Manasseh (platform administrator)
 """
 
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
-from listings.models import Subscription
+from django.db.models.functions import Lower
+from listings.models import ComputedFieldsMixin, EmailQuerySet, Subscription, normalize_email
 
+# extra_data keys holding the profile picture, per provider (Google, LinkedIn, ...).
+AVATAR_EXTRA_DATA_KEYS = ('picture', 'profilePicture', 'avatar_url', 'pictureUrl')
 
-class User(AbstractUser):
+
+DENORMALIZED_FIELDS = frozenset({'social_avatar_url', 'group_roles'})
+
+
+def avatar_url_from_extra_data(extra_data):
+    extra = extra_data or {}
+    for key in AVATAR_EXTRA_DATA_KEYS:
+        if extra.get(key):
+            return extra[key]
+    return None
+
+
+class UserManager(BaseUserManager.from_queryset(EmailQuerySet)):
+    pass
+
+
+class User(ComputedFieldsMixin, AbstractUser):
     """
     Custom User model with legacy is_admin flag.
     Platform management is enforced via Django superuser status.
     """
+
+    computed_fields = DENORMALIZED_FIELDS
     
     is_admin = models.BooleanField(
         default=False,
@@ -36,17 +57,71 @@ class User(AbstractUser):
         help_text="Receive email notifications for new opportunities"
     )
     
+    # Denormalized for /api/auth/me/ (kept in sync by users.signals)
+    social_avatar_url = models.URLField(
+        max_length=1000,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Profile picture of the linked social account"
+    )
+    group_roles = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Normalized names of the user's groups"
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = UserManager()
+    
     class Meta:
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
     
     def __str__(self):
         return f"{self.username} ({'Admin' if self.is_admin else 'User'})"
+
+    def save(self, *args, **kwargs):
+        """
+        Emails are stored normalized (see `normalize_email`). The
+        denormalized columns are only written by the refresh_* methods, so
+        full updates leave them alone (see `ComputedFieldsMixin`).
+        """
+        self.email = normalize_email(self.email)
+        super().save(*args, **kwargs)
     
+    @property
+    def roles(self):
+        """Normalized role identifiers used by the frontend RBAC checks."""
+        roles = set(self.group_roles or [])
+        if self.is_superuser:
+            roles.add('super_admin')
+        elif self.is_staff:
+            roles.add('staff')
+        return sorted(roles)
+
+    def refresh_group_roles(self):
+        """Re-read the user's group names into `group_roles`."""
+        self.group_roles = sorted({
+            name.strip().lower() for name in self.groups.values_list('name', flat=True) if name
+        })
+        User.objects.filter(pk=self.pk).update(group_roles=self.group_roles)
+
+    def refresh_social_avatar(self):
+        """Re-read the avatar of the first linked social account."""
+        from allauth.socialaccount.models import SocialAccount
+
+        account = SocialAccount.objects.filter(user=self).order_by('pk').first()
+        self.social_avatar_url = avatar_url_from_extra_data(account.extra_data) if account else None
+        User.objects.filter(pk=self.pk).update(social_avatar_url=self.social_avatar_url)
+
     @property
     def display_name(self):
         """Return full name if available, otherwise username."""
@@ -4,41 +4,19 @@ User Serializers.
 
 from rest_framework import serializers
 from .models import User
-from allauth.socialaccount.models import SocialAccount
 
 
 class UserSerializer(serializers.ModelSerializer):
-    """Serializer for User model."""
+    """
+    Serializer for User model.
+
+    Avatar and roles come from denormalized columns (see users.signals),
+    so serializing a user runs no queries.
+    """
     
     display_name = serializers.CharField(read_only=True)
-    social_avatar_url = serializers.SerializerMethodField()
-    roles = serializers.SerializerMethodField()
-
-    def get_social_avatar_url(self, obj):
-        social = SocialAccount.objects.filter(user=obj).first()
-        if not social:
-            return None
-
-        extra = social.extra_data or {}
-        return (
-            extra.get('picture')
-            or extra.get('profilePicture')
-            or extra.get('avatar_url')
-            or extra.get('pictureUrl')
-        )
-
-    def get_roles(self, obj):
-        """
-        Normalized role identifiers used by the frontend RBAC checks.
-        """
-        roles = {name.strip().lower() for name in obj.groups.values_list('name', flat=True) if name}
-
-        if obj.is_superuser:
-            roles.add('super_admin')
-        elif obj.is_staff:
-            roles.add('staff')
-
-        return sorted(roles)
+    social_avatar_url = serializers.URLField(read_only=True)
+    roles = serializers.ListField(child=serializers.CharField(), read_only=True)
     
     class Meta:
         model = User
@@ -1,7 +1,11 @@
-from django.db.models.signals import post_save
+from allauth.socialaccount.models import SocialAccount
+from django.contrib.auth.models import Group
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.utils import timezone
 
+from config.middleware import SlidingSessionMiddleware
 from listings.models import Subscription
 from .models import User
 
@@ -34,3 +38,70 @@ def ensure_user_is_subscription_recipient(sender, instance, created, **kwargs):
             for field, value in updates.items():
                 setattr(subscription, field, value)
             subscription.save(update_fields=list(updates.keys()))
+
+
+@receiver(post_save, sender=SocialAccount)
+@receiver(post_delete, sender=SocialAccount)
+def sync_social_avatar(sender, instance, **kwargs):
+    """
+    Keep User.social_avatar_url in step with the linked social accounts.
+    """
+    user = User.objects.filter(pk=instance.user_id).first()
+    if user is None:
+        # The user itself is being deleted.
+        return
+    user.refresh_social_avatar()
+    # Social login serializes the in-memory user right after linking the account.
+    cached_user = instance._state.fields_cache.get('user')
+    if cached_user is not None:
+        cached_user.social_avatar_url = user.social_avatar_url
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def sync_group_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep User.group_roles in step with group membership, from either side
+    (`user.groups.add(...)` or `group.user_set.add(...)`).
+    """
+    if action == 'pre_clear' and reverse:
+        instance._cleared_user_ids = list(instance.user_set.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        instance.refresh_group_roles()
+        return
+    user_ids = pk_set if action != 'post_clear' else getattr(instance, '_cleared_user_ids', [])
+    for user in User.objects.filter(pk__in=user_ids):
+        user.refresh_group_roles()
+
+
+@receiver(post_save, sender=Group)
+def sync_renamed_group_roles(sender, instance, created, **kwargs):
+    if not created:
+        for user in instance.user_set.all():
+            user.refresh_group_roles()
+
+
+@receiver(pre_delete, sender=Group)
+def remember_group_members(sender, instance, **kwargs):
+    # Membership rows are gone (without m2m_changed) by the time post_delete fires.
+    instance._member_ids = list(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Group)
+def sync_deleted_group_roles(sender, instance, **kwargs):
+    for user in User.objects.filter(pk__in=getattr(instance, '_member_ids', [])):
+        user.refresh_group_roles()
+
+
+@receiver(user_logged_in)
+def stamp_session_refresh(sender, request, user, **kwargs):
+    """
+    Start the sliding-expiry clock at login, while the session is being
+    saved anyway, so the next request doesn't write it again.
+    """
+    session = getattr(request, 'session', None)
+    if session is not None:
+        SlidingSessionMiddleware.stamp(session)
@@ -1,4 +1,5 @@
 from django.test import TestCase
+from django.utils import timezone
 from rest_framework.test import APIClient
 
 from .models import User
@@ -32,3 +33,244 @@ class LoginViewTests(TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data.get('username'), self.user.username)
+
+
+class EmailLookupTests(TestCase):
+    def explain(self, queryset):
+        from django.db import connection
+
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are cheaper to scan; make the planner show whether the index applies.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def test_emails_are_stored_normalized(self):
+        from listings.models import Subscription
+
+        user = User.objects.create_user(username='mixed', email='  Mixed.Case@Example.COM ', password='x')
+        subscription = Subscription.objects.create(email='Other@Example.com')
+
+        user.refresh_from_db()
+        subscription.refresh_from_db()
+        self.assertEqual(user.email, 'mixed.case@example.com')
+        self.assertEqual(subscription.email, 'other@example.com')
+        self.assertEqual(User.objects.with_email('MIXED.case@example.com').get(), user)
+        self.assertEqual(Subscription.objects.with_email(' OTHER@example.COM').get(), subscription)
+
+    def test_case_variant_subscriptions_are_merged(self):
+        import importlib
+
+        from django.apps import apps
+
+        from listings.models import Subscription
+
+        migration = importlib.import_module('listings.migrations.0022_merge_case_variant_subscriptions')
+        now = timezone.now()
+        keeper = Subscription.objects.create(email='foo@example.com')
+        Subscription.objects.filter(pk=keeper.pk).update(email='Foo@Example.com')
+        Subscription.objects.create(email='foo@example.com', is_active=True, confirmed_at=now)
+
+        migration.merge_case_variants(apps, None)
+
+        merged = Subscription.objects.with_email('foo@example.com').get()
+        self.assertEqual(merged.pk, keeper.pk)
+        self.assertEqual(merged.email, 'foo@example.com')
+        self.assertTrue(merged.is_active)
+        merged.unsubscribe()
+        self.assertFalse(Subscription.objects.get(pk=keeper.pk).is_active)
+
+    def test_email_lookups_use_the_lower_email_index(self):
+        from listings.models import Subscription
+
+        self.assertIn('user_email_lower_idx', self.explain(User.objects.with_email('a@example.com')))
+        self.assertIn('subscription_email_lower_idx', self.explain(Subscription.objects.with_email('a@example.com')))
+
+    def test_login_with_differently_cased_email(self):
+        User.objects.create_user(username='cased', email='Cased@Example.com', password='Testpass123')
+        response = APIClient().post(
+            '/api/auth/login/',
+            {'username': 'CASED@example.COM', 'password': 'Testpass123'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get('username'), 'cased')
+
+
+class MeViewTests(TestCase):
+    def setUp(self):
+        from allauth.socialaccount.models import SocialAccount
+        from django.contrib.auth.models import Group
+
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='member', email='member@example.com', password='Testpass123')
+        self.group = Group.objects.create(name=' Editors ')
+        self.user.groups.add(self.group)
+        SocialAccount.objects.create(
+            user=self.user, provider='google', uid='123',
+            extra_data={'picture': 'https://example.com/avatar.png'},
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_me_serializes_denormalized_avatar_and_roles_without_queries(self):
+        from .serializers import UserSerializer
+
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            data = UserSerializer(user).data
+
+        self.assertEqual(data['social_avatar_url'], 'https://example.com/avatar.png')
+        self.assertEqual(data['roles'], ['editors'])
+
+    def test_roles_follow_group_and_staff_changes(self):
+        self.group.name = 'Reviewers'
+        self.group.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.roles, ['reviewers'])
+
+        self.group.user_set.remove(self.user)
+        self.user.is_staff = True
+        self.user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.roles, ['staff'])
+
+    def test_stale_full_save_keeps_denormalized_columns(self):
+        stale = User.objects.get(pk=self.user.pk)
+        self.group.user_set.remove(self.user)
+
+        stale.first_name = 'Member'
+        stale.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Member')
+        self.assertEqual(self.user.group_roles, [])
+
+    def test_full_save_reinserts_a_deleted_row(self):
+        user = User.objects.get(pk=self.user.pk)
+        User.objects.filter(pk=user.pk).delete()
+
+        user.save()
+
+        restored = User.objects.get(pk=user.pk)
+        self.assertEqual(restored.email, 'member@example.com')
+        self.assertEqual(restored.group_roles, ['editors'])
+
+    def test_avatar_cleared_when_social_account_removed(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        SocialAccount.objects.filter(user=self.user).delete()
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.social_avatar_url)
+
+    def test_me_returns_304_for_matching_etag(self):
+        first = self.client.get('/api/auth/me/')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['roles'], ['editors'])
+
+        second = self.client.get('/api/auth/me/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b'')
+
+
+class SocialLoginRouterTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.client = APIClient()
+        self.sent = []
+
+    def fake_send(self, adapter, request, **kwargs):
+        import requests
+        from allauth.socialaccount.providers.google.views import CERTS_URL, IDENTITY_URL
+
+        self.sent.append((request.url, kwargs.get('timeout')))
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        if request.url == IDENTITY_URL:
+            response._content = (
+                b'{"id": "1234", "email": "social@example.com", "verified_email": true, '
+                b'"given_name": "Social", "picture": "https://example.com/p.png"}'
+            )
+        elif request.url == CERTS_URL:
+            response._content = b'{"kid": "cert"}'
+        else:
+            response.status_code = 404
+            response._content = b'{}'
+        return response
+
+    def test_google_access_token_login_runs_on_the_original_request(self):
+        from unittest import mock
+
+        with mock.patch('requests.adapters.HTTPAdapter.send', autospec=True, side_effect=self.fake_send):
+            response = self.client.post(
+                '/api/auth/social/',
+                {'provider': 'google', 'access_token': 'token-1'},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.data)
+        self.assertEqual(response.data['user']['email'], 'social@example.com')
+        self.assertTrue(User.objects.filter(email='social@example.com').exists())
+        self.assertEqual(len(self.sent), 1)
+        self.assertEqual(self.sent[0][1], (3, 5))
+
+    def test_rejects_unknown_provider_and_missing_token(self):
+        response = self.client.post('/api/auth/social/', {'provider': 'github', 'code': 'x'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/auth/social/', {'provider': 'linkedin'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_provider_session_is_shared_and_caches_signing_keys(self):
+        from unittest import mock
+
+        from allauth.socialaccount.adapter import get_adapter
+        from allauth.socialaccount.providers.google.views import CERTS_URL, IDENTITY_URL
+
+        session = get_adapter().get_requests_session()
+        self.assertIs(get_adapter().get_requests_session(), session)
+
+        with mock.patch('requests.adapters.HTTPAdapter.send', autospec=True, side_effect=self.fake_send):
+            self.assertEqual(session.get(CERTS_URL).json(), {'kid': 'cert'})
+            self.assertEqual(session.get(CERTS_URL).json(), {'kid': 'cert'})
+            session.get(IDENTITY_URL, headers={'Authorization': 'Bearer a'})
+            session.get(IDENTITY_URL, headers={'Authorization': 'Bearer a'})
+
+        self.assertEqual([url for url, _ in self.sent], [CERTS_URL, IDENTITY_URL, IDENTITY_URL])
+
+    def test_provider_session_keeps_no_cookies(self):
+        from http.client import HTTPMessage
+        from unittest import mock
+
+        from allauth.socialaccount.adapter import get_adapter
+        from allauth.socialaccount.providers.google.views import IDENTITY_URL
+
+        def send_with_cookie(adapter, request, **kwargs):
+            response = self.fake_send(adapter, request, **kwargs)
+            headers = HTTPMessage()
+            headers['Set-Cookie'] = 'sid=first-user; Path=/'
+            response.raw = mock.Mock(_original_response=mock.Mock(msg=headers))
+            return response
+
+        session = get_adapter().get_requests_session()
+        with mock.patch('requests.adapters.HTTPAdapter.send', autospec=True, side_effect=send_with_cookie):
+            session.get(IDENTITY_URL, headers={'Authorization': 'Bearer a'})
+
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_signing_keys_follow_cache_control(self):
+        import requests
+
+        from users.adapters import metadata_cache_timeout
+
+        def response(**headers):
+            result = requests.Response()
+            result.headers.update(headers)
+            return result
+
+        self.assertEqual(metadata_cache_timeout(response(**{'Cache-Control': 'public, max-age=100', 'Age': '40'})), 60)
+        self.assertEqual(metadata_cache_timeout(response(**{'Cache-Control': 'no-cache'})), 0)
+        with self.settings(SOCIAL_METADATA_CACHE_SECONDS=120):
+            self.assertEqual(metadata_cache_timeout(response()), 120)
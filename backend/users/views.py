@@ -2,13 +2,15 @@
 User API Views.
 """
 
+import hashlib
+import json
 import os
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import authenticate, login, logout
 from django.conf import settings
-from rest_framework.test import APIRequestFactory
+from rest_framework.utils.encoders import JSONEncoder
 from dj_rest_auth.registration.views import SocialLoginView
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.linkedin_oauth2.views import LinkedInOAuth2Adapter
@@ -23,12 +25,14 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserCreateSerializer
     permission_classes = [permissions.AllowAny]
+    rate_limit = 'register'
 
 
 class LoginView(APIView):
     """User login endpoint."""
     
     permission_classes = [permissions.AllowAny]
+    rate_limit = 'login'
     
     def post(self, request):
         identifier = (request.data.get('username') or request.data.get('email') or '').strip()
@@ -42,7 +46,7 @@ class LoginView(APIView):
 
         username = identifier
         if '@' in identifier:
-            matched_user = User.objects.filter(email__iexact=identifier).first()
+            matched_user = User.objects.with_email(identifier).first()
             if matched_user:
                 username = matched_user.username
         
@@ -92,7 +96,13 @@ class LogoutView(APIView):
 
 
 class MeView(generics.RetrieveUpdateAPIView):
-    """Current user profile endpoint."""
+    """
+    Current user profile endpoint.
+
+    The frontend polls this on every navigation. Serializing runs no
+    queries, and GET responses carry an ETag so an unchanged profile is
+    answered with an empty 304.
+    """
     
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -100,6 +110,17 @@ class MeView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return self.request.user
 
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        payload = json.dumps(response.data, sort_keys=True, cls=JSONEncoder).encode()
+        etag = f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache', 'Vary': 'Cookie, Authorization'}
+        if etag in request.headers.get('If-None-Match', ''):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
 
 class GoogleSocialLoginView(SocialLoginView):
     adapter_class = GoogleOAuth2Adapter
@@ -113,20 +134,27 @@ class LinkedInSocialLoginView(SocialLoginView):
     callback_url = getattr(settings, 'LINKEDIN_REDIRECT_URI', 'http://localhost:3000/api/auth/callback/linkedin')
 
 
-class SocialLoginRouterView(APIView):
+class SocialLoginRouterView(SocialLoginView):
     """
     Provider-agnostic social login endpoint.
     Expects: { provider: "google"|"linkedin", access_token?: str, code?: str }
+
+    Runs the provider view's adapter, client and callback URL on this
+    request directly, so a login goes through one DRF stack.
     """
 
-    permission_classes = [permissions.AllowAny]
+    provider_views = {
+        'google': GoogleSocialLoginView,
+        'linkedin': LinkedInSocialLoginView,
+    }
 
-    def post(self, request):
+    def post(self, request, *args, **kwargs):
         provider = (request.data.get('provider') or '').strip().lower()
         access_token = request.data.get('access_token')
         code = request.data.get('code')
 
-        if provider not in ('google', 'linkedin'):
+        target = self.provider_views.get(provider)
+        if target is None:
             return Response(
                 {'error': 'Unsupported provider. Use "google" or "linkedin".'},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -138,21 +166,7 @@ class SocialLoginRouterView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        payload = {}
-        if access_token:
-            payload['access_token'] = access_token
-        if code:
-            payload['code'] = code
-
-        target_view = (
-            GoogleSocialLoginView.as_view()
-            if provider == 'google'
-            else LinkedInSocialLoginView.as_view()
-        )
-
-        factory = APIRequestFactory()
-        proxy_request = factory.post('/api/auth/social/', payload, format='json')
-        proxy_request.COOKIES = request.COOKIES
-
-        response = target_view(proxy_request)
-        return response
+        self.adapter_class = target.adapter_class
+        self.client_class = target.client_class
+        self.callback_url = target.callback_url
+        return super().post(request, *args, **kwargs)